@@ -0,0 +1,121 @@
+import io
+import time
+import random
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+from services.analysis_extract import ColumnsExtract, RowsExtract
+from services.extract_utils import values_lq_or_none
+from services.extraction_plan import ExtractionPlan
+
+# === Script : BENCHMARK - COMPILED EXTRACTION PLAN (services/extraction_plan.py) ===
+# python -m benchmarks.extraction_plan [n_samples] [n_params]
+#   plan gather vs BaseExtract.extract_values called per (sample, item), then the full ColumnsExtract.extract
+# python -m benchmarks.extraction_plan lignes [n_params] [n_samples]
+#   wide sheet (lab export transposed, one column per sample) : RowsExtract vs ColumnsExtract on the same values
+# Parity : tests/test_extraction_plan.py
+#
+
+
+def benchmark_plan(n_samples=2000, n_params=400, seed=0):
+    rng = random.Random(seed)
+    labels = [f"Param {i} - (mg/kg M.S.)" for i in range(n_params)]
+    pool = ["<0,05", "n.d.", "-", " ", None, "1,5"]
+    rows = [["Code"] + labels]
+    for s in range(n_samples):
+        rows.append([f"S{s}"] + [rng.choice(pool) if rng.random() < 0.4 else round(rng.uniform(0, 50), 3)
+                                 for _ in range(n_params)])
+    df = pd.DataFrame(rows).infer_objects()
+
+    extractor = ColumnsExtract(None, None, "Data", col_config={"nom_row": 1, "nom_col": 0, "param_row": 0})
+    extractor.df = df
+    extractor.keywords_valides = [f"p{i} → ({i + 1}, {labels[i]})" for i in range(n_params)] + ["param → all"]
+    extractor.groupes_personnalises = {"Somme 1-10": [f"p{i} → ({i + 1}, {labels[i]})" for i in range(10)]}
+
+    noms_reference = list(df.iloc[0])
+    correspondances = {"param → all": [(i + 1, labels[i]) for i in range(n_params)]}
+    items = extractor.keywords_valides
+    sample_idx = np.arange(1, n_samples + 1)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = {item: [extractor.extract_values(item, df, noms_reference, correspondances, "columns", idx=int(r))
+                           for r in sample_idx] for item in items}
+    cell_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plan = ExtractionPlan(items, correspondances, noms_reference, df.shape[1])
+    raw = plan.gather(df.to_numpy(dtype=object), sample_idx)
+    gather_time = time.perf_counter() - start
+    same = {item: [values_lq_or_none(v) for v in col] for item, col in raw.items()} == expected
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor.extract()
+    extract_time = time.perf_counter() - start
+
+    print(f"{n_samples} échantillons x {n_params} paramètres - valeurs identiques : {same}")
+    print(f"extract_values par cellule : {cell_time * 1000:.0f} ms")
+    print(f"plan + gather NumPy        : {gather_time * 1000:.0f} ms")
+    print(f"ColumnsExtract.extract     : {extract_time * 1000:.0f} ms")
+
+
+def make_wide_sheets(n_params, n_samples, seed=0):
+    # Same values in both layouts : label row then one row per sample (colonnes), the same sheet transposed (lignes)
+    rng = np.random.default_rng(seed)
+    labels = [f"Param {i} - (mg/kg M.S.)" for i in range(n_params)]
+    labels[:3] = ["Naphtalène - (mg/kg M.S.)", "Toluène - (mg/kg M.S.)", "Benzène - (mg/kg M.S.)"]
+    values = rng.uniform(0, 50, (n_samples, n_params)).round(3).astype(object)
+    draw = rng.random(values.shape)
+    values[draw < 0.25] = "<0,05"
+    values[(draw >= 0.25) & (draw < 0.3)] = "n.d."
+    values[(draw >= 0.3) & (draw < 0.35)] = np.nan
+
+    cells = np.full((n_samples + 1, n_params + 1), np.nan, dtype=object)
+    cells[0, 0] = "Code"
+    cells[0, 1:] = labels
+    cells[1:, 0] = [f"S{s}" for s in range(n_samples)]
+    cells[1:, 1:] = values
+    layouts = {
+        "colonnes": (ColumnsExtract, pd.DataFrame(cells).infer_objects(),
+                     {"nom_row": 1, "nom_col": 0, "param_row": 0}),
+        "lignes": (RowsExtract, pd.DataFrame(cells.T.copy()).infer_objects(),
+                   {"nom_row": 0, "param_col": 0, "param_row": 1, "data_start_col": 1}),
+    }
+    selection = {
+        "keywords_valides": ["naphtalene → all"] + [f"p{i} → ({i + 1}, {labels[i]})" for i in range(3, n_params)],
+        "groupes_personnalises": {"BTEX": ["benzene → all", "toluene → all"]},
+    }
+    return layouts, selection
+
+
+def benchmark_wide(n_params=300, n_samples=4000, seed=0, repeat=3):
+    layouts, selection = make_wide_sheets(n_params, n_samples, seed)
+    frames, times = {}, {}
+    for mode, (cls, df, config) in layouts.items():
+        extractor = cls(None, None, "Data", config)
+        extractor.load_selection(selection)
+        extractor.df = df
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                extractor.extract()
+            best = min(best, time.perf_counter() - start)
+        frames[mode], times[mode] = extractor.export_frame(), best
+
+    print(f"{n_params} paramètres x {n_samples} échantillons - "
+          f"lignes / colonnes identiques : {frames['lignes'].equals(frames['colonnes'])}")
+    print(f"ColumnsExtract.extract : {times['colonnes'] * 1000:.0f} ms")
+    print(f"RowsExtract.extract    : {times['lignes'] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:2] == ["lignes"]:
+        benchmark_wide(*(int(a) for a in sys.argv[2:4]))
+    else:
+        benchmark_plan(*(int(a) for a in sys.argv[1:3]))
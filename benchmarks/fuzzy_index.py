@@ -0,0 +1,59 @@
+import time
+import random
+
+from services.fuzzy_index import FuzzyTokenIndex
+from services.token_index import TokenIndex
+
+# === Script : BENCHMARK - FUZZY KEYWORD MATCHING (services/fuzzy_index.py) ===
+# python -m benchmarks.fuzzy_index [n_labels] [n_keywords]
+#   keywords with typos : exact TokenIndex vs FuzzyTokenIndex, recall and timings
+# Exact matches found again : tests/test_fuzzy_index.py
+#
+
+
+def benchmark_fuzzy(n_labels=5000, n_keywords=500, seed=0):
+    rng = random.Random(seed)
+    vocab = ["benzo", "pyrène", "fluoranthène", "naphtalène", "toluène", "xylène", "plomb", "cuivre", "chrome",
+             "mercure", "cadmium", "arsenic", "hydrocarbures", "aliphatique", "aromatique", "fraction", "total",
+             "lixiviation", "éluat", "chlorures", "sulfates", "fluorures", "phénol", "indice", "carbone", "organique"]
+    units = ["- (mg/kg M.S.)", "- (µg/l)", "(mg/kg MS)", ""]
+    labels = [" ".join(rng.sample(vocab, rng.randint(1, 3))) + f" C{rng.randint(5, 40)} {rng.choice(units)}"
+              for _ in range(n_labels)]
+
+    def typo(word):
+        i = rng.randrange(len(word))
+        return rng.choice([word[:i] + word[i + 1:], word[:i] + rng.choice("aeilnorst") + word[i + 1:]])
+
+    keywords, sans_faute = [], []
+    for _ in range(n_keywords):
+        words = rng.sample(vocab, rng.randint(1, 2))
+        keywords.append(" ".join(typo(w) if len(w) > 7 and rng.random() < 0.5 else w for w in words))
+        sans_faute.append(" ".join(words))
+
+    start = time.perf_counter()
+    exact, _ = TokenIndex(labels).match(keywords)
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = FuzzyTokenIndex(labels)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    ranked, _ = index.match(keywords)
+    match_time = time.perf_counter() - start
+
+    # Recall : labels of the keyword without typo, found from the keyword with typos
+    expected, _ = TokenIndex(labels).match(sans_faute)
+    attendus = [(kw, ref) for kw, ref in zip(keywords, sans_faute) if expected[ref]]
+    exact_ok = sum({i for i, _ in expected[ref]} <= {i for i, _ in exact[kw]} for kw, ref in attendus)
+    fuzzy_ok = sum({i for i, _ in expected[ref]} <= {i for i, _, _ in ranked[kw]} for kw, ref in attendus)
+    print(f"{n_labels} libellés x {n_keywords} mots-clés")
+    print(f"mots-clés retrouvés malgré les fautes : exact {exact_ok} / approché {fuzzy_ok} sur {len(attendus)}")
+    print(f"TokenIndex exact            : {exact_time * 1000:.0f} ms")
+    print(f"FuzzyTokenIndex construction : {build_time * 1000:.0f} ms")
+    print(f"FuzzyTokenIndex recherche    : {match_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark_fuzzy(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,49 @@
+import time
+import random
+
+from services.layout_profiles import header_fingerprint
+from services.token_index import TokenIndex, MatchPlan
+
+# === Script : BENCHMARK - LAYOUT PROFILES (services/layout_profiles.py) ===
+# python -m benchmarks.layout_profiles [n_params] [n_keywords]
+#   fingerprints of two batches of the same format, cold matching vs warm profile
+# Fingerprint stability and parity : tests/test_layout_profiles.py
+#
+
+
+def benchmark_profiles(n_params=400, n_keywords=200, seed=0):
+    rng = random.Random(seed)
+    labels = [f"Paramètre {i} {rng.choice(['plomb', 'cuivre', 'benzène', 'HCT C10-C40'])} - (mg/kg M.S.)"
+              for i in range(n_params)]
+
+    def batch(prefix):
+        rows = [["Rapport d'analyse", None, "Eurofins"], ["Code"] + labels]
+        for s in range(20):
+            rows.append([f"{prefix}{s}"] + [rng.choice(["<0,05", "n.d.", round(rng.uniform(0, 50), 3)])
+                                            for _ in labels])
+        return rows
+
+    first, second = header_fingerprint(batch("S")), header_fingerprint(batch("SC-"))
+    other = header_fingerprint([["Rapport", None, "Agrolab"]] + batch("S")[1:])
+    print(f"empreinte lot 1 / lot 2 : {first} / {second} - autre format : {other}")
+
+    keywords = [f"{rng.choice(['plomb', 'cuivre', 'benzene', 'hct'])} {i}" for i in range(n_keywords)]
+    start = time.perf_counter()
+    expected = TokenIndex(labels).match(keywords)
+    cold_time = time.perf_counter() - start
+
+    plan = MatchPlan()
+    plan.get_matching_columns(labels, keywords)
+    start = time.perf_counter()
+    warm = plan.get_matching_columns(labels, keywords)
+    warm_time = time.perf_counter() - start
+
+    print(f"{n_params} libellés x {n_keywords} mots-clés - identiques : {warm == expected}")
+    print(f"matching à froid (TokenIndex) : {cold_time * 1000:.1f} ms")
+    print(f"profil chaud (MatchPlan)      : {warm_time * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark_profiles(*(int(a) for a in sys.argv[1:3]))
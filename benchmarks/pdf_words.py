@@ -0,0 +1,45 @@
+import time
+
+from services.pdf_words import WORD_BACKENDS, open_word_pages
+
+# === Script : BENCHMARK - WORD-BOX BACKENDS (services/pdf_words.py) ===
+# python -m benchmarks.pdf_words file.pdf [file2.pdf ...]
+#   pages per second for each backend + words whose text/x0/x1/top differ from pdfplumber (> 0.5 pt)
+# Parity on a generated page : tests/test_pdf_words.py
+#
+
+
+def benchmark_backends(pdf_path, tolerance=0.5):
+    with open(pdf_path, "rb") as f:
+        pdf_bytes = f.read()
+
+    words_by_backend = {}
+    for backend in WORD_BACKENDS:
+        start = time.perf_counter()
+        with open_word_pages(pdf_bytes, backend) as pages:
+            words_by_backend[backend] = [p.extract_words() for p in pages]
+        elapsed = time.perf_counter() - start
+        n_pages = len(words_by_backend[backend])
+        print(f"{backend:<11} : {n_pages} pages en {elapsed:.2f} s → {n_pages / elapsed:.1f} pages/s")
+
+    reference = words_by_backend["pdfplumber"]
+    for backend, pages_words in words_by_backend.items():
+        if backend == "pdfplumber":
+            continue
+        mismatches = 0
+        for ref_words, words in zip(reference, pages_words):
+            if len(ref_words) != len(words):
+                mismatches += abs(len(ref_words) - len(words))
+            for a, b in zip(ref_words, words):
+                if a['text'] != b['text'] or any(abs(a[k] - b[k]) > tolerance for k in ("x0", "x1", "top")):
+                    mismatches += 1
+        total = sum(len(w) for w in reference)
+        print(f"{backend:<11} : {mismatches} / {total} mots différents de pdfplumber")
+
+
+if __name__ == "__main__":
+    import sys
+
+    for path in sys.argv[1:]:
+        print(f"\n📄 {path}")
+        benchmark_backends(path)
@@ -0,0 +1,53 @@
+import time
+import random
+
+from services.pressio_pairing import pair_combined_values
+
+# === Script : BENCHMARK - COMBINED Pf*/Pl* PAIRING (services/pressio_pairing.py) ===
+# python -m benchmarks.pressio_pairing [n_pages] [values_per_page]
+#   former backward walk vs pair_combined_values, one call per page
+# Parity : tests/test_pressio_pairing.py
+#
+
+
+def pair_backward(page):
+    # Former backward walk from the last value (even counts), first value of an odd page left out
+    values = page[1:] if len(page) % 2 else page
+    pf_final, pl_final = [], []
+    for idx in range(len(values) - 2, -1, -2):
+        a, b = values[idx], values[idx + 1]
+        if a[1] < b[1]:
+            pf_final.append(a)
+            pl_final.append(b)
+        else:
+            pf_final.append(b)
+            pl_final.append(a)
+    return pf_final[::-1], pl_final[::-1], page[:len(page) % 2]
+
+
+def benchmark_pairing(n_pages=300, values_per_page=40, seed=0):
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(n_pages):
+        count = values_per_page + rng.choice((0, 0, 0, 1))  # a few odd pages
+        pages.append([(100.0 + 12 * i, round(rng.uniform(0.1, 5), 2)) for i in range(count)])
+
+    start = time.perf_counter()
+    expected = [pair_backward(page) for page in pages]
+    backward_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = [pair_combined_values(page) for page in pages]
+    forward_time = time.perf_counter() - start
+
+    n_odd = sum(1 for _, _, unpaired in result if unpaired)
+    print(f"{n_pages} pages x ~{values_per_page} valeurs, {n_odd} page(s) impaire(s) - "
+          f"identiques : {result == expected}")
+    print(f"parcours arrière : {backward_time * 1000:.1f} ms")
+    print(f"pair_combined_values : {forward_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark_pairing(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,98 @@
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from services.extract_utils import classify_lq, format_lq_values, sum_lq_arrays, GROUP_LQ_TEXT
+from services.result_store import ResultStore, group_column, MEMBER, KEYWORD
+
+# === Script : BENCHMARK - RESULT STORE (services/result_store.py) ===
+# python -m benchmarks.result_store [n_samples] [n_items]
+#   former dict of dicts (one value per cell) vs ResultStore : memory held by the results and build time
+# Parity : tests/test_result_store.py
+#
+
+
+def sum_lq_groups(members, n, minus_one=False):
+    # Former group column, one value per sample : sum of the numbers, "<LQ" if only <LQ members, "" if nothing
+    total, has_value, lq_detected = sum_lq_arrays(members, n)
+    out = np.full(n, "", dtype=object)
+    summed = np.flatnonzero(has_value)
+    out[summed] = ["" if np.isnan(v) else str(v).strip().lower() for v in total[summed].tolist()]
+    out[lq_detected & ~has_value] = -1 if minus_one else GROUP_LQ_TEXT
+    return out
+
+
+def dict_results(sample_names, classified, groupes, keywords, minus_one):
+    # Former layout : dict of dicts, one formatted value per cell
+    formatted = {kw: format_lq_values(classified[kw][0], minus_one) for kw in keywords}
+    sommes = {nom_groupe: sum_lq_groups([classified[m] for m in ms], len(sample_names), minus_one)
+              for nom_groupe, ms in groupes.items()}
+    resultats = {}
+    for s, nom in enumerate(sample_names):
+        resultat = {}
+        for nom_groupe, ms in groupes.items():
+            for m in ms:
+                resultat[m] = classified[m][0][s]
+            resultat[nom_groupe] = sommes[nom_groupe][s]
+        for kw in keywords:
+            resultat[kw] = formatted[kw][s]
+        resultats[nom] = resultat
+    return resultats
+
+
+def store_results(sample_names, classified, groupes, keywords, minus_one):
+    columns = []
+    for nom_groupe, ms in groupes.items():
+        columns.extend((m, MEMBER, *classified[m][:2], classified[m][4]) for m in ms)
+        columns.append(group_column(nom_groupe, [classified[m] for m in ms], len(sample_names)))
+    columns.extend((kw, KEYWORD, *classified[kw][:2], classified[kw][4]) for kw in keywords)
+    return ResultStore.from_columns(sample_names, columns, minus_one)
+
+
+def make_results(n_samples, n_items, seed=0):
+    rng = np.random.default_rng(seed)
+    sample_names = [f"S{i}" for i in range(n_samples)]
+    items = [f"param{j} → ({j}, Paramètre {j})" for j in range(n_items)]
+    groupes = {f"Groupe {g}": items[g * 10:g * 10 + 5] for g in range(n_items // 50)}
+    membres = [m for ms in groupes.values() for m in ms]
+    keywords = [kw for kw in items if kw not in membres]
+
+    classified = {}
+    for item in membres + keywords:
+        col = rng.uniform(0, 50, n_samples).round(3).astype(object)
+        draw = rng.random(n_samples)
+        col[draw < 0.25] = "<0,05"
+        col[(draw >= 0.25) & (draw < 0.3)] = "n.d."
+        col[(draw >= 0.3) & (draw < 0.35)] = "12,5"
+        col[(draw >= 0.35) & (draw < 0.4)] = None
+        classified[item] = classify_lq(col)
+    return sample_names, classified, groupes, keywords
+
+
+def measure(build, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(*args)
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def benchmark_store(n_samples=3000, n_items=500, seed=0):
+    args = make_results(n_samples, n_items, seed)
+    for minus_one in (False, True):
+        resultats, dict_bytes, dict_time = measure(dict_results, *args, minus_one)
+        store, store_bytes, store_time = measure(store_results, *args, minus_one)
+        same = list(store) == list(resultats) and all(dict(store[nom]) == resultats[nom] for nom in resultats)
+        print(f"{n_samples} échantillons x {len(store.item_names)} colonnes (minus_one={minus_one}) - "
+              f"identiques : {same}")
+        print(f"  dict de dicts : {dict_bytes / 1e6:7.1f} Mo, construction {dict_time * 1000:5.0f} ms")
+        print(f"  ResultStore   : {store_bytes / 1e6:7.1f} Mo, construction {store_time * 1000:5.0f} ms")
+        del resultats, store
+
+
+if __name__ == "__main__":
+    benchmark_store(*(int(a) for a in sys.argv[1:3]))
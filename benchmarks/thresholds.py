@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.thresholds import (
+    compare_thresholds, threshold_limits, parse_result_value, NUMBER, LQ,
+    VERDICT_OK, VERDICT_EXCEEDED, VERDICT_UNDETERMINED,
+)
+
+# === Script : BENCHMARK - REGULATORY THRESHOLDS (services/thresholds.py) ===
+# python -m benchmarks.thresholds [n_samples] [n_params]
+#   sample by sample comparison (extrapolated from 2000 samples) vs NumPy matrices
+# Parity : tests/test_thresholds.py
+#
+
+
+def compare_thresholds_loop(df_export, thresholds):
+    # Sample by sample, cell by cell (reference timing)
+    limits = threshold_limits(list(df_export.columns), thresholds)
+    verdicts, counts = [], []
+    for _, row in df_export.iterrows():
+        n_exceed, undetermined, compared = 0, False, False
+        for j, value in enumerate(row.tolist()):
+            if np.isnan(limits[j]):
+                continue
+            state, number, bound = parse_result_value(value)
+            if state == NUMBER:
+                compared = True
+                n_exceed += number > limits[j]
+            elif state == LQ:
+                compared = True
+                undetermined |= not bound <= limits[j]
+        verdicts.append(VERDICT_EXCEEDED if n_exceed else VERDICT_UNDETERMINED if undetermined
+                        else VERDICT_OK if compared else "")
+        counts.append(n_exceed)
+    return verdicts, counts
+
+
+def benchmark_thresholds(n_samples=50000, n_params=60, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = [f"param{i} → all" for i in range(n_params)] + ["BTEX"]
+    cells = rng.uniform(0, 20, size=(n_samples, n_params + 1)).round(3).astype(str).astype(object)
+    draw = rng.random(size=cells.shape)
+    cells[draw < 0.2] = "<LQ (<0,05)"
+    cells[(draw >= 0.2) & (draw < 0.22)] = "<LQ (<50)"
+    cells[(draw >= 0.22) & (draw < 0.25)] = "<LQ"
+    cells[(draw >= 0.25) & (draw < 0.3)] = ""
+    df_export = pd.DataFrame(cells, index=[f"S{i}" for i in range(n_samples)], columns=columns)
+    df_export.index.name = "Nom échantillon"
+    thresholds = {f"param{i}": 19.5 for i in range(0, n_params, 2)}
+    thresholds["BTEX"] = "6"
+
+    start = time.perf_counter()
+    summary, ratios = compare_thresholds(df_export, thresholds)
+    array_time = time.perf_counter() - start
+
+    check = df_export.iloc[:2000]
+    start = time.perf_counter()
+    verdicts, counts = compare_thresholds_loop(check, thresholds)
+    loop_time = (time.perf_counter() - start) * n_samples / len(check)
+
+    same = (summary["Verdict"].iloc[:2000].tolist() == verdicts
+            and summary["Nb dépassements"].iloc[:2000].tolist() == counts)
+    print(f"{n_samples} échantillons x {n_params + 1} paramètres ({ratios.shape[1]} seuils) - identiques : {same}")
+    print(summary["Verdict"].value_counts().to_string())
+    print(f"boucle par échantillon (extrapolée) : {loop_time * 1000:.0f} ms")
+    print(f"matrices NumPy                      : {array_time * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark_thresholds(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,69 @@
+import time
+import random
+
+from services.extract_utils import clean_tokens
+from services.token_index import TokenIndex, MatchPlan, keyword_tokens
+
+# === Script : BENCHMARK - KEYWORD → LABEL MATCHING (services/token_index.py) ===
+# python -m benchmarks.token_index [n_labels] [n_keywords]
+#   former nested loop (columns x keywords) vs TokenIndex vs warm MatchPlan
+# Parity : tests/test_token_index.py
+#
+
+
+def matching_columns_loop(columns, keywords):
+    # Former nested loop (columns x keywords), reference timing
+    matched = {kw: [] for kw in keywords}
+    multiple_matches = []
+    for i, col in enumerate(columns):
+        if "%" in str(col):
+            continue
+        tokens_col = clean_tokens(str(col))
+        for kw in keywords:
+            tokens_kw = clean_tokens(kw)
+            if all(tok in tokens_col for tok in tokens_kw):
+                if (i, col) not in matched[kw]:
+                    matched[kw].append((i, col))
+    for kw, matches in matched.items():
+        if len(matches) > 1:
+            multiple_matches.append(kw)
+    return matched, multiple_matches
+
+
+def benchmark_matching(n_labels=5000, n_keywords=300, seed=0):
+    rng = random.Random(seed)
+    vocab = ["benzo", "a", "pyrène", "fluoranthène", "naphtalène", "toluène", "xylène", "plomb", "Pb", "cuivre",
+             "HCT", "C10", "C40", "C12", "C16", "fraction", "aliphatique", "aromatique", "PCB", "28", "52",
+             "chrome", "VI", "total", "lixiviation", "sur", "éluat", "mg/kg", "M.S.", "µg/l"]
+    units = ["- (mg/kg M.S.)", "- (µg/l)", "(mg/kg MS)", "%", ""]
+    labels = [" ".join(rng.sample(vocab, rng.randint(2, 5))) + f" {i} " + rng.choice(units) for i in range(n_labels)]
+    labels[::97] = [None] * len(labels[::97])  # empty header cells
+    keywords = [" ".join(rng.sample(vocab, rng.randint(1, 3))) for _ in range(n_keywords - 2)] + ["", "Plomb (Pb)"]
+
+    start = time.perf_counter()
+    expected = matching_columns_loop(labels, keywords)
+    loop_time = time.perf_counter() - start
+
+    keyword_tokens.cache_clear()
+    start = time.perf_counter()
+    result = TokenIndex(labels).match(keywords)
+    index_time = time.perf_counter() - start
+
+    plan = MatchPlan()
+    plan.get_matching_columns(labels, keywords)
+    start = time.perf_counter()
+    warm = plan.get_matching_columns(labels, keywords)
+    warm_time = time.perf_counter() - start
+
+    n_matches = sum(len(v) for v in result[0].values())
+    print(f"{n_labels} libellés x {n_keywords} mots-clés - {n_matches} correspondances, "
+          f"identiques : {result == expected and warm == expected}")
+    print(f"boucle imbriquée : {loop_time * 1000:.0f} ms")
+    print(f"index inversé    : {index_time * 1000:.0f} ms")
+    print(f"MatchPlan chaud  : {warm_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark_matching(*(int(a) for a in sys.argv[1:3]))
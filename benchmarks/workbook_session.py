@@ -0,0 +1,53 @@
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from services.workbook_session import WorkbookSessionStore
+
+# === Script : BENCHMARK - GEOCHEM WORKBOOK SESSIONS (services/workbook_session.py) ===
+# python -m benchmarks.workbook_session [n_rows] [n_cols]
+#   pd.read_excel per call vs first / next get_dataframe of a session
+# Parity : tests/test_workbook_session.py
+#
+
+
+def benchmark_session(n_rows=2000, n_cols=300, repeat=5):
+    rng = np.random.default_rng(0)
+    data = rng.uniform(0, 100, size=(n_rows, n_cols)).round(3).astype(object)
+    data[rng.random(size=data.shape) < 0.2] = "<0.05"
+    df = pd.DataFrame(data, columns=[f"Param {i} - (mg/kg M.S.)" for i in range(n_cols)])
+    df.insert(0, "Code", [f"S{i}" for i in range(n_rows)])
+
+    buffer = io.BytesIO()
+    df.to_excel(buffer, sheet_name="Data", index=False)
+    file_bytes = buffer.getvalue()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        reference = pd.read_excel(io.BytesIO(file_bytes), sheet_name="Data", header=None)
+    read_time = (time.perf_counter() - start) / repeat
+
+    store = WorkbookSessionStore()
+    session = store.open(file_bytes, "bench.xlsx")
+    start = time.perf_counter()
+    first = session.get_dataframe("Data")
+    first_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        cached = store.get(session.session_id).get_dataframe("Data")
+    cached_time = (time.perf_counter() - start) / repeat
+
+    print(f"{n_rows} x {n_cols + 1} cellules - identiques à pd.read_excel : {first.equals(reference)}, "
+          f"même DataFrame réutilisé : {cached is first}")
+    print(f"pd.read_excel par appel     : {read_time * 1000:.0f} ms")
+    print(f"session, premier appel      : {first_time * 1000:.0f} ms")
+    print(f"session, appels suivants    : {cached_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+
+    benchmark_session(*(int(a) for a in sys.argv[1:3]))
@@ -1,25 +1,153 @@
 from fastapi import APIRouter, UploadFile, File, Form, Request, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.encoders import jsonable_encoder
 
-import tempfile, shutil, json, random, re
+import json, random, re
 import pandas as pd
 import traceback
 import os 
+import asyncio
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import progress
 
 from services.analysis_extract import BaseExtract, ColumnsExtract, RowsExtract
-from services.extract_utils import convert_config_to_indices, values_lq_or_none
+from services.extract_utils import convert_config_to_indices, values_lq_or_none, replace_lq_values
+from services.workbook_session import WorkbookSessionStore
+from services.geochem_batch import expand_uploads, select_sheets, extract_workbook_sheet, merge_batch_frames
+from services.layout_profiles import LayoutProfileStore, stale_selection_items
+from services.thresholds import compare_thresholds, parse_thresholds
+from services.fuzzy_index import FuzzyTokenIndex
 
 router = APIRouter()
 
+# Parsed workbooks shared by the geochem endpoints : upload once, then send session_id instead of the file
+GEOCHEM_SESSION_MAX = int(os.getenv("GEOCHEM_SESSION_MAX", "8"))
+GEOCHEM_SESSION_TTL = int(os.getenv("GEOCHEM_SESSION_TTL", "1800"))  # seconds
+workbook_sessions = WorkbookSessionStore(GEOCHEM_SESSION_MAX, GEOCHEM_SESSION_TTL)
+PREVIEW_SAMPLES = 5
+FUZZY_MIN_SCORE = 0.75  # approximate matching : candidates under this score are not proposed
+
+# Saved lab formats : header fingerprint → config + selection, warm MatchPlan per profile
+# (default under data/, ignored by git, created on first save)
+GEOCHEM_PROFILES_PATH = os.getenv("GEOCHEM_PROFILES_PATH", os.path.join("data", "geochem_profiles.json"))
+layout_profiles = LayoutProfileStore(GEOCHEM_PROFILES_PATH)
+
+# Batch : one process per (file, sheet) task, merged file written next to the other outputs (GET /download/{filename})
+GEOCHEM_BATCH_WORKERS = max(1, int(os.getenv("GEOCHEM_BATCH_WORKERS", str(os.cpu_count() or 1))))
+BATCH_OUTPUT_DIR = "outputs"
+
+
+# INPUT:
+#   requested (int | None): workers sent by the client, None → GEOCHEM_BATCH_WORKERS.
+#   n_tasks (int): (file, sheet) tasks of the batch.
+# OUTPUT:
+#   int: processes started, 1 <= workers <= min(GEOCHEM_BATCH_WORKERS, cpu count, n_tasks).
+def batch_workers(requested, n_tasks):
+    workers = min(requested or GEOCHEM_BATCH_WORKERS, GEOCHEM_BATCH_WORKERS, os.cpu_count() or 1, n_tasks)
+    return max(1, workers)
+
+
+# INPUT:
+#   excel (UploadFile | None): workbook, opens (or reuses) the session of its content.
+#   session_id (str | None): used when no file is sent.
+# OUTPUT:
+#   WorkbookSession, HTTPException 404 if the session is unknown or expired.
+async def get_workbook_session(excel, session_id):
+    if excel is not None:
+        return workbook_sessions.open(await excel.read(), excel.filename)
+    session = workbook_sessions.get(session_id) if session_id else None
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session inconnue ou expirée : renvoyer le fichier Excel")
+    return session
+
+
+# OUTPUT:
+#   (profile (dict | None), matcher (MatchPlan | None)): saved profile of the sheet layout, if it was saved
+#   for the same extraction type.
+def profile_matcher(session, sheet_name, extraction_type):
+    profile = layout_profiles.get(session.get_fingerprint(sheet_name))
+    if profile is None or profile["extraction_type"].lower() != extraction_type.lower():
+        return None, None
+    return profile, layout_profiles.match_plan(profile["fingerprint"])
+
+
+def read_param_labels(session, sheet_name, extraction_type, config):
+    # Only the label row / column is read (whole sheet parsed later, by the first call that needs values)
+    if extraction_type.lower() == "colonnes":
+        return session.get_labels(sheet_name, "columns", config["param_row"])
+    if extraction_type.lower() == "lignes":
+        return session.get_labels(sheet_name, "rows", config["param_col"])
+    raise ValueError("Type d'extraction inconnu")
+
+
+def build_input_zone(matched, multiple_matches):
+    input_zone_gauche = []
+
+    for kw in sorted(multiple_matches):
+        input_zone_gauche.append(f"{kw} → all")
+
+    for kw, correspondances in matched.items():
+        for idx, vrai_nom in correspondances:
+            input_zone_gauche.append(f"{kw} → ({idx}, {vrai_nom})")
+
+    for kw in matched:
+        if not matched[kw]:
+            input_zone_gauche.append(kw)
+    return input_zone_gauche
+
+
+def session_excel_path(session):
+    # Nothing is written here : BaseExtract.export builds its output name and folder from this path.
+    # One directory per session, deleted when the session is closed or evicted.
+    nom_base = os.path.splitext(os.path.basename(session.filename or "geochem.xlsx"))[0]
+    return os.path.join(session.get_work_dir(), f"{nom_base}.xlsx")
+
+
+@router.post("/geochem-session")
+async def open_geochem_session(
+    excel: UploadFile = File(...),
+    sheet_name: str = Form(None)
+):
+    session = await get_workbook_session(excel, None)
+    if sheet_name:
+        try:
+            session.get_dataframe(sheet_name)
+        except Exception as e:
+            return JSONResponse(content={"error": f"Erreur lecture feuille : {e}"}, status_code=400)
+    return {"session_id": session.session_id, "filename": session.filename}
+
+
+@router.post("/sheets-geochem")
+async def sheets_geochem(
+    excel: UploadFile = File(None),
+    session_id: str = Form(None)
+):
+    # Sheet picker : names and declared dimensions, no cell is loaded
+    session = await get_workbook_session(excel, session_id)
+    try:
+        sheets = session.get_metadata()
+    except Exception as e:
+        return JSONResponse(content={"error": f"Erreur lecture classeur : {e}"}, status_code=400)
+    return {"session_id": session.session_id, "filename": session.filename, "sheets": sheets}
+
+
+@router.delete("/geochem-session/{session_id}")
+async def close_geochem_session(session_id: str):
+    return {"closed": workbook_sessions.close(session_id)}
+
 @router.post("/extract-geochem")
 async def extract_geochem(
     request: Request,
-    excel: UploadFile = File(...),
+    excel: UploadFile = File(None),
     keywords_json: str = Form(...),
     extraction_type: str = Form(...),
     config_json: str = Form(...),
-    sheet_name: str = Form(...)
+    sheet_name: str = Form(...),
+    session_id: str = Form(None),
+    fuzzy: bool = Form(False),  # approximate matching (typos), ranked candidates with "scores"
+    min_score: float = Form(FUZZY_MIN_SCORE)
 ):
     print("Reception FormData :")
     form = await request.form()
@@ -34,44 +162,48 @@ async def extract_geochem(
     except Exception as e:
         print(f"❌ Erreur de parsing ou de conversion : {e}")
         return JSONResponse(content={"error": f"Erreur parsing JSON : {e}"}, status_code=400)
+    if not 0 <= min_score <= 1:
+        return JSONResponse(content={"error": f"min_score doit être entre 0 et 1 : {min_score}"}, status_code=400)
 
-    # Save excel temporarily
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_excel:
-        shutil.copyfileobj(excel.file, tmp_excel)
-        tmp_path = tmp_excel.name
+    session = await get_workbook_session(excel, session_id)
 
     try:
-        df = pd.read_excel(tmp_path, sheet_name=sheet_name, header=None)
-
-        if extraction_type.lower() == "colonnes":
-            labels = df.iloc[config["param_row"]]
-        elif extraction_type.lower() == "lignes":
-            labels = df.iloc[:, config["param_col"]]
+        labels = read_param_labels(session, sheet_name, extraction_type, config)
+
+        # Known lab format : warm MatchPlan of its profile, otherwise a fresh TokenIndex
+        profile, matcher = profile_matcher(session, sheet_name, extraction_type)
+        scores = None
+        notice = None
+        if fuzzy:
+            ranked, multiple_matches = FuzzyTokenIndex(labels).match(keywords, min_score)
+            matched = {kw: [(idx, nom) for idx, nom, _ in hits] for kw, hits in ranked.items()}
+            scores = {kw: [score for _, _, score in hits] for kw, hits in ranked.items()}
+            # No "kw → all" in the input zone : extract() resolves → all with exact matching, only indexed
+            # candidates are proposed. Ambiguous keywords are still reported in "multiple_matches".
+            input_zone_gauche = build_input_zone(matched, [])
+            if profile is not None:
+                notice = (f"Correspondance approchée : le profil « {profile['name']} » n'est pas utilisé "
+                          f"pour la recherche des colonnes")
         else:
-            raise ValueError("Type d'extraction inconnu")
-
-        matched, multiple_matches = BaseExtract.get_matching_columns(labels, keywords)
-
-
-        input_zone_gauche = []
-
-        for kw in sorted(multiple_matches):
-            input_zone_gauche.append(f"{kw} → all")
-
-        for kw, correspondances in matched.items():
-            for idx, vrai_nom in correspondances:
-                input_zone_gauche.append(f"{kw} → ({idx}, {vrai_nom})")
-
-        for kw in matched:
-            if not matched[kw]:
-                input_zone_gauche.append(kw)
+            if matcher is not None:
+                matched, multiple_matches = matcher.get_matching_columns(labels, keywords)
+            else:
+                matched, multiple_matches = BaseExtract.get_matching_columns(labels, keywords)
+            input_zone_gauche = build_input_zone(matched, multiple_matches)
 
         return {
             "matched_columns": matched,
+            "multiple_matches": multiple_matches,
+            "scores": scores,
+            "notice": notice,
             "input_zone_gauche": input_zone_gauche,
             "sheet_name": sheet_name,
             "type": extraction_type,
-            "config": config_raw # Cells
+            "config": config_raw, # Cells
+            "session_id": session.session_id,
+            "fingerprint": session.get_fingerprint(sheet_name),
+            "profile": profile["name"] if profile else None,
+            "profile_used": matcher is not None and not fuzzy  # fuzzy matching bypasses the profile MatchPlan
         }
 
     except Exception as e:
@@ -82,13 +214,101 @@ async def extract_geochem(
 
 
 
+@router.post("/geochem-profiles")
+async def save_geochem_profile(
+    excel: UploadFile = File(None),
+    session_id: str = Form(None),
+    sheet_name: str = Form(...),
+    extraction_type: str = Form(...),
+    config_json: str = Form(...),
+    keywords_json: str = Form(...),
+    selection_json: str = Form(...),
+    name: str = Form(None)
+):
+    # Validated config + selection of a sheet, re-applied to every sheet with the same header layout
+    try:
+        config_raw = json.loads(config_json)
+        convert_config_to_indices(config_raw)
+        keywords = json.loads(keywords_json)
+        selection_data = json.loads(selection_json)
+    except Exception as e:
+        return JSONResponse(content={"error": f"Erreur parsing JSON : {e}"}, status_code=400)
+    if extraction_type.lower() not in ("colonnes", "lignes"):
+        return JSONResponse(content={"error": f"Type d'extraction inconnu : {extraction_type}"}, status_code=400)
+
+    session = await get_workbook_session(excel, session_id)
+    try:
+        fingerprint = session.get_fingerprint(sheet_name)
+    except Exception as e:
+        return JSONResponse(content={"error": f"Erreur lecture feuille : {e}"}, status_code=400)
+
+    profile = layout_profiles.save(fingerprint, {
+        "name": name or os.path.splitext(session.filename or "profil")[0],
+        "extraction_type": extraction_type,
+        "config": config_raw,  # Cells
+        "keywords": keywords,
+        "selection": selection_data,
+        "sheet_name": sheet_name,
+    })
+    return {"profile": profile, "session_id": session.session_id}
+
+
+@router.get("/geochem-profiles")
+async def list_geochem_profiles():
+    return {"profiles": layout_profiles.list()}
+
+
+@router.delete("/geochem-profiles/{fingerprint}")
+async def delete_geochem_profile(fingerprint: str):
+    return {"deleted": layout_profiles.delete(fingerprint)}
+
+
+@router.post("/detect-geochem-profile")
+async def detect_geochem_profile(
+    excel: UploadFile = File(None),
+    session_id: str = Form(None),
+    sheet_name: str = Form(...)
+):
+    # Known layout : same output as /extract-geochem with the saved config, plus the saved selection (UI2)
+    session = await get_workbook_session(excel, session_id)
+    try:
+        fingerprint = session.get_fingerprint(sheet_name)
+        profile = layout_profiles.get(fingerprint)
+        if profile is None:
+            return {"session_id": session.session_id, "fingerprint": fingerprint, "profile": None}
+
+        config = convert_config_to_indices(profile["config"])
+        labels = read_param_labels(session, sheet_name, profile["extraction_type"], config)
+        matched, multiple_matches = layout_profiles.match_plan(fingerprint).get_matching_columns(
+            labels, profile["keywords"])
+
+        return {
+            "session_id": session.session_id,
+            "fingerprint": fingerprint,
+            "profile": profile,
+            "matched_columns": matched,
+            "input_zone_gauche": build_input_zone(matched, multiple_matches),
+            "sheet_name": sheet_name,
+            "type": profile["extraction_type"],
+            "config": profile["config"],
+            "selection": profile["selection"],
+            # Indexed items whose label moved : selection to be checked in UI2 before export
+            "stale_items": stale_selection_items(profile["selection"], labels)
+        }
+
+    except Exception as e:
+        print("❌ ERREUR dans detect-geochem-profile :", traceback.format_exc())
+        return JSONResponse(content={"error": f"Erreur détection profil : {e}"}, status_code=500)
+
+
 @router.post("/randomize-geochem")
 async def randomize_geochem(
-    excel: UploadFile = File(...),
+    excel: UploadFile = File(None),
     matched_columns_json: str = Form(...),
     config_json: str = Form(...),
     extraction_type: str = Form(...),
-    sheet_name: str = Form(...)
+    sheet_name: str = Form(...),
+    session_id: str = Form(None)
 ):
     extraction_type = extraction_type.lower()
     if extraction_type == "colonnes":
@@ -98,21 +318,19 @@ async def randomize_geochem(
     else:
         raise ValueError(f"Type d'extraction inconnu : {extraction_type}")
 
+    session = await get_workbook_session(excel, session_id)
+
     try:
         matched_columns = json.loads(matched_columns_json)
         config_raw = json.loads(config_json)
         config = convert_config_to_indices(config_raw)
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_excel:
-            shutil.copyfileobj(excel.file, tmp_excel)
-            tmp_path = tmp_excel.name
-
-        # Chargement de l'extracteur
+        # Chargement de l'extracteur (feuille déjà lue dans la session)
         if axis == "columns":
-            extractor = ColumnsExtract(tmp_path, None, sheet_name, col_config=config)
+            extractor = ColumnsExtract(None, None, sheet_name, col_config=config)
         else:
-            extractor = RowsExtract(tmp_path, None, sheet_name, row_config=config)
-        extractor.load_data()
+            extractor = RowsExtract(None, None, sheet_name, row_config=config)
+        extractor.df = session.get_dataframe(sheet_name)
 
         # Construction des correspondances (kw → (index, nom))
         correspondances_input = {
@@ -209,7 +427,8 @@ async def randomize_geochem(
             "kw_row": kw_row,
             "kw_col": kw_col,
             "val_row": val_row,
-            "val_col": val_col
+            "val_col": val_col,
+            "session_id": session.session_id
         }
 
     except Exception as e:
@@ -224,22 +443,35 @@ async def randomize_geochem(
 
 @router.post("/export-geochem")
 async def export_geochem_excel(
-    excel: UploadFile,
+    excel: UploadFile = File(None),
     extraction_type: str = Form(...),
     sheet_name: str = Form(...),
     config_json: str = Form(...),
     selection_json: str = Form(...),
-    replace_lq_with: str = Form(None)
+    replace_lq_with: str = Form(None),
+    session_id: str = Form(None),
+    thresholds_json: str = Form(None),  # {keyword / group name: limit}, adds verdict columns + "Ratios seuils" sheet
+    typed_shape: str = Form(None),  # "long" / "wide" : typed output (value, LQ flag, LQ bound, unit) instead
+    output_format: str = Form("xlsx")  # typed output : "xlsx", "csv" or "parquet"
 ):
+    session = await get_workbook_session(excel, session_id)
 
+    # Regulatory thresholds : checked before extracting, a limit that is not a number is a client error
     try:
-        print("🔥 Début export-geochem")
+        thresholds = parse_thresholds(json.loads(thresholds_json)) if thresholds_json else None
+    except json.JSONDecodeError as e:
+        return JSONResponse(content={"error": f"Seuils invalides : JSON illisible ({e})"}, status_code=400)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+    # Typed output keeps LQ in its own columns : no LQ replacement, no thresholds sheet
+    if typed_shape and (thresholds or replace_lq_with is not None):
+        return JSONResponse(content={"error": "Sortie typée (typed_shape) incompatible avec thresholds_json "
+                                              "et replace_lq_with"}, status_code=400)
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-            file_bytes = await excel.read()
-            print("📩 Taille fichier Excel :", len(file_bytes))
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
+    try:
+        print("🔥 Début export-geochem")
+        print("📩 Taille fichier Excel :", len(session.file_bytes))
+        tmp_path = session_excel_path(session)
 
         config_data = json.loads(config_json)
         selection_data = json.loads(selection_json)
@@ -280,21 +512,46 @@ async def export_geochem_excel(
 
         extractor.matched_columns = matched_columns
         extractor.load_keywords_ui2()
-        extractor.load_data()
+        extractor.df = session.get_dataframe(sheet_name)
+        extractor.matcher = profile_matcher(session, sheet_name, extraction_type)[1]
 
         try:
             extractor.extract()
-            output_path = extractor.export()
 
-            # PART FOR CONDITIONAL LQ VALUE INSIDE FRONTEND
+            # Typed output : built from the extraction arrays
+            if typed_shape:
+                try:
+                    output_path = extractor.export_typed(typed_shape.lower(), output_format.lower())
+                except ValueError as e:
+                    return JSONResponse(content={"error": str(e)}, status_code=400)
+                if output_path is None:
+                    return JSONResponse(content={"error": "Aucun résultat à exporter"}, status_code=500)
+                print("📁 Fichier typé généré :", output_path)
+                return FileResponse(output_path, filename=os.path.basename(output_path))
+
+            df_export = extractor.export_frame()
+            if df_export is None:
+                return JSONResponse(content={"error": "Aucun résultat à exporter"}, status_code=500)
+
+            # Regulatory thresholds : compared on the extracted values, before any LQ replacement
+            extra_sheets = None
+            if thresholds:
+                summary, ratios = compare_thresholds(df_export, thresholds)
+                print("⚖️ Verdicts seuils :", summary["Verdict"].value_counts().to_dict())
+                extra_sheets = {"Ratios seuils": ratios}
+
+            # PART FOR CONDITIONAL LQ VALUE INSIDE FRONTEND (in memory, "Nom échantillon" as first column)
             if replace_lq_with is not None:
                 print(f"🔁 Remplacement <LQ par : '{replace_lq_with}'")
-                df = pd.read_excel(output_path)
-                df = df.applymap(lambda v: replace_lq_with if isinstance(v, str) and (
-                        v.strip().lower().startswith("<") or v.strip().lower() in {"n.d.", "n.d", "nd", "-", "n.d,",
-                                                                                   "n.d.."})
-                else v)
-                df.to_excel(output_path, index=False)
+                df_export = replace_lq_values(df_export.reset_index(), replace_lq_with)
+                if thresholds:
+                    df_export = pd.concat([df_export, summary.reset_index(drop=True)], axis=1)
+                output_path = extractor.export(df_export, index=False, extra_sheets=extra_sheets)
+            else:
+                if thresholds:
+                    df_export = df_export.join(summary)
+                output_path = extractor.export(df_export, extra_sheets=extra_sheets)
+                df_export = df_export.reset_index()
 
         except Exception as e:
             print("❌ ERREUR dans extractor.extract() :", e)
@@ -303,10 +560,9 @@ async def export_geochem_excel(
 
         print("✅ EXTRACT FAIT")
 
-        df = pd.read_excel(output_path)
-        print("📏 Taille résultat :", df.shape)
-        print("📋 Colonnes résultat :", list(df.columns))
-        print("📑 Head résultat :\n", df.head(3))
+        print("📏 Taille résultat :", df_export.shape)
+        print("📋 Colonnes résultat :", list(df_export.columns))
+        print("📑 Head résultat :\n", df_export.head(3))
         print("📁 Fichier généré :", output_path)
 
         return FileResponse(output_path, filename=os.path.basename(output_path))
@@ -318,17 +574,17 @@ async def export_geochem_excel(
 
 @router.post("/preview-geochem")
 async def preview_geochem_excel(
-    excel: UploadFile = File(...),
+    excel: UploadFile = File(None),
     extraction_type: str = Form(...),
     sheet_name: str = Form(...),
     config_json: str = Form(...),
-    selection_json: str = Form(...)
+    selection_json: str = Form(...),
+    session_id: str = Form(None)
 ):
+    session = await get_workbook_session(excel, session_id)
+
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-            file_bytes = await excel.read()
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
+        tmp_path = session_excel_path(session)
 
         config_data = json.loads(config_json)
         selection_data = json.loads(selection_json)
@@ -347,17 +603,133 @@ async def preview_geochem_excel(
             extractor = RowsExtract(tmp_path, temp_json_path, sheet_name, row_config=config_extraction)
 
         extractor.load_keywords_ui2()
-        extractor.load_data()
-        extractor.extract()
+        extractor.df = session.get_dataframe(sheet_name)
+        extractor.matcher = profile_matcher(session, sheet_name, extraction_type)[1]
+        extractor.extract(max_samples=PREVIEW_SAMPLES)
 
-        # Limiter à 5 lignes
-        df_preview = pd.DataFrame.from_dict(extractor.resultats, orient="index")
+        # Limiter à 5 lignes (seuls les premiers échantillons sont extraits)
+        df_preview = extractor.resultats.to_frame()
         df_preview.reset_index(inplace=True)  # ajoute index en colonne
-        preview_data = df_preview.head(5).to_dict(orient="records")
+        preview_data = df_preview.head(PREVIEW_SAMPLES).to_dict(orient="records")
 
-        return JSONResponse(content=jsonable_encoder({"preview_resultats": preview_data}))
+        return JSONResponse(content=jsonable_encoder({"preview_resultats": preview_data,
+                                                      "session_id": session.session_id}))
 
     except Exception as e:
         import traceback
         print("❌ ERREUR dans preview-geochem :", traceback.format_exc())
-        return JSONResponse(content={"error": f"Erreur dans preview : {e}"}, status_code=500)
\ No newline at end of file
+        return JSONResponse(content={"error": f"Erreur dans preview : {e}"}, status_code=500)
+
+
+# OUTPUT (async generator of NDJSON lines):
+#   {"type": "file", "file": source, "done": k, "total": n, "sheets": [{"sheet", "samples", "error"}]}
+#       once every sheet of a workbook is extracted (completion order, not upload order)
+#   {"type": "done", "output_file": name, "files": n, "samples": rows, "errors": count}
+#       merged workbook written in BATCH_OUTPUT_DIR (rows in upload / sheet order)
+async def stream_batch_worker(tasks, total, extraction_type, config_extraction, selection_data,
+                              replace_lq_with, workers, output_filename):
+    # workers == 1 : tasks run one by one in a thread, the event loop keeps serving /progress
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else ThreadPoolExecutor(max_workers=1)
+    try:
+        progress.progress_state["progress_count"] = 0
+        progress.progress_state["total_count"] = total
+        progress.progress_state["is_running"] = True
+        progress.progress_state["last_output_file"] = None
+
+        async def run_task(position, source, sheet_name, file_bytes):
+            args = (file_bytes, source, sheet_name, extraction_type, config_extraction, selection_data)
+            return position, await loop.run_in_executor(pool, extract_workbook_sheet, *args)
+
+        futures = [asyncio.ensure_future(run_task(position, *task)) for position, task in enumerate(tasks)]
+        results = [None] * len(tasks)
+        remaining = {}
+        for source, _, _ in tasks:
+            remaining[source] = remaining.get(source, 0) + 1
+        done_files = 0
+        try:
+            for future in asyncio.as_completed(futures):
+                position, result = await future
+                results[position] = result
+                remaining[result["source"]] -= 1
+                if remaining[result["source"]] == 0:
+                    done_files += 1
+                    progress.progress_state["progress_count"] = done_files
+                    sheets = [{"sheet": r["sheet"], "samples": r["samples"], "error": r["error"]}
+                              for r in results if r is not None and r["source"] == result["source"]]
+                    yield json.dumps({"type": "file", "file": result["source"], "done": done_files,
+                                      "total": total, "sheets": sheets}, ensure_ascii=False) + "\n"
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+        df_merged = merge_batch_frames(results, selection_data.get("ordre_selection", []))
+        if replace_lq_with is not None:
+            df_merged = replace_lq_values(df_merged, replace_lq_with)
+        os.makedirs(BATCH_OUTPUT_DIR, exist_ok=True)
+        df_merged.to_excel(os.path.join(BATCH_OUTPUT_DIR, output_filename), index=False)
+        progress.progress_state["last_output_file"] = output_filename
+        print(f"✅ Batch geochem : {len(df_merged)} échantillons → {output_filename}")
+
+        yield json.dumps({"type": "done", "output_file": output_filename, "files": total,
+                          "samples": len(df_merged), "errors": sum(r["error"] is not None for r in results)},
+                         ensure_ascii=False) + "\n"
+
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        # Remise à zéro des flags (the response is sent after the endpoint returned)
+        progress.progress_state["is_running"] = False
+        progress.progress_state["current_task"] = None
+        progress.progress_state["progress_count"] = 0
+        progress.progress_state["total_count"] = 1
+
+
+@router.post("/batch-geochem")
+async def batch_geochem(
+    files: list[UploadFile] = File(...),
+    extraction_type: str = Form(...),
+    config_json: str = Form(...),
+    selection_json: str = Form(...),
+    sheet_names_json: str = Form(None),  # JSON list, every sheet of each workbook when absent
+    replace_lq_with: str = Form(None),
+    workers: int = Form(None),
+    custom_name: str = Form(None)
+):
+    # Workbooks (.xlsx / .xlsm) and / or ZIP archives, same config and selection for every sheet
+    try:
+        config_extraction = convert_config_to_indices(json.loads(config_json))
+        selection_data = json.loads(selection_json)
+        sheet_names = json.loads(sheet_names_json) if sheet_names_json else None
+        workbooks = expand_uploads([(f.filename, await f.read()) for f in files])
+    except Exception as e:
+        return JSONResponse(content={"error": f"Erreur paramètres batch : {e}"}, status_code=400)
+    if not workbooks:
+        return JSONResponse(content={"error": "Aucun classeur Excel reçu"}, status_code=400)
+    if extraction_type.lower() not in ("colonnes", "lignes"):
+        return JSONResponse(content={"error": f"Type d'extraction inconnu : {extraction_type}"}, status_code=400)
+
+    tasks = []
+    for source, file_bytes in workbooks:
+        try:
+            sheets, missing = select_sheets(file_bytes, sheet_names)
+        except Exception as e:
+            return JSONResponse(content={"error": f"Erreur lecture classeur {source} : {e}"}, status_code=400)
+        if missing:
+            print(f"⚠️ {source} : feuilles absentes {missing}")
+        tasks.extend((source, sheet_name, file_bytes) for sheet_name in sheets)
+        tasks.extend((source, sheet_name, None) for sheet_name in missing)
+    if all(file_bytes is None for _, _, file_bytes in tasks):
+        return JSONResponse(content={"error": "Aucune feuille à extraire"}, status_code=400)
+
+    total = len({source for source, _, _ in tasks})
+    workers = batch_workers(workers, len(tasks))
+    horodatage = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_filename = f"{custom_name}.xlsx" if custom_name else f"geochem_batch_{horodatage}.xlsx"
+    print(f"📦 Batch geochem : {len(workbooks)} classeurs, {len(tasks)} feuilles, {workers} process")
+
+    return StreamingResponse(
+        stream_batch_worker(tasks, total, extraction_type, config_extraction, selection_data,
+                            replace_lq_with, workers, output_filename),
+        media_type="application/x-ndjson"
+    )
@@ -1,10 +1,9 @@
-from fastapi import APIRouter, UploadFile, File, Form
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, UploadFile, File, Form, Request
+from fastapi.responses import JSONResponse, StreamingResponse, Response, FileResponse
 
 import pandas as pd
 import io
-import pdfplumber
-import re
+import os
 import json
 import statistics
 from decimal import Decimal, getcontext
@@ -12,11 +11,44 @@ from decimal import Decimal, getcontext
 import progress
 import asyncio
 import traceback
+import hashlib
+import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from services.pdf_words import open_word_pages
+from services.pressio_columnar import render_pressio_payload, parse_pressio_payload, PayloadTooLarge
+from services.pressio_xlsx import write_pressio_xlsx, iter_file_chunks, unique_sheet_names, EXPORTERS, EXPORT_LAYOUTS
+from services.page_raster_cache import PageRasterCache
+from services.pressio_pairing import pair_combined_values
+from services.pressio_keywords import (
+    keyword_reference, words_near_keyword, extract_values_near_keyword, get_keyword_x_positions,
+)
+from services.borehole_names import detect_borehole_name, identifier_pattern, identifiers_key
 
 getcontext().prec = 10
 
 router = APIRouter()
 
+PAGE_CACHE_DIR = os.getenv("PAGE_CACHE_DIR", "page_cache")
+PAGE_CACHE_MAX_MB = int(os.getenv("PAGE_CACHE_MAX_MB", "500"))
+PAGE_DPI_MIN, PAGE_DPI_MAX = 72, 300
+page_raster_cache = None
+
+
+def get_page_raster_cache():
+    # Built on first overlay request : importing the router creates no directory
+    global page_raster_cache
+    if page_raster_cache is None:
+        page_raster_cache = PageRasterCache(PAGE_CACHE_DIR, PAGE_CACHE_MAX_MB * 1024 * 1024)
+    return page_raster_cache
+
+
+def check_page_dpi(dpi):
+    if not PAGE_DPI_MIN <= dpi <= PAGE_DPI_MAX:
+        raise ValueError(f"dpi hors limites ({PAGE_DPI_MIN} à {PAGE_DPI_MAX}) : {dpi}")
+
 
 def detect_y_anomalies(y_val_list, keyword):
     if len(y_val_list) < 3:
@@ -50,48 +82,78 @@ def detect_y_anomalies(y_val_list, keyword):
     return output, red_flags
 
 
-def detect_pressio_name(words):
-    pattern = re.compile(r"\bSP\d{1,4}\b")
-    for w in words:
-        text = w.get('text', '')
-        if pattern.fullmatch(text.strip()):
-            return text.strip()
-    return None
+def detect_pressio_name(words, pattern=None):
+    # pattern : precompiled identifier alternation (services/borehole_names.py), default SP only
+    return detect_borehole_name(words, pattern)
 
 
-def extract_values_near_keyword(words, keyword, tolerance):
-    ref_word = next((w for w in words if w['text'].strip().lower() == keyword.lower()), None)
-    if not ref_word:
-        return []
+# COLUMN BANDS : once Pf*/Pl*/Module headers are located, later pages only read these vertical bands + name header
 
-    x_ref = (ref_word['x0'] + ref_word['x1']) / 2
-    y_ref = ref_word['top']
+PRESSIO_TOLERANCES = {
+    "Pf*": {"left": 10, "right": 30, "min_dy": 50},
+    "Pl*": {"left": 10, "right": 30, "min_dy": 50},
+    "Module": {"left": 10, "right": 54, "min_dy": 50},
+}
+BAND_MARGIN = 20  # pts around each band, keeps words crossing a band edge in one piece
+BAND_X_DRIFT = 5  # pts, maximum header shift before the geometry is learnt again
 
-    values = []
-    for w in words:
-        try:
-            val = float(w['text'].replace(",", "."))
-        except ValueError:
-            continue
 
-        x_c = (w['x0'] + w['x1']) / 2
-        y_c = w['top']
+def learn_column_bands(words, x_positions, pressio_name):
+    name_word = next((w for w in words if w.get('text', '').strip() == pressio_name), None)
+    if name_word is None or not x_positions:
+        return None
 
-        if (x_ref - tolerance['left'] <= x_c <= x_ref + tolerance['right']) and (y_c > y_ref + tolerance['min_dy']):
-            values.append((y_c, val))
+    intervals = sorted(
+        (x - PRESSIO_TOLERANCES[kw]["left"] - BAND_MARGIN, x + PRESSIO_TOLERANCES[kw]["right"] + BAND_MARGIN)
+        for kw, x in x_positions.items()
+    )
+    # Pf* and Pl* overlap when combined : merge so that no word is read twice
+    bands = [list(intervals[0])]
+    for x0, x1 in intervals[1:]:
+        if x0 <= bands[-1][1]:
+            bands[-1][1] = max(bands[-1][1], x1)
+        else:
+            bands.append([x0, x1])
 
-    return sorted(values, key=lambda x: x[0])
+    return {
+        "x_positions": dict(x_positions),
+        "bands": [tuple(b) for b in bands],
+        "header": (name_word['x0'] - BAND_MARGIN, name_word['top'] - 5,
+                   name_word['x1'] + BAND_MARGIN, name_word['bottom'] + 5),
+    }
 
 
-def get_keyword_x_positions(words, keywords):
-    positions = {}
-    for kw in keywords:
-        for w in words:
-            if w['text'].strip().lower() == kw.lower():
-                x = (w['x0'] + w['x1']) / 2
-                positions[kw] = x
-                break
-    return positions
+def extract_words_in_bands(page, geometry):
+    boxes = [(x0, None, x1, None) for x0, x1 in geometry["bands"]] + [geometry["header"]]
+    return page.extract_words_in(boxes)
+
+
+def bands_still_valid(geometry, x_positions):
+    learnt = geometry["x_positions"]
+    return learnt.keys() == x_positions.keys() and all(
+        abs(x_positions[kw] - x) <= BAND_X_DRIFT for kw, x in learnt.items()
+    )
+
+
+def read_words_from_bands(page, band_mode, geometries, last_geometry, keywords, pressio, name_pattern=None):
+    # OUTPUT: (words, pressio_name, x_positions) or None when the full page has to be read again
+    words = extract_words_in_bands(page, last_geometry)
+    pressio_name = detect_pressio_name(words, name_pattern)
+    if pressio_name is None:
+        return None
+    if pressio_name not in pressio:
+        return words, pressio_name, {}
+
+    geometry = geometries.get(pressio_name) if band_mode == "borehole" else last_geometry
+    if geometry is None:
+        return None
+    if geometry is not last_geometry:
+        words = extract_words_in_bands(page, geometry)
+
+    x_positions = get_keyword_x_positions(words, keywords)
+    if not bands_still_valid(geometry, x_positions):
+        return None
+    return words, pressio_name, x_positions
 
 
 def generate_depths_from_config(config):
@@ -101,27 +163,45 @@ def generate_depths_from_config(config):
     return [round(s + i * p, 3) for i in range(int((e - s) / p + 1))]
 
 
+async def cancel_current_task():
+    current_task = progress.progress_state.get("current_task")
+    if progress.progress_state.get("is_running") and current_task and not current_task.done():
+        current_task.cancel()
+        try:
+            await current_task
+        except asyncio.CancelledError:
+            pass
+
+
 # EXTRACTION PRESSIOMETRE
 
-async def extract_pressio_worker(pdf_bytes):
+async def extract_pressio_worker(pdf_bytes, word_backend="pdfplumber", identifiers=None):
     try:
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as doc:
-            pages = doc.pages
+        with open_word_pages(pdf_bytes, word_backend) as pages:
             total = len(pages)
             progress.progress_state["progress_count"] = 0
             progress.progress_state["total_count"] = total
             progress.progress_state["is_running"] = True
 
             pressio = set()
-            pattern = re.compile(r"\bSP\d{1,4}\b", re.IGNORECASE)
-            # BASIC PATTERN SPXXXX From SP1 to SP9999 possible, to be modified to let user choose
+            # Identifier families (default SP1 to SP9999), compiled once : listing is case insensitive,
+            # page → borehole assignment is case sensitive as in detect_pressio_name
+            listing_pattern = identifier_pattern(identifiers, ignore_case=True)
+            name_pattern = identifier_pattern(identifiers)
+
+            cache = get_pressio_cache(pdf_bytes, word_backend, identifiers)
 
             for i, page in enumerate(pages):
                 words = page.extract_words()
+                page_name = None
                 for word in words:
                     txt = word.get("text", "").strip()
-                    if pattern.fullmatch(txt):
+                    if listing_pattern.fullmatch(txt):
                         pressio.add(txt)
+                        if page_name is None and name_pattern.fullmatch(txt):
+                            page_name = txt
+                # Page → borehole as /process-pressio will see it : its first pass only reads selected pages
+                cache["names"][page.page_number] = page_name or f"Page {page.page_number}"
 
                 progress.progress_state["progress_count"] = i + 1
                 await asyncio.sleep(0)
@@ -137,18 +217,22 @@ async def extract_pressio_worker(pdf_bytes):
         raise e
 
 @router.post("/extract-pressio")
-async def extract_pressio(pdf: UploadFile = File(...)):
-    current_task = progress.progress_state.get("current_task")
-    if progress.progress_state.get("is_running") and current_task and not current_task.done():
-        current_task.cancel()
-        try:
-            await current_task
-        except asyncio.CancelledError:
-            pass
+async def extract_pressio(
+    pdf: UploadFile = File(...),
+    word_backend: str = Form("pdfplumber"),
+    identifiers_json: str = Form(None)
+):
+    await cancel_current_task()
 
     content = await pdf.read()
+    # ex: ["SP", "PR", "SC"], see services/borehole_names.py
+    try:
+        identifiers = json.loads(identifiers_json) if identifiers_json else None
+        identifier_pattern(identifiers)
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
     # Directement appeler la fonction worker et attendre le résultat
-    result = await extract_pressio_worker(content)
+    result = await extract_pressio_worker(content, word_backend, identifiers)
     # Remise à zéro des flags
     progress.progress_state["is_running"] = False
     progress.progress_state["current_task"] = None
@@ -160,110 +244,293 @@ async def extract_pressio(pdf: UploadFile = File(...)):
 
 # PROCESS POST EXTRACT PRESSIOMETRE
 
-async def process_pressio_worker(pdf_bytes, config_data):
-    print("📥 config_data reçu :", config_data)
-    try:
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as doc:
-            pages = doc.pages
-            total = len(pages)
-
-            progress.progress_state["progress_count"] = 0
-            progress.progress_state["total_count"] = total
-            progress.progress_state["is_running"] = True
-
-            mode = config_data['mode']
-            depth_config = config_data['config']
-            pressio = config_data['pressio']
-            keywords = ["Pf*", "Pl*", "Module"]
-
-            final_data = {}
+# INPUT:
+#   words (list[dict]): word boxes of one page (pdfplumber semantics).
+#   x_positions (dict[str, float]): x center of each keyword header found on the page.
+#   keywords (list[str]): ["Pf*", "Pl*", "Module"].
+# OUTPUT:
+#   dict {"Pf*", "Pl*", "Module": values, "RedFlags": {kw: page indices}, "Warnings": [str]}
+#   (combined Pf*/Pl* column with an odd number of values : the unpaired value is reported in "Warnings").
+def analyse_pressio_page(words, x_positions, keywords):
+    # Détection des positions
+    is_combined = False
+    if "Pf*" in x_positions and "Pl*" in x_positions:
+        distance = abs(x_positions["Pf*"] - x_positions["Pl*"])
+        if distance <= 15:
+            is_combined = True
+
+    values_by_keyword = {k: extract_values_near_keyword(words, k, PRESSIO_TOLERANCES[k]) for k in keywords}
+
+    warnings = []
+    if is_combined:
+        pf_final, pl_final, unpaired = pair_combined_values(values_by_keyword["Pf*"])
+        warnings += [f"Pf*/Pl* combinés : nombre impair de valeurs, {v} (y = {y:.1f} pts) non appariée"
+                     for y, v in unpaired]
+    else:
+        pf_final = values_by_keyword["Pf*"]
+        pl_final = values_by_keyword["Pl*"]
+
+    em_final = values_by_keyword["Module"]
+
+    pf_list, pf_red = detect_y_anomalies(pf_final, "Pf*")
+    pl_list, pl_red = detect_y_anomalies(pl_final, "Pl*")
+    em_list, em_red = detect_y_anomalies(em_final, "Module")
+
+    return {
+        "Pf*": pf_list,
+        "Pl*": pl_list,
+        "Module": em_list,
+        "RedFlags": {
+            "Pf*": pf_red,
+            "Pl*": pl_red,
+            "Module": em_red
+        },
+        "Warnings": warnings
+    }
+
+
+def new_pressio_entry():
+    return {
+        "Depth": [],
+        "Pf*": [],
+        "Pl*": [],
+        "Module": [],
+        "RedFlags": {
+            "Pf*": [],
+            "Pl*": [],
+            "Module": []
+        },
+        "Warnings": []
+    }
+
+
+def merge_pressio_page(entry, page_result):
+    if not entry["Depth"]:
+        entry["Depth"] = page_result["Depth"]
+
+    entry["Pf*"] += page_result["Pf*"]
+    entry["Pl*"] += page_result["Pl*"]
+    entry["Module"] += page_result["Module"]
+    entry["RedFlags"]["Pf*"] += page_result["RedFlags"]["Pf*"]
+    entry["RedFlags"]["Pl*"] += page_result["RedFlags"]["Pl*"]
+    entry["RedFlags"]["Module"] += page_result["RedFlags"]["Module"]
+    entry["Warnings"] += page_result.get("Warnings", [])
+
+
+# PAGE CACHE : value extraction is kept per (document hash, word backend, identifiers, band mode, tolerances),
+#   only depths are recomputed
+#   {"names": {page_number: pressio_name}, "analysis": {page_number: analyse_pressio_page(...) or None}}
+#   names are known for every page read once, analysis for selected pages only. /extract-pressio reads full
+#   pages : it seeds the names of the band_mode None entry.
+PRESSIO_CACHE_SIZE = 8  # documents
+pressio_page_cache = OrderedDict()
+
+
+def tolerances_key():
+    # Everything that moves the columns read on a page : keyword tolerances and band margins
+    return json.dumps([PRESSIO_TOLERANCES, BAND_MARGIN, BAND_X_DRIFT], sort_keys=True)
+
+
+def get_pressio_cache(pdf_bytes, word_backend, identifiers=None, band_mode=None):
+    key = (hashlib.sha256(pdf_bytes).hexdigest(), word_backend, identifiers_key(identifiers),
+           band_mode, tolerances_key())
+    if key in pressio_page_cache:
+        pressio_page_cache.move_to_end(key)
+    else:
+        pressio_page_cache[key] = {"names": {}, "analysis": {}}
+        while len(pressio_page_cache) > PRESSIO_CACHE_SIZE:
+            pressio_page_cache.popitem(last=False)
+    return pressio_page_cache[key]
+
+
+def align_page_depths(analysis, pressio_name, mode, depth_config):
+    # Cheap stage : returns a new page_result, the cached analysis is left untouched
+    if analysis is None:
+        return None
+    if mode == "global":
+        depths = generate_depths_from_config(depth_config)
+    elif pressio_name in depth_config:
+        depths = generate_depths_from_config(depth_config[pressio_name])
+    else:
+        return None
+    return {**analysis, "Depth": depths}
+
+
+# INPUT:
+#   pages (list): word pages (services/pdf_words.py), consecutive pages of the document.
+#   config_data (dict): request config ("mode", "config", "pressio", optional "band_mode").
+#   cache (dict | None): page cache of the document (see get_pressio_cache), filled as pages are read.
+# OUTPUT (generator):
+#   (pressio_name, page_number, page_result) for every page, page_result None when the page is skipped.
+#   page_result = analyse_pressio_page(...) + "Depth" from the depth configuration.
+def scan_pressio_pages(pages, config_data, cache=None):
+    mode = config_data['mode']
+    depth_config = config_data['config']
+    pressio = config_data['pressio']
+    keywords = ["Pf*", "Pl*", "Module"]
+    # "layout" : one band geometry for the document, "borehole" : one per borehole, None : full pages
+    band_mode = config_data.get('band_mode')
+    geometries = {}
+    last_geometry = None
+    # Borehole families, ex: ["SP", "PR", "SC"] (services/borehole_names.py)
+    name_pattern = identifier_pattern(config_data.get('identifiers'))
+    if cache is None:
+        cache = {"names": {}, "analysis": {}}
+
+    for page in pages:
+        page_number = page.page_number
+        pressio_name = cache["names"].get(page_number)
+
+        # Page already known : not selected, or already analysed
+        if pressio_name is not None and (pressio_name not in pressio or page_number in cache["analysis"]):
+            analysis = cache["analysis"].get(page_number) if pressio_name in pressio else None
+            yield pressio_name, page_number, align_page_depths(analysis, pressio_name, mode, depth_config)
+            continue
 
-            for i, page in enumerate(pages):
-                words = page.extract_words()
-                pressio_name = detect_pressio_name(words) or f"Page {page.page_number}"
-                if pressio_name not in pressio:
+        read = None
+        if band_mode and last_geometry is not None:
+            read = read_words_from_bands(page, band_mode, geometries, last_geometry, keywords, pressio, name_pattern)
+
+        if read is not None:
+            words, pressio_name, x_positions = read
+        else:
+            words = page.extract_words()
+            pressio_name = detect_pressio_name(words, name_pattern)
+            x_positions = get_keyword_x_positions(words, keywords)
+            if band_mode:
+                geometry = learn_column_bands(words, x_positions, pressio_name)
+                if geometry is not None:
+                    geometries[pressio_name if band_mode == "borehole" else "layout"] = geometry
+                    last_geometry = geometry
+
+        pressio_name = pressio_name or f"Page {page_number}"
+        cache["names"][page_number] = pressio_name
+        analysis = None
+        if pressio_name in pressio:
+            analysis = analyse_pressio_page(words, x_positions, keywords)
+            cache["analysis"][page_number] = analysis
+
+        yield pressio_name, page_number, align_page_depths(analysis, pressio_name, mode, depth_config)
+
+
+# PARALLEL : pages are scanned by chunks in a process pool shared by the requests, chunks are consumed in page order.
+#   The PDF is written once to a temp file, workers reopen it (the bytes are not sent with every chunk).
+PARALLEL_CHUNK_PAGES = 8
+PRESSIO_MAX_WORKERS = max(1, int(os.getenv("PRESSIO_MAX_WORKERS", os.cpu_count() or 1)))
+pressio_pool = None
+
+
+def get_pressio_pool():
+    global pressio_pool
+    if pressio_pool is None:
+        pressio_pool = ProcessPoolExecutor(max_workers=PRESSIO_MAX_WORKERS)
+    return pressio_pool
+
+
+def reset_pressio_pool():
+    # A crashed worker breaks the pool : the next request starts a new one
+    global pressio_pool
+    if pressio_pool is not None:
+        pressio_pool.shutdown(wait=False, cancel_futures=True)
+        pressio_pool = None
+
+
+# INPUT:
+#   requested: config_data["workers"] as sent by the client (invalid → 1).
+#   n_chunks (int | None): chunks of the document, once known.
+# OUTPUT:
+#   int: chunks scanned at the same time, 1 <= workers <= min(PRESSIO_MAX_WORKERS, cpu count, n_chunks).
+def pressio_workers(requested, n_chunks=None):
+    try:
+        requested = int(requested or 1)
+    except (TypeError, ValueError):
+        requested = 1
+    workers = min(requested, PRESSIO_MAX_WORKERS, os.cpu_count() or 1)
+    if n_chunks is not None:
+        workers = min(workers, n_chunks)
+    return max(1, workers)
+
+
+def scan_pressio_chunk(pdf_path, config_data, start, stop, cache):
+    # Runs in a worker process : the document is opened once per chunk, the chunk's cache is sent back
+    with open_word_pages(pdf_path, config_data.get('word_backend', 'pdfplumber')) as pages:
+        return list(scan_pressio_pages(pages[start:stop], config_data, cache)), cache
+
+
+def chunk_cache(cache, start, stop):
+    # Pages are 1-indexed in the cache, chunks are 0-indexed slices
+    pages = range(start + 1, stop + 1)
+    return {
+        "names": {n: cache["names"][n] for n in pages if n in cache["names"]},
+        "analysis": {n: cache["analysis"][n] for n in pages if n in cache["analysis"]},
+    }
+
+
+def count_pdf_pages(pdf_bytes, word_backend):
+    with open_word_pages(pdf_bytes, word_backend) as pages:
+        return len(pages)
+
+
+# OUTPUT (async generator):
+#   (pressio_name, page_number, page_result) for every selected and usable page, in page order.
+#   config_data["workers"] > 1 : chunks of PARALLEL_CHUNK_PAGES pages run in the shared process pool, at most
+#   `workers` chunks at a time (see pressio_workers), results are identical to the sequential scan
+#   (band geometries are learnt per chunk).
+async def iter_pressio_pages(pdf_bytes, config_data):
+    word_backend = config_data.get('word_backend', 'pdfplumber')
+    cache = get_pressio_cache(pdf_bytes, word_backend, config_data.get('identifiers'), config_data.get('band_mode'))
+    workers = pressio_workers(config_data.get('workers'))
+    if workers > 1:
+        total = count_pdf_pages(pdf_bytes, word_backend)
+        workers = pressio_workers(workers, -(-total // PARALLEL_CHUNK_PAGES))
+    try:
+        progress.progress_state["progress_count"] = 0
+        progress.progress_state["is_running"] = True
+
+        if workers <= 1:
+            # "pdfplumber" (default) or "pymupdf", see services/pdf_words.py
+            with open_word_pages(pdf_bytes, word_backend) as pages:
+                progress.progress_state["total_count"] = len(pages)
+                for i, (pressio_name, page_number, page_result) in enumerate(scan_pressio_pages(pages, config_data, cache)):
                     progress.progress_state["progress_count"] = i + 1
+                    if page_result is not None:
+                        yield pressio_name, page_number, page_result
                     await asyncio.sleep(0)
-                    continue
-
-                # Détection des positions
-                x_positions = get_keyword_x_positions(words, keywords)
-                is_combined = False
-                if "Pf*" in x_positions and "Pl*" in x_positions:
-                    distance = abs(x_positions["Pf*"] - x_positions["Pl*"])
-                    if distance <= 15:
-                        is_combined = True
-
-                values_by_keyword = {k: extract_values_near_keyword(words, k, {
-                    "left": 10, "right": 30 if k != "Module" else 54, "min_dy": 50
-                }) for k in keywords}
-
-                if is_combined:
-                    pf_final, pl_final = [], []
-                    pf_vals = values_by_keyword["Pf*"]
-                    if len(pf_vals) % 2 != 0:
-                        progress.progress_state["progress_count"] = i + 1
-                        await asyncio.sleep(0)
-                        continue
-                    for idx in range(len(pf_vals) - 2, -1, -2):
-                        a, b = pf_vals[idx][1], pf_vals[idx + 1][1]
-                        if a < b:
-                            pf_final.append((pf_vals[idx][0], a))
-                            pl_final.append((pf_vals[idx + 1][0], b))
-                        else:
-                            pf_final.append((pf_vals[idx + 1][0], b))
-                            pl_final.append((pf_vals[idx][0], a))
-                    pf_final.reverse()
-                    pl_final.reverse()
-                else:
-                    pf_final = values_by_keyword["Pf*"]
-                    pl_final = values_by_keyword["Pl*"]
-
-                em_final = values_by_keyword["Module"]
-
-                pf_list, pf_red = detect_y_anomalies(pf_final, "Pf*")
-                pl_list, pl_red = detect_y_anomalies(pl_final, "Pl*")
-                em_list, em_red = detect_y_anomalies(em_final, "Module")
-
-                if mode == "global":
-                    depths = generate_depths_from_config(depth_config)
-                else:
-                    if pressio_name not in depth_config:
-                        progress.progress_state["progress_count"] = i + 1
-                        await asyncio.sleep(0)
-                        continue
-                    depths = generate_depths_from_config(depth_config[pressio_name])
-
-                if pressio_name not in final_data:
-                    final_data[pressio_name] = {
-                        "Depth": [],
-                        "Pf*": [],
-                        "Pl*": [],
-                        "Module": [],
-                        "RedFlags": {
-                            "Pf*": [],
-                            "Pl*": [],
-                            "Module": []
-                        }
-                    }
-
-                if not final_data[pressio_name]["Depth"]:
-                    final_data[pressio_name]["Depth"] = depths
-
-                final_data[pressio_name]["Pf*"] += pf_list
-                final_data[pressio_name]["Pl*"] += pl_list
-                final_data[pressio_name]["Module"] += em_list
-                final_data[pressio_name]["RedFlags"]["Pf*"] += pf_red
-                final_data[pressio_name]["RedFlags"]["Pl*"] += pl_red
-                final_data[pressio_name]["RedFlags"]["Module"] += em_red
-
-                progress.progress_state["progress_count"] = i + 1
-                await asyncio.sleep(0)
+        else:
+            progress.progress_state["total_count"] = total
 
-            progress.progress_state["is_running"] = False
-            progress.progress_state["last_output_file"] = None
+            loop = asyncio.get_running_loop()
+            pool = get_pressio_pool()
+            chunks = deque((start, min(start + PARALLEL_CHUNK_PAGES, total))
+                           for start in range(0, total, PARALLEL_CHUNK_PAGES))
+            pending = deque()
+            fd, pdf_path = tempfile.mkstemp(suffix=".pdf")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pdf_bytes)
+                while chunks or pending:
+                    while chunks and len(pending) < workers:
+                        start, stop = chunks.popleft()
+                        pending.append(loop.run_in_executor(pool, scan_pressio_chunk, pdf_path, config_data,
+                                                            start, stop, chunk_cache(cache, start, stop)))
+                    records, scanned_cache = await pending.popleft()
+                    cache["names"].update(scanned_cache["names"])
+                    cache["analysis"].update(scanned_cache["analysis"])
+                    for pressio_name, page_number, page_result in records:
+                        progress.progress_state["progress_count"] = page_number
+                        if page_result is not None:
+                            yield pressio_name, page_number, page_result
+            except BaseException as e:
+                for future in pending:
+                    future.cancel()
+                if isinstance(e, BrokenProcessPool):
+                    reset_pressio_pool()
+                raise
+            finally:
+                os.remove(pdf_path)
 
-            return final_data
+        progress.progress_state["is_running"] = False
+        progress.progress_state["last_output_file"] = None
 
     except Exception as e:
         progress.progress_state["is_running"] = False
@@ -271,18 +538,60 @@ async def process_pressio_worker(pdf_bytes, config_data):
         raise e
 
 
+async def process_pressio_worker(pdf_bytes, config_data):
+    print("📥 config_data reçu :", config_data)
+    final_data = {}
+    async for pressio_name, _, page_result in iter_pressio_pages(pdf_bytes, config_data):
+        if pressio_name not in final_data:
+            final_data[pressio_name] = new_pressio_entry()
+        merge_pressio_page(final_data[pressio_name], page_result)
+    return final_data
+
+
+# OUTPUT (async generator of NDJSON lines):
+#   {"pressio": name, "partial": true, "page": n, "data": page_result}   each page, only if partial=True
+#   {"pressio": name, "partial": false, "data": entry}                   once the borehole's pages are done
+#   A borehole is flushed when the next selected page belongs to another one (log sheets are contiguous).
+#   If it shows up again later, a new complete record is sent and supersedes the previous one.
+async def stream_pressio_worker(pdf_bytes, config_data, partial=False):
+    print("📥 config_data reçu (stream) :", config_data)
+    final_data = {}
+    current = None
+    try:
+        async for pressio_name, page_number, page_result in iter_pressio_pages(pdf_bytes, config_data):
+            if current is not None and pressio_name != current:
+                yield json.dumps({"pressio": current, "partial": False, "data": final_data[current]}) + "\n"
+            current = pressio_name
+
+            if pressio_name not in final_data:
+                final_data[pressio_name] = new_pressio_entry()
+            merge_pressio_page(final_data[pressio_name], page_result)
+
+            if partial:
+                yield json.dumps({"pressio": pressio_name, "partial": True, "page": page_number,
+                                  "data": page_result}) + "\n"
+
+        if current is not None:
+            yield json.dumps({"pressio": current, "partial": False, "data": final_data[current]}) + "\n"
+
+    finally:
+        # Remise à zéro des flags (the response is sent after the endpoint returned)
+        progress.progress_state["is_running"] = False
+        progress.progress_state["current_task"] = None
+        progress.progress_state["progress_count"] = 0
+        progress.progress_state["total_count"] = 1
+
+
 @router.post("/process-pressio")
-async def process_pressio(pdf: UploadFile = File(...), config: str = Form(...)):
-    current_task = progress.progress_state.get("current_task")
-    if progress.progress_state.get("is_running") and current_task and not current_task.done():
-        current_task.cancel()
-        try:
-            await current_task
-        except asyncio.CancelledError:
-            pass
+async def process_pressio(request: Request, pdf: UploadFile = File(...), config: str = Form(...)):
+    await cancel_current_task()
 
     content = await pdf.read()
     config_data = json.loads(config)
+    try:
+        identifier_pattern(config_data.get('identifiers'))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
     # Appel direct et attente du worker
     result = await process_pressio_worker(content, config_data)
     # Remise à zéro des flags
@@ -291,16 +600,183 @@ async def process_pressio(pdf: UploadFile = File(...), config: str = Form(...)):
     progress.progress_state["progress_count"] = 0
     progress.progress_state["total_count"] = 1
 
-    return JSONResponse(result)
+    # Columnar payload (Accept) and gzip/br (Accept-Encoding) on demand, see services/pressio_columnar.py
+    body, headers = render_pressio_payload(
+        result, request.headers.get("accept"), request.headers.get("accept-encoding")
+    )
+    return Response(content=body, headers=headers)
+
+
+@router.post("/process-pressio-stream")
+async def process_pressio_stream(pdf: UploadFile = File(...), config: str = Form(...), partial: bool = Form(False)):
+    await cancel_current_task()
+
+    content = await pdf.read()
+    config_data = json.loads(config)
+    try:
+        identifier_pattern(config_data.get('identifiers'))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    return StreamingResponse(
+        stream_pressio_worker(content, config_data, partial),
+        media_type="application/x-ndjson"
+    )
+
+
+
+# OVERLAY PRESSIOMETRE : server side version of PDFKeywordExtractor.highlight_keywords_on_page
+
+# INPUT:
+#   words (list[dict]): word boxes of the page (pts).
+#   keywords (list[str]): ["Pf*", "Pl*", "Module"].
+#   page_height (float): pts.
+#   scale (float): dpi / 72, boxes are returned in pixels of the page PNG.
+# OUTPUT:
+#   dict: name box, keyword boxes (reference = first match, the one used for extraction), value bands and value boxes.
+def pressio_overlay(words, keywords, page_height, scale, name_pattern=None):
+    def box(w):
+        return {"x0": w['x0'] * scale, "top": w['top'] * scale, "x1": w['x1'] * scale, "bottom": w['bottom'] * scale}
+
+    pressio_name = detect_pressio_name(words, name_pattern)
+    name_word = next((w for w in words if w.get('text', '').strip() == pressio_name), None) if pressio_name else None
+
+    keyword_boxes = []
+    for kw in keywords:
+        matches = [w for w in words if w['text'].strip().lower() == kw.lower()]
+        for n, w in enumerate(matches):
+            keyword_boxes.append({"keyword": kw, "reference": n == 0, **box(w)})
+
+    x_positions = get_keyword_x_positions(words, keywords)
+    bands, value_boxes = [], []
+    for kw in keywords:
+        ref_word = keyword_reference(words, kw)
+        if ref_word is None:
+            continue
+        tol = PRESSIO_TOLERANCES[kw]
+        x_ref = (ref_word['x0'] + ref_word['x1']) / 2
+        y_min = ref_word['top'] + tol['min_dy']
+        bands.append({"keyword": kw, "x0": (x_ref - tol['left']) * scale, "x1": (x_ref + tol['right']) * scale,
+                      "top": y_min * scale, "bottom": page_height * scale})
+
+        # Same words as extract_values_near_keyword
+        for w, val in words_near_keyword(words, ref_word, tol):
+            value_boxes.append({"keyword": kw, "value": val, **box(w)})
+
+    is_combined = "Pf*" in x_positions and "Pl*" in x_positions and abs(x_positions["Pf*"] - x_positions["Pl*"]) <= 15
+
+    return {
+        "pressio": pressio_name,
+        "name_box": box(name_word) if name_word else None,
+        "is_combined": is_combined,
+        "keywords": keyword_boxes,
+        "bands": bands,
+        "values": value_boxes,
+    }
+
+
+@router.post("/pressio-overlay")
+async def pressio_overlay_endpoint(
+    pdf: UploadFile = File(None),
+    doc_hash: str = Form(None),
+    page: int = Form(...),
+    dpi: int = Form(150),
+    word_backend: str = Form("pdfplumber"),
+    identifiers_json: str = Form(None)
+):
+    try:
+        check_page_dpi(dpi)
+        raster_cache = get_page_raster_cache()
+        # First call uploads the PDF, next ones only send the doc_hash returned here
+        if pdf is not None:
+            content = await pdf.read()
+            doc_hash = await asyncio.to_thread(raster_cache.store_pdf, content)
+        elif doc_hash:
+            with open(raster_cache.pdf_path(doc_hash), "rb") as f:
+                content = f.read()
+        else:
+            return JSONResponse(status_code=400, content={"error": "pdf ou doc_hash requis"})
+
+        def compute():
+            with open_word_pages(content, word_backend) as pages:
+                if not 1 <= page <= len(pages):
+                    raise ValueError(f"Page {page} hors du document ({len(pages)} pages)")
+                word_page = pages[page - 1]
+                words = word_page.extract_words()
+                height = word_page.page.height if word_backend == "pdfplumber" else word_page.page.rect.height
+                width = word_page.page.width if word_backend == "pdfplumber" else word_page.page.rect.width
+                return words, width, height
+
+        words, width, height = await asyncio.to_thread(compute)
+        scale = dpi / 72
+        name_pattern = identifier_pattern(json.loads(identifiers_json) if identifiers_json else None)
+        overlay = pressio_overlay(words, ["Pf*", "Pl*", "Module"], height, scale, name_pattern)
+
+        return {
+            "doc_hash": doc_hash,
+            "page": page,
+            "dpi": dpi,
+            "width": width * scale,
+            "height": height * scale,
+            "image": f"/pressio-page-image/{doc_hash}/{page}?dpi={dpi}",
+            **overlay
+        }
+
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"error": "Document inconnu du cache, renvoyer le PDF"})
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+
+@router.get("/pressio-page-image/{doc_hash}/{page}")
+async def pressio_page_image(doc_hash: str, page: int, dpi: int = 150):
+    try:
+        check_page_dpi(dpi)
+        png_path = await asyncio.to_thread(get_page_raster_cache().get_png, doc_hash, page, dpi)
+    except FileNotFoundError:
+        return JSONResponse(status_code=404, content={"error": "Document inconnu du cache, renvoyer le PDF"})
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
+    return FileResponse(png_path, media_type="image/png", headers={"Cache-Control": "private, max-age=3600"})
 
 
 
 # EXPORT PRESSIOMETRE
 
 @router.post("/export-pressio")
-async def export_pressio(validated_data: dict):
+async def export_pressio(request: Request, exporter: str = "openpyxl", layout: str = "wide"):
+    if exporter not in EXPORTERS:
+        return JSONResponse(status_code=400, content={
+            "error": f"Exporteur inconnu : {exporter} (attendu : {', '.join(EXPORTERS)})"})
+    if layout not in EXPORT_LAYOUTS:
+        return JSONResponse(status_code=400, content={
+            "error": f"Layout d'export inconnu : {layout} (attendu : {', '.join(EXPORT_LAYOUTS)})"})
+
+    # Nested JSON (default) or columnar payload, optionally gzip/br encoded
+    try:
+        validated_data = parse_pressio_payload(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding"),
+        )
+    except PayloadTooLarge as e:
+        return JSONResponse(status_code=413, content={"error": str(e)})
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"error": str(e)})
+
     try:
+        # xlsxwriter constant memory, rows written from the lists (layout "long" : single sheet)
+        if exporter == "xlsxwriter" or layout != "wide":
+            xlsx_path = await asyncio.to_thread(write_pressio_xlsx, validated_data, layout)
+            return StreamingResponse(
+                iter_file_chunks(xlsx_path),
+                media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                headers={"Content-Disposition": "attachment; filename=geotech_export.xlsx"}
+            )
+
         output = io.BytesIO()
+        sheet_names = unique_sheet_names(validated_data)
         with pd.ExcelWriter(output, engine='openpyxl') as writer:
             for pressio, data in validated_data.items():
                 lengths = [
@@ -326,9 +802,7 @@ async def export_pressio(validated_data: dict):
                     "Module": module,
                 })
 
-                safe_sheet_name = re.sub(r'[:\\/*?[\]]', '_', pressio)[:31]
-
-                df.to_excel(writer, sheet_name=safe_sheet_name, index=False)
+                df.to_excel(writer, sheet_name=sheet_names[pressio], index=False)
 
         output.seek(0)
 
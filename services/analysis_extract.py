@@ -1,7 +1,12 @@
+import numpy as np
 import pandas as pd
 import os
 import json
-from .extract_utils import clean_tokens, values_lq_or_none
+from .extract_utils import values_lq_or_none, classify_lq
+from .token_index import TokenIndex
+from .extraction_plan import ExtractionPlan
+from .result_store import ResultStore, group_column, MEMBER, KEYWORD
+from .typed_results import item_unit, typed_frame, write_typed
 
 # === Script : EXTRACT VALUE WITH KEYWORD IN AN EXCEL FORMAT - TABLEURS MULTIPLE PAR CLASSES ===
 # = v1.0 : Test import from Excel raw DF-Excel and keyword-based extract
@@ -15,6 +20,8 @@ from .extract_utils import clean_tokens, values_lq_or_none
 # = v2.0 : PASSAGE FORMAT CLASSES DEPUIS EUROFINS_EXTRACT.PY
     # = v2.1 : Adding class type AGROLAB
     # = v2.2 : Using Rows and Columns from user to configure type of table - suppressing Agrolab/Eurofins type
+    # = v2.3 : Typed output (value, LQ flag, LQ bound, unit) from the extraction arrays, long or wide
+    # = v2.4 : Results kept as arrays (ResultStore) instead of a dict per sample
 #
 class BaseExtract:
     def __init__(self, excel_path, json_config_path, sheet_name, config, input_zone_gauche = None):
@@ -23,10 +30,12 @@ class BaseExtract:
         self.sheet_name = sheet_name
         self.config = config
         self.df = None
-        self.resultats = {}
+        self.resultats = ResultStore()  # read-only mapping nom_echantillon → {item: value}
         self.keywords_valides = []
         self.groupes_personnalises = {}
         self.input_zone_gauche = input_zone_gauche or []
+        self.matcher = None  # MatchPlan of a layout profile (services/layout_profiles.py), None = plain TokenIndex
+        self.unites = {}  # keyword / group name → unit of its label, for the typed output (services/typed_results.py)
 
 
 
@@ -55,25 +64,16 @@ class BaseExtract:
     #   multiple_matches: list[str] → keywords with multiple column matches
     @staticmethod
     def get_matching_columns(columns: list[str], keywords: list[str]) -> tuple[dict[str, list[tuple[int, str]]], list[str]]:
-        matched = {kw: [] for kw in keywords}
-        multiple_matches = []
+        # Inverted token index : labels tokenized once, keywords resolved by posting list intersection
+        return TokenIndex(columns).match(keywords)
 
-        for i, col in enumerate(columns):
-            if "%" in str(col):
-                continue
-            tokens_col = clean_tokens(str(col))
-            for kw in keywords:
-                tokens_kw = clean_tokens(kw)
-                if all(tok in tokens_col for tok in tokens_kw):
-                    if (i, col) not in matched[kw]:
-                        matched[kw].append((i, col))
 
-        # NEW LIST FOR :  → all if multiple match for 1 kw
-        for kw, matches in matched.items():
-            if len(matches) > 1:
-                multiple_matches.append(kw)
 
-        return matched, multiple_matches
+    # Same output as get_matching_columns, through the warm MatchPlan of the layout profile when one is set
+    def match_labels(self, labels, keywords):
+        if self.matcher is not None:
+            return self.matcher.get_matching_columns(labels, keywords)
+        return self.get_matching_columns(labels, keywords)
 
 
 
@@ -156,6 +156,66 @@ class BaseExtract:
                 return ""
 
 
+    # INPUT:
+    #   noms (np.ndarray): "Nom échantillon" row or column of the sheet.
+    #   positions (range): positions to scan for sample names.
+    #   max_samples (int | None): stop after that many distinct names (preview), None = all.
+    # OUTPUT:
+    #   sample_idx (list[int]), sample_names (list[str]): valid (non-empty string) names and their positions.
+    @staticmethod
+    def select_samples(noms, positions, max_samples=None):
+        sample_idx, sample_names, vus = [], [], set()
+        for pos in positions:
+            nom_echantillon = noms[pos]
+            if not isinstance(nom_echantillon, str) or not nom_echantillon.strip():
+                continue
+            if max_samples is not None and nom_echantillon not in vus and len(vus) >= max_samples:
+                break
+            vus.add(nom_echantillon)
+            sample_idx.append(pos)
+            sample_names.append(nom_echantillon)
+        return sample_idx, sample_names
+
+
+
+    # INPUT:
+    #   matrix (np.ndarray): sheet values as samples x parameters (object array).
+    #   sample_idx (list[int]): positions of the samples on axis 0 (sample name already checked).
+    #   sample_names (list[str]): "Nom échantillon" of each sample.
+    #   noms_reference, correspondances_input, all_offset : see extraction_plan.resolve_item.
+    # OUTPUT:
+    #   self.resultats (ResultStore): same values and key order as extract_values per cell.
+    def extract_plan(self, matrix, sample_idx, sample_names, noms_reference, correspondances_input, all_offset=0):
+        membres = [m for membres in self.groupes_personnalises.values() for m in membres]
+        keywords = [kw for kw in self.keywords_valides if kw not in self.groupes_personnalises]
+
+        plan = ExtractionPlan(membres + keywords, correspondances_input, noms_reference, matrix.shape[1], all_offset)
+        raw = plan.gather(matrix, np.asarray(sample_idx, dtype=np.intp))
+
+        # Value array + LQ mask per item, then group sums as masked reductions over all the samples
+        n = len(sample_names)
+        minus_one = bool(getattr(self, "replace_lq_with_minus_one", False))
+        classified = {item: classify_lq(col, float_text=False) for item, col in raw.items()}
+
+        # STEP 1 : Groups (members as extracted, then the sum) ; STEP 2 : keyword_valides, LQ formatted by the store
+        colonnes = []
+        for nom_groupe, membres in self.groupes_personnalises.items():
+            for membre in membres:
+                text, numbers, _, _, from_float = classified[membre]
+                colonnes.append((membre, MEMBER, text, numbers, from_float))
+            colonnes.append(group_column(nom_groupe, [classified[m] for m in membres], n))
+        for kw in keywords:
+            text, numbers, _, _, from_float = classified[kw]
+            colonnes.append((kw, KEYWORD, text, numbers, from_float))
+        self.resultats = ResultStore.from_columns(sample_names, colonnes, minus_one)
+
+        # Unit of the label read, for the typed output
+        self.unites = {kw: item_unit(kw, correspondances_input) for kw in keywords}
+        for nom_groupe, membres in self.groupes_personnalises.items():
+            self.unites[nom_groupe] = next((u for u in (item_unit(m, correspondances_input) for m in membres) if u),
+                                           "")
+
+
     def load_data(self):
         self.df = pd.read_excel(self.excel_path, sheet_name=self.sheet_name, header=None)
 
@@ -172,45 +232,102 @@ class BaseExtract:
             data = json.load(f)
         print("LOAD_KEYWORD_UI2 : Contenu JSON chargé :", data)
 
+        self.load_selection(data)
+        print("LOAD_KEYWORD_UI2 : Groupes chargés :", self.groupes_personnalises)
+        print("LOAD_KEYWORD_UI2 : Ordre colonnes :", self.ordre_colonnes)
+
+
+
+    # INPUT:
+    #   data (dict): UI2 selection {"keywords_valides", "groupes_personnalises", "ordre_selection"} (no JSON file).
+    # OUTPUT:
+    #   self.keywords_valides, self.groupes_personnalises, self.ordre_colonnes : see load_keywords_ui2.
+    def load_selection(self, data):
         self.keywords_valides = data.get("keywords_valides", [])
         self.groupes_personnalises = data.get("groupes_personnalises", {})
         self.ordre_colonnes = data.get(
             "ordre_selection",
             self.keywords_valides + list(self.groupes_personnalises.keys())
         )
-        print("LOAD_KEYWORD_UI2 : Groupes chargés :", self.groupes_personnalises)
-        print("LOAD_KEYWORD_UI2 : Ordre colonnes :", self.ordre_colonnes)
 
 
 
     # INPUT:
-    #   self.resultats (dict[str, dict[str, Any]]): Dictionary of extracted results, indexed by "Code Artelia".
-    #   self.excel_path (str): Path to the original Excel file, used to generate the output filename.
+    #   self.resultats (ResultStore): extracted results, indexed by "Code Artelia".
     #   self.ordre_colonnes (list[str]): Ordered list of columns to include in the export (final user selection).
     # OUTPUT:
+    #   df_export (pd.DataFrame | None): results in export order, index "Nom échantillon", None if no result.
+    def export_frame(self):
+        if not self.resultats:
+            print("LOAD UI2 : Aucun résultat à exporter.")
+            return None
+
+        # Tri explicite selon l'ordre souhaité (zone droite), only these columns are built
+        colonnes_finales = [col for col in self.ordre_colonnes
+                            if col in self.resultats.item_index and col != "Nom échantillon"]
+        df_export = self.resultats.to_frame(colonnes_finales)
+
+        df_export.index.name = "Nom échantillon"
+        return df_export
+
+
+
+    # INPUT:
+    #   df_export (pd.DataFrame | None): frame to write as is, default export_frame().
+    #   index (bool): write the index ("Nom échantillon") as first column.
+    #   extra_sheets (dict[str, pd.DataFrame] | None): other sheets written after the results (e.g. "Ratios seuils").
+    #   self.excel_path (str): Path to the original Excel file, used to generate the output filename.
+    # OUTPUT:
     #   output_path (str): Full path to the generated Excel file containing the exported results.
-    def export(self):
+    def export(self, df_export=None, index=True, extra_sheets=None):
         dossier = os.path.dirname(self.excel_path)
         nom_base = os.path.splitext(os.path.basename(self.excel_path))[0]
         horodatage = pd.Timestamp.today().strftime('%Y%m%d_%H%M')
         output_path = os.path.join(dossier, f"{nom_base}_résumé_extraction_{horodatage}.xlsx")
 
+        if df_export is None:
+            df_export = self.export_frame()
+            if df_export is None:
+                return
+
+        # Results keep the default sheet name ("Sheet1") with or without extra sheets
+        with pd.ExcelWriter(output_path) as writer:
+            df_export.to_excel(writer, index=index)
+            for nom_feuille, df_feuille in (extra_sheets or {}).items():
+                df_feuille.to_excel(writer, sheet_name=nom_feuille)
+        return output_path
+
+    # INPUT:
+    #   shape (str): "long" (sample, parameter) rows or "wide" (one row per sample).
+    # OUTPUT:
+    #   pd.DataFrame | None: typed results of the last extract() (see services/typed_results.py), None if empty.
+    def typed_frame(self, shape="long"):
         if not self.resultats:
             print("LOAD UI2 : Aucun résultat à exporter.")
-            return
+            return None
+        store = self.resultats
+        colonnes = [col for col in self.ordre_colonnes
+                    if col in store.item_index and store.kinds[store.item_index[col]] != MEMBER]
+        parsed = {col: store.parsed_column(col) for col in colonnes}
+        texts = {col: store.text_column(col) for col in colonnes}
+        return typed_frame(store.sample_names, colonnes, parsed, self.unites, shape, texts)
 
-        df_export = pd.DataFrame.from_dict(self.resultats, orient="index")
 
-        if "Nom échantillon" in df_export.columns:
-            df_export = df_export.drop(columns=["Nom échantillon"])
 
-        # Tri explicite selon l'ordre souhaité (zone droite)
-        colonnes_finales = [col for col in self.ordre_colonnes if col in df_export.columns]
-        df_export = df_export[colonnes_finales]
-
-        df_export.index.name = "Nom échantillon"
-        df_export.to_excel(output_path)
-        return output_path
+    # INPUT:
+    #   shape (str): see typed_frame.
+    #   fmt (str): "xlsx", "csv" or "parquet".
+    # OUTPUT:
+    #   output_path (str | None): file next to self.excel_path, named like export().
+    def export_typed(self, shape="long", fmt="xlsx"):
+        df_typed = self.typed_frame(shape)
+        if df_typed is None:
+            return
+        dossier = os.path.dirname(self.excel_path)
+        nom_base = os.path.splitext(os.path.basename(self.excel_path))[0]
+        horodatage = pd.Timestamp.today().strftime('%Y%m%d_%H%M')
+        output_path = os.path.join(dossier, f"{nom_base}_résultats_{shape}_{horodatage}.{fmt}")
+        return write_typed(df_typed, output_path, fmt)
 
     def format_lq(self, val):
         val_str = str(val).strip().lower()
@@ -238,10 +355,11 @@ class ColumnsExtract(BaseExtract):
     #       - "param_row": row index where parameter names (column headers) are located.
     #   self.keywords_valides (list[str]): List of selected keywords (including "→ all" cases) to extract.
     #   self.groupes_personnalises (dict[str, list[str]]): Custom groups of keywords to aggregate by summation.
+    #   max_samples (int | None): only the first max_samples samples (preview), None = all.
     # OUTPUT:
-    #   self.resultats (dict[str, dict[str, Any]]): Extracted values per sample code, with individual and grouped parameters.
-    def extract(self):
-        self.resultats = {}
+    #   self.resultats (ResultStore): Extracted values per sample code, with individual and grouped parameters.
+    def extract(self, max_samples=None):
+        self.resultats = ResultStore()
         df = self.df
         cfg = self.col_config
 
@@ -269,7 +387,7 @@ class ColumnsExtract(BaseExtract):
 
         # New detection
         noms_colonnes = list(df.iloc[self.col_config["param_row"]]) # all the line, !!! : absolute index
-        matched, _ = self.get_matching_columns(noms_colonnes, base_keywords)
+        matched, _ = self.match_labels(noms_colonnes, base_keywords)
 
         for kw, correspondances in matched.items():
             print(f"  {kw} → {[nom for _, nom in correspondances]}")
@@ -278,59 +396,13 @@ class ColumnsExtract(BaseExtract):
         for kw, correspondances in matched.items():
             all_correspondances[f"{kw} → all"] = [(col_idx, col) for col_idx, col in correspondances]
 
-        # To nom_echantillon
-        for idx_ligne in range(nom_row, len(df)):
-            nom_echantillon = df.iat[idx_ligne, nom_col]
-            if not isinstance(nom_echantillon, str) or not nom_echantillon.strip():
-                continue
-
-            self.resultats[nom_echantillon] = {}
-
-            # STEP 1 : Groups to be processed independantly
-            for nom_groupe, membres in self.groupes_personnalises.items():
-                valeurs_groupe = []
-                lq_detected = False
-                for membre in membres:
-                    val_membre = self.extract_values(
-                        item=membre,
-                        df=df,
-                        idx=idx_ligne,
-                        noms_reference=noms_colonnes,
-                        correspondances_input=all_correspondances,
-                        axis="columns"
-                    )
-                    self.resultats[nom_echantillon][membre] = val_membre
-                    val_str = str(val_membre).strip().lower()
-                    if val_str.startswith("<") or "lq" in val_str:
-                        lq_detected = True
-                        continue
-
-                    try:
-                        valeurs_groupe.append(float(str(val_membre).replace(",", ".")))
-                    except:
-                        continue
-
-                if valeurs_groupe:
-                    somme = sum(valeurs_groupe)
-                    self.resultats[nom_echantillon][nom_groupe] = self.format_lq(somme)
-                elif lq_detected:
-                    self.resultats[nom_echantillon][nom_groupe] = self.format_lq("<LQ")
-                else:
-                    self.resultats[nom_echantillon][nom_groupe] = ""
+        # To nom_echantillon (only the selected sample rows are converted)
+        noms = df.iloc[:, nom_col].to_numpy(dtype=object)
+        sample_idx, sample_names = self.select_samples(noms, range(nom_row, len(df)), max_samples)
+        matrix = df.iloc[sample_idx].to_numpy(dtype=object)
 
-            # STEP 2 : Simple match : keyword_valides part
-            for kw in self.keywords_valides:
-                if kw in self.groupes_personnalises:
-                    continue
-                val_kw = self.extract_values(
-                    item=kw,
-                    df=df,
-                    idx=idx_ligne,
-                    noms_reference=noms_colonnes,
-                    correspondances_input=all_correspondances,
-                    axis="columns"
-                )
-                self.resultats[nom_echantillon][kw] = self.format_lq(val_kw)
+        # STEP 1 & 2 : Groups then keyword_valides, every item resolved once and read for all the samples
+        self.extract_plan(matrix, range(len(sample_idx)), sample_names, noms_colonnes, all_correspondances)
 
 
 
@@ -343,8 +415,8 @@ class RowsExtract(BaseExtract):
         super().__init__(excel_path, json_config_path, sheet_name, row_config)
         self.row_config = row_config  # Exemple: {"col_nom_param": 1, "col_valeur": 2, "start_row": 8}
 
-    def extract(self):
-        self.resultats = {}
+    def extract(self, max_samples=None):
+        self.resultats = ResultStore()
         df = self.df
         cfg = self.row_config
 
@@ -372,7 +444,7 @@ class RowsExtract(BaseExtract):
         base_keywords = list(set(base_keywords))
         noms_parametres = df.iloc[param_row:, param_col].tolist() # all cells from param_col from nom_row
                                                                     # !!! : relative index
-        matched, _ = self.get_matching_columns(noms_parametres, base_keywords)
+        matched, _ = self.match_labels(noms_parametres, base_keywords)
 
         # all_correspondances output - {KW → all : [(idx, nom),(idx, nom),()]}
         for kw, correspondances in matched.items():
@@ -380,59 +452,13 @@ class RowsExtract(BaseExtract):
 
 
         # STEP 2 : Looking for code and values & creating list of results
-        #
-        for idx_col in range(data_start_col, df.shape[1]):
-            nom_echantillon = df.iloc[nom_row, idx_col]
-            if not isinstance(nom_echantillon, str) or not nom_echantillon.strip():
-                continue
-            self.resultats[nom_echantillon] = {}
-
-            # STEP 2.1 : Looking for values for each kind in keywords_finals
-            # GROUPS
-            for nom_groupe, membres in self.groupes_personnalises.items():
-                valeurs_groupe = []
-                lq_detected = False
-                for membre in membres:
-                    val_membre = self.extract_values(
-                        item=membre,
-                        df=df,
-                        idx=idx_col,
-                        noms_reference=noms_parametres,
-                        correspondances_input=all_correspondances,
-                        axis="rows",
-                    )
-                    self.resultats[nom_echantillon][membre] = val_membre
-                    val_str = str(val_membre).strip().lower()
-                    if val_str.startswith("<") or "lq" in val_str:
-                        lq_detected = True
-                        continue
-
-                    try:
-                        valeurs_groupe.append(float(str(val_membre).replace(",", ".")))
-                    except:
-                        continue
-
-                if valeurs_groupe:
-                    somme = sum(valeurs_groupe)
-                    self.resultats[nom_echantillon][nom_groupe] = self.format_lq(somme)
-                elif lq_detected:
-                    self.resultats[nom_echantillon][nom_groupe] = self.format_lq("<LQ")
-                else:
-                    self.resultats[nom_echantillon][nom_groupe] = ""
+        #           (transposed : samples on axis 0, "→ all" indices relative to param_row)
+        noms = df.iloc[nom_row].to_numpy(dtype=object)
+        sample_idx, sample_names = self.select_samples(noms, range(data_start_col, df.shape[1]), max_samples)
+        matrix = df.iloc[:, sample_idx].to_numpy(dtype=object).T
 
-            # SIMPLE
-            for kw in self.keywords_valides:
-                if kw in self.groupes_personnalises:
-                    continue
-                val_kw = self.extract_values(
-                    item=kw,
-                    df=df,
-                    idx=idx_col,
-                    noms_reference=noms_parametres,
-                    correspondances_input=all_correspondances,
-                    axis="rows",
-                )
-                self.resultats[nom_echantillon][kw] = self.format_lq(val_kw)
+        self.extract_plan(matrix, range(len(sample_idx)), sample_names, noms_parametres, all_correspondances,
+                          all_offset=param_row)
 
 
 
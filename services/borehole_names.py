@@ -0,0 +1,66 @@
+import re
+from functools import lru_cache
+
+# === Script : BOREHOLE IDENTIFIER REGISTRY (SP, PR, SC...) ===
+# identifiers (request config) : family keys ("SP") or other prefixes, taken literally ("PZ" → PZ + 1-4 digits,
+# "F-" → F- + 1-4 digits). Only BOREHOLE_FAMILIES entries are regexes. A single string is a one-item list.
+# The list is compiled once into a single alternation, matched on whole tokens.
+#
+
+BOREHOLE_FAMILIES = {
+    "SP": r"SP\d{1,4}",  # sondage pressiométrique
+    "PR": r"PR\d{1,4}",
+    "SC": r"SC\d{1,4}",
+}
+DEFAULT_IDENTIFIERS = ("SP",)
+
+
+# OUTPUT:
+#   tuple[str]: identifiers as sent by the client, DEFAULT_IDENTIFIERS when empty.
+#   ValueError when an identifier is not a non-empty string.
+def identifiers_key(identifiers=None):
+    if not identifiers:
+        return DEFAULT_IDENTIFIERS
+    if isinstance(identifiers, str):
+        identifiers = [identifiers]
+    if not isinstance(identifiers, (list, tuple)):
+        raise ValueError(f"Identifiants de sondage invalides : {identifiers!r}")
+    for ident in identifiers:
+        if not isinstance(ident, str) or not ident.strip():
+            raise ValueError(f"Identifiant de sondage invalide : {ident!r}")
+    return tuple(ident.strip() for ident in identifiers)
+
+
+@lru_cache(maxsize=64)
+def _compile_identifiers(identifiers, ignore_case):
+    parts = []
+    for ident in identifiers:
+        if ident in BOREHOLE_FAMILIES:
+            parts.append(BOREHOLE_FAMILIES[ident])
+        else:
+            parts.append(rf"{re.escape(ident)}\d{{1,4}}")
+    try:
+        return re.compile("(?:" + "|".join(f"(?:{p})" for p in parts) + ")", re.IGNORECASE if ignore_case else 0)
+    except re.error as e:
+        raise ValueError(f"Identifiants de sondage invalides : {e}") from e
+
+
+def identifier_pattern(identifiers=None, ignore_case=False):
+    return _compile_identifiers(identifiers_key(identifiers), ignore_case)
+
+
+DEFAULT_PATTERN = identifier_pattern()
+
+
+# INPUT:
+#   words (list[dict]): word boxes of a page, reading order.
+#   pattern (re.Pattern | None): from identifier_pattern(), default SP only.
+# OUTPUT:
+#   str | None: first token matching one of the identifier families.
+def detect_borehole_name(words, pattern=None):
+    pattern = pattern or DEFAULT_PATTERN
+    for w in words:
+        text = w.get('text', '').strip()
+        if pattern.fullmatch(text):
+            return text
+    return None
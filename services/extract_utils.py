@@ -1,7 +1,9 @@
 import unicodedata
 import re
+import numpy as np
 import pandas as pd
 
+ND_VALUES = {"n.d.", "n.d", "nd", "-", "n.d,", "n.d.."}
 
 def normalize(text):
     if text is None or not isinstance(text, str):
@@ -54,9 +56,137 @@ def values_lq_or_none(val):
         return ""
     if val_str.startswith("<"):
         return f"<LQ ({val_str})"
-    if val_str in {"n.d.", "n.d", "nd", "-", "n.d,", "n.d.."}:
+    if val_str in ND_VALUES:
         return "<LQ"
     return val_str
 
+# INPUT:
+#   df (pd.DataFrame): export frame.
+#   replacement (str): value written instead of "<..." and n.d. text cells (frontend option replace_lq_with).
+# OUTPUT:
+#   pd.DataFrame: copy of df, each distinct cell value of a column tested once.
+def replace_lq_values(df, replacement):
+    def is_lq(v):
+        if not isinstance(v, str):
+            return False
+        val_str = v.strip().lower()
+        return val_str.startswith("<") or val_str in ND_VALUES
+
+    out = df.copy()
+    for col in out.columns:
+        codes, uniques = pd.factorize(out[col], use_na_sentinel=True)
+        lq = np.array([is_lq(u) for u in uniques] + [False], dtype=bool)  # code -1 (NaN) → last
+        mask = lq[codes]
+        if mask.any():
+            values = out[col].to_numpy(dtype=object, copy=True)
+            values[mask] = replacement
+            out[col] = values
+    return out
+
 def is_label_all(label_info):
-    return isinstance(label_info, tuple) and label_info[1] == "all"
\ No newline at end of file
+    return isinstance(label_info, tuple) and label_info[1] == "all"
+
+
+
+# = COLUMN-WISE LQ CLASSIFICATION (same rules as values_lq_or_none / BaseExtract.format_lq, one item for all samples)
+#
+# INPUT:
+#   values (np.ndarray[object]): raw cells of one item, one per sample.
+#   float_text (bool): False = text left "" for float cells (the result store rebuilds it from numbers).
+# OUTPUT:
+#   text (np.ndarray[object]): values_lq_or_none of each cell.
+#   numbers (np.ndarray[float]): value used in group sums (valid where is_number).
+#   is_number (np.ndarray[bool]): cell summed in a group, float(text.replace(",", ".")) succeeds.
+#   lq_mask (np.ndarray[bool]): cell counted as <LQ in a group (text starting with "<" or containing "lq").
+#   from_float (np.ndarray[bool]): float cell, text == str(numbers) (rebuilt from the number by the result store).
+def classify_lq(values, float_text=True):
+    raw = np.asarray(values, dtype=object)
+    n = len(raw)
+    text = np.full(n, "", dtype=object)
+    numbers = np.zeros(n)
+    is_number = np.zeros(n, dtype=bool)
+    lq_mask = np.zeros(n, dtype=bool)
+
+    present = ~pd.isna(raw)
+    types = np.fromiter(map(type, raw.tolist()), dtype=object, count=n)
+    floats = present & (types == float)
+
+    # Float cells : str() is already stripped / lower case, and float(str(v)) == v
+    if float_text:
+        text[floats] = [str(v) for v in raw[floats].tolist()]
+    numbers[floats] = raw[floats].astype(float)
+    is_number[floats] = True
+
+    # Other cells : each distinct str(v).strip().lower() is classified once
+    # (str cells normalised once per distinct string, int / bool / dates... one by one)
+    others = np.flatnonzero(present & ~floats)
+    is_str = types[others] == str
+    normalised = np.empty(len(others), dtype=object)
+    str_codes, str_uniques = pd.factorize(raw[others[is_str]])
+    normalised[is_str] = np.array([u.strip().lower() for u in str_uniques.tolist()], dtype=object)[str_codes]
+    normalised[~is_str] = [str(v).strip().lower() for v in raw[others[~is_str]].tolist()]
+    codes, uniques = pd.factorize(normalised)
+    u_text = np.empty(len(uniques), dtype=object)
+    u_numbers = np.zeros(len(uniques))
+    u_is_number = np.zeros(len(uniques), dtype=bool)
+    u_lq = np.zeros(len(uniques), dtype=bool)
+    for i, u in enumerate(uniques.tolist()):
+        if u.startswith("<"):
+            u_text[i] = f"<LQ ({u})"
+            u_lq[i] = True
+        elif u in ND_VALUES:
+            u_text[i] = "<LQ"
+            u_lq[i] = True
+        else:
+            u_text[i] = u
+            if "lq" in u:
+                u_lq[i] = True
+                continue
+            try:
+                u_numbers[i] = float(u.replace(",", "."))
+                u_is_number[i] = True
+            except ValueError:
+                continue
+
+    text[others] = u_text[codes]
+    numbers[others] = u_numbers[codes]
+    is_number[others] = u_is_number[codes]
+    lq_mask[others] = u_lq[codes]
+    return text, numbers, is_number, lq_mask, floats
+
+
+# INPUT:
+#   text (np.ndarray[object]): from classify_lq.
+#   minus_one (bool): <LQ / n.d. replaced by -1 (desktop option replace_lq_with_minus_one).
+# OUTPUT:
+#   np.ndarray[object]: BaseExtract.format_lq of each value.
+def format_lq_values(text, minus_one=False):
+    codes, uniques = pd.factorize(text)
+    formatted = np.array([
+        (-1 if minus_one else f"<LQ ({t.lower()})") if t.startswith("<") else t
+        for t in uniques.tolist()
+    ], dtype=object)
+    return formatted[codes]
+
+
+GROUP_LQ_TEXT = "<LQ (<lq)"
+
+
+# INPUT:
+#   members (list[tuple]): classify_lq output of each group member, in group order (duplicates counted twice).
+#   n (int): number of samples.
+# OUTPUT:
+#   total (np.ndarray[float]): sum of the numbers, added in member order.
+#   has_value (np.ndarray[bool]): at least one number summed.
+#   lq_detected (np.ndarray[bool]): at least one <LQ member.
+def sum_lq_arrays(members, n):
+    total = np.zeros(n)
+    has_value = np.zeros(n, dtype=bool)
+    lq_detected = np.zeros(n, dtype=bool)
+    for member in members:
+        _, numbers, is_number, lq_mask = member[:4]
+        with np.errstate(invalid="ignore"):  # inf + -inf → nan, exported as "" like before
+            total += np.where(is_number, numbers, 0.0)
+        has_value |= is_number
+        lq_detected |= lq_mask
+    return total, has_value, lq_detected
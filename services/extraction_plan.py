@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+# === Script : COMPILED EXTRACTION PLAN - ITEMS RESOLVED ONCE, VALUES GATHERED FOR ALL SAMPLES ===
+# Same rules as BaseExtract.extract_values, resolved once per item instead of once per (sample, item) :
+#   "kw → all"        : candidate indices from correspondances_input, first non-empty value per sample
+#   "kw → (idx, nom)" : index idx
+#   "kw → nom"        : index of nom in noms_reference
+#   anything else     : no source, empty value
+# The sheet is seen as a matrix samples x parameters (df values for columns, transposed for rows),
+# each item is then read for every sample at once with a fancy-indexed gather.
+# Parity with extract_values : tests/test_extraction_plan.py, timings : benchmarks/extraction_plan.py
+#
+
+
+# INPUT:
+#   item (str): keyword_valide or group member, as sent by the UI.
+#   correspondances_input (dict[str, list[tuple[int, str]]]): {"kw → all": [(idx, nom), ...]}.
+#   noms_reference (list[str]): labels used for "kw → nom".
+#   n_params (int): size of the parameter axis.
+#   all_offset (int): added to "→ all" indices (rows : indices are relative to param_row).
+# OUTPUT:
+#   (candidates (list[int]), first_non_empty (bool))
+def resolve_item(item, correspondances_input, noms_reference, n_params, all_offset=0):
+    if "→ all" in item:
+        candidates = [idx + all_offset for idx, _ in correspondances_input.get(item.strip(), [])]
+        return [i for i in candidates if 0 <= i < n_params], True
+
+    if "→" in item:
+        try:
+            _, cible = map(str.strip, item.split("→", 1))
+            if cible.startswith("(") and "," in cible:
+                idx_str, _ = cible.strip("()").split(",", 1)
+                idx = int(idx_str.strip())
+            else:
+                idx = noms_reference.index(cible)
+        except Exception as e:
+            print(f"Erreur sur item '{item}' : {e}")
+            return [], False
+        if not -n_params <= idx < n_params:
+            print(f"Erreur sur item '{item}' : index {idx} hors de la feuille")
+            return [], False
+        return [idx % n_params], False
+
+    # No → : empty (an item without → never has a correspondance, keys are "kw → all")
+    return [], False
+
+
+class ExtractionPlan:
+    # INPUT:
+    #   items (list[str]): every item to read (group members and keywords), duplicates allowed.
+    #   correspondances_input, noms_reference, all_offset : see resolve_item.
+    #   n_params (int): size of the parameter axis.
+    def __init__(self, items, correspondances_input, noms_reference, n_params, all_offset=0):
+        self.sources = {}
+        for item in items:
+            if item not in self.sources:
+                self.sources[item] = resolve_item(item, correspondances_input, noms_reference, n_params, all_offset)
+
+    # INPUT:
+    #   matrix (np.ndarray): object array samples x parameters.
+    #   sample_idx (np.ndarray[int]): sample positions on axis 0.
+    # OUTPUT:
+    #   dict[str, np.ndarray]: raw cell per item and sample (NaN where nothing is found).
+    def gather(self, matrix, sample_idx):
+        n = len(sample_idx)
+        out = {}
+        for item, (candidates, first_non_empty) in self.sources.items():
+            if not candidates:
+                out[item] = np.full(n, np.nan, dtype=object)
+            elif not first_non_empty:
+                out[item] = matrix[sample_idx, candidates[0]]
+            else:
+                block = matrix[np.ix_(sample_idx, candidates)]
+                rows = np.arange(n)
+                present = ~pd.isna(block)
+                # Blank strings are rare : only the chosen cell is checked, until a non-blank one is found
+                while True:
+                    first = present.argmax(axis=1)
+                    values = block[rows, first]
+                    blank = present[rows, first] & np.array([isinstance(v, str) and not v.strip() for v in values],
+                                                            dtype=bool).reshape(n)
+                    if not blank.any():
+                        break
+                    present[rows[blank], first[blank]] = False
+                values[~present.any(axis=1)] = np.nan
+                out[item] = values
+        return out
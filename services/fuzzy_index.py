@@ -0,0 +1,139 @@
+from collections import defaultdict
+
+from .extract_utils import clean_tokens
+from .token_index import TokenIndex, keyword_tokens
+
+# === Script : FUZZY KEYWORD → LABEL MATCHING (CHARACTER N-GRAM INDEX + BOUNDED EDIT DISTANCE) ===
+# Same token rule as TokenIndex (every keyword token must be found in the label, "%" labels skipped),
+# but a keyword token may match a label token with a few typos ("napthalene" ~ "naphtalene") :
+#   - budget : 0 edit up to 3 letters, 1 edit up to 7, 2 edits above (MAX_EDITS)
+#   - tokens with digits ("c10", "28") must match exactly : C10-C40 is not C12-C16, PCB 28 is not PCB 52
+#   - pruning : label tokens sharing too few character trigrams (count filter) or too different in length are
+#     skipped, the remaining ones are verified with a bounded Levenshtein distance (stops once above the budget)
+# Score of a label = 1 - (edits / letters of the keyword), exact matches score 1.0.
+# Candidates are ranked by score, then by number of tokens of the label (the most specific first), then position.
+# Exact matches and recall on typos : tests/test_fuzzy_index.py, timings : benchmarks/fuzzy_index.py
+#
+
+Q = 3
+MAX_EDITS = ((3, 0), (7, 1))  # (max length, edits) ; longer tokens : 2 edits
+
+
+def max_edits(token):
+    if any(c.isdigit() for c in token):
+        return 0
+    for length, edits in MAX_EDITS:
+        if len(token) <= length:
+            return edits
+    return 2
+
+
+def char_ngrams(token, q=Q):
+    padded = "#" * (q - 1) + token + "#" * (q - 1)
+    return {padded[i:i + q] for i in range(len(padded) - q + 1)}
+
+
+# OUTPUT:
+#   int: Levenshtein distance between a and b, or k + 1 as soon as it is known to be above k.
+def bounded_levenshtein(a, b, k):
+    if abs(len(a) - len(b)) > k:
+        return k + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if current[j] < best:
+                best = current[j]
+        if best > k:
+            return k + 1
+        previous = current
+    return previous[-1] if previous[-1] <= k else k + 1
+
+
+class FuzzyTokenIndex:
+    # INPUT:
+    #   labels (list[str] | pd.Series): label row (columns) or label column (rows) of the sheet.
+    def __init__(self, labels):
+        self.exact = TokenIndex(labels)
+        self.labels = self.exact.labels
+        self.n_tokens = [len(set(clean_tokens(str(label)))) for label in self.labels]
+
+        # Trigram index over the distinct label tokens (tokens with digits are exact only)
+        self.vocab = [tok for tok in self.exact.postings if not any(c.isdigit() for c in tok)]
+        self.vocab_grams = [char_ngrams(tok) for tok in self.vocab]
+        self.gram_postings = defaultdict(list)
+        for v, grams in enumerate(self.vocab_grams):
+            for gram in grams:
+                self.gram_postings[gram].append(v)
+        self.similar = {}  # keyword token → [(label token, edits)]
+
+    # OUTPUT:
+    #   list[tuple[str, int]]: label tokens within the edit budget of token, with their distance.
+    def similar_tokens(self, token):
+        known = self.similar.get(token)
+        if known is not None:
+            return known
+
+        k = max_edits(token)
+        out = [(token, 0)] if token in self.exact.postings else []
+        if k > 0:
+            grams = char_ngrams(token)
+            shared = defaultdict(int)
+            for gram in grams:
+                for v in self.gram_postings.get(gram, ()):
+                    shared[v] += 1
+            for v, count in shared.items():
+                candidate = self.vocab[v]
+                if candidate == token or abs(len(candidate) - len(token)) > k:
+                    continue
+                # Count filter : each edit destroys at most Q trigrams
+                if count < max(len(grams), len(self.vocab_grams[v])) - k * Q:
+                    continue
+                distance = bounded_levenshtein(token, candidate, k)
+                if distance <= k:
+                    out.append((candidate, distance))
+        self.similar[token] = out
+        return out
+
+    # OUTPUT:
+    #   list[tuple[int, float]]: (label index, score) ranked, best first.
+    def lookup(self, keyword):
+        tokens = keyword_tokens(keyword)
+        if not tokens:
+            return [(i, 1.0) for i in self.exact.candidates]
+
+        per_token = []
+        for tok in tokens:
+            best = {}
+            for label_tok, distance in self.similar_tokens(tok):
+                for i in self.exact.postings[label_tok]:
+                    if distance < best.get(i, distance + 1):
+                        best[i] = distance
+            if not best:
+                return []
+            per_token.append(best)
+
+        per_token.sort(key=len)
+        hits = set(per_token[0]).intersection(*per_token[1:])
+        letters = sum(len(tok) for tok in tokens)
+        scored = [(i, round(1 - sum(best[i] for best in per_token) / letters, 3)) for i in hits]
+        scored.sort(key=lambda x: (-x[1], self.n_tokens[x[0]], x[0]))
+        return scored
+
+    # INPUT:
+    #   keywords (list[str]), min_score (float): candidates under min_score dropped.
+    #   limit (int | None): best candidates kept per keyword.
+    # OUTPUT:
+    #   ranked (dict[str, list[tuple[int, str, float]]]): (index, label, score) per keyword, best first.
+    #   multiple_matches (list[str]): keywords with more than one candidate.
+    def match(self, keywords, min_score=0.0, limit=None):
+        ranked = {kw: [] for kw in keywords}
+        for kw in ranked:
+            hits = [(i, self.labels[i], score) for i, score in self.lookup(kw) if score >= min_score]
+            ranked[kw] = hits[:limit] if limit else hits
+        multiple_matches = [kw for kw, hits in ranked.items() if len(hits) > 1]
+        return ranked, multiple_matches
@@ -0,0 +1,103 @@
+import io
+import os
+import zipfile
+
+import pandas as pd
+
+from .analysis_extract import ColumnsExtract, RowsExtract
+from .workbook_reader import workbook_metadata
+
+# === Script : BATCH GEOCHEM EXTRACTION - MANY LAB WORKBOOKS / SHEETS, ONE CONSOLIDATED TABLE ===
+# Uploads are workbooks (.xlsx / .xlsm) or ZIP archives of workbooks.
+# One task per (file, sheet) : same config (cells) and same selection (UI2) for every sheet,
+# tasks are independent (picklable arguments) and run in a process pool by the endpoint.
+# The merged table has "Fichier source" | "Feuille" | "Nom échantillon" | selected parameters (ordre_selection).
+#
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm")
+SOURCE_COLUMNS = ["Fichier source", "Feuille", "Nom échantillon"]
+
+
+# INPUT:
+#   uploads (list[tuple[str, bytes]]): (filename, content) as received.
+# OUTPUT:
+#   list[tuple[str, bytes]]: workbooks, ZIP members named "archive.zip/path/in/archive.xlsx".
+def expand_uploads(uploads):
+    workbooks = []
+    for filename, content in uploads:
+        if filename.lower().endswith(".zip"):
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                for member in archive.infolist():
+                    base = os.path.basename(member.filename)
+                    if member.is_dir() or member.filename.startswith("__MACOSX/") or base.startswith("~$"):
+                        continue
+                    if base.lower().endswith(WORKBOOK_EXTENSIONS):
+                        workbooks.append((f"{filename}/{member.filename}", archive.read(member)))
+        elif filename.lower().endswith(WORKBOOK_EXTENSIONS):
+            workbooks.append((filename, content))
+        else:
+            raise ValueError(f"Format non supporté : {filename}")
+    return workbooks
+
+
+# INPUT:
+#   file_bytes (bytes): workbook.
+#   sheet_names (list[str] | None): requested sheets, None = every sheet of the workbook.
+# OUTPUT:
+#   (sheets (list[str]), missing (list[str])): sheets to extract, requested sheets absent from the workbook.
+def select_sheets(file_bytes, sheet_names=None):
+    available = [s["name"] for s in workbook_metadata(file_bytes)]
+    if not sheet_names:
+        return available, []
+    return [s for s in sheet_names if s in available], [s for s in sheet_names if s not in available]
+
+
+# INPUT:
+#   file_bytes (bytes | None): workbook, None when the requested sheet is not in it (reported as an error).
+#   source (str), sheet_name (str)
+#   extraction_type (str): "colonnes" or "lignes".
+#   config_extraction (dict): convert_config_to_indices output.
+#   selection_data (dict): UI2 selection {"keywords_valides", "groupes_personnalises", "ordre_selection"}.
+# OUTPUT:
+#   dict: {"source", "sheet", "frame" (pd.DataFrame | None), "samples" (int), "error" (str | None)}
+def extract_workbook_sheet(file_bytes, source, sheet_name, extraction_type, config_extraction, selection_data):
+    result = {"source": source, "sheet": sheet_name, "frame": None, "samples": 0, "error": None}
+    if file_bytes is None:
+        result["error"] = "Feuille absente du classeur"
+        return result
+    try:
+        if extraction_type.lower() == "colonnes":
+            extractor = ColumnsExtract(source, None, sheet_name, col_config=config_extraction)
+        elif extraction_type.lower() == "lignes":
+            extractor = RowsExtract(source, None, sheet_name, row_config=config_extraction)
+        else:
+            raise ValueError(f"Type d'extraction inconnu : {extraction_type}")
+
+        extractor.load_selection(selection_data)
+        extractor.df = pd.read_excel(io.BytesIO(file_bytes), sheet_name=sheet_name, header=None)
+        extractor.extract()
+
+        df_export = extractor.export_frame()
+        if df_export is not None:
+            df_export = df_export.reset_index()
+            df_export.insert(0, "Feuille", sheet_name)
+            df_export.insert(0, "Fichier source", source)
+            result["frame"] = df_export
+            result["samples"] = len(df_export)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__} : {e}"
+    return result
+
+
+# INPUT:
+#   results (list[dict]): extract_workbook_sheet outputs, in file / sheet order.
+#   ordre_colonnes (list[str]): parameter order of the selection.
+# OUTPUT:
+#   pd.DataFrame: consolidated table (empty, with the source columns, if nothing was extracted).
+def merge_batch_frames(results, ordre_colonnes):
+    frames = [r["frame"] for r in results if r["frame"] is not None]
+    if not frames:
+        return pd.DataFrame(columns=SOURCE_COLUMNS)
+    merged = pd.concat(frames, ignore_index=True, sort=False)
+    parametres = [col for col in ordre_colonnes if col in merged.columns and col not in SOURCE_COLUMNS]
+    return merged[SOURCE_COLUMNS + parametres]
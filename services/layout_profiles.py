@@ -0,0 +1,137 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import pandas as pd
+
+from .extract_utils import ND_VALUES, clean_tokens
+from .token_index import MatchPlan
+
+# === Script : LAYOUT PROFILES - RECOGNISE A LAB FORMAT FROM ITS HEADER, REUSE CONFIG AND SELECTION ===
+# Fingerprint : top-left block of the sheet (FINGERPRINT_ROWS x FINGERPRINT_COLS), each cell reduced to the set
+# of its alphabetic tokens (≥ 3 letters). Numbers, dates, "<LQ" / n.d. values and codes like "SC-12" count as empty,
+# so two batches of the same lab format (other samples, other values) share the same fingerprint.
+# Profile (persisted as JSON, one per fingerprint) : extraction type, cells config, UI1 keywords, UI2 selection.
+# A MatchPlan (token_index) per profile is kept warm in memory : recurring formats skip the matching.
+# Indexed items "kw → (idx, nom)" of a saved selection are checked against the labels before being reused.
+# Fingerprint stability and warm matching : tests/test_layout_profiles.py, timings : benchmarks/layout_profiles.py
+#
+
+FINGERPRINT_ROWS = 10
+FINGERPRINT_COLS = 10
+
+
+def cell_signature(value):
+    if not isinstance(value, str):
+        return ""
+    val_str = value.strip().lower()
+    if val_str.startswith("<") or val_str in ND_VALUES:
+        return ""
+    return " ".join(sorted({tok for tok in clean_tokens(value) if tok.isalpha() and len(tok) > 2}))
+
+
+# INPUT:
+#   block (list[list]): top-left cells of the sheet, as read by pd.read_excel(header=None) / read_block.
+# OUTPUT:
+#   str: 16 hex chars, same for every sheet with the same header words at the same places.
+def header_fingerprint(block):
+    lines = []
+    for row in block[:FINGERPRINT_ROWS]:
+        cells = [cell_signature(v) for v in list(row)[:FINGERPRINT_COLS]]
+        while cells and not cells[-1]:
+            cells.pop()
+        lines.append("|".join(cells))
+    while lines and not lines[-1]:
+        lines.pop()
+    return hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()[:16]
+
+
+# INPUT:
+#   selection (dict): UI2 selection {"keywords_valides", "groupes_personnalises", ...}.
+#   labels (list): label row (columns) or label column (rows), absolute positions.
+# OUTPUT:
+#   list[str]: "kw → (idx, nom)" items whose label is no longer at idx (selection not reusable as is).
+def stale_selection_items(selection, labels):
+    items = list(selection.get("keywords_valides", []))
+    for membres in selection.get("groupes_personnalises", {}).values():
+        items.extend(membres)
+
+    stale = []
+    for item in items:
+        match = re.search(r"→\s*\((\d+),\s*(.+)\)\s*$", item)
+        if not match:
+            continue
+        idx, nom = int(match.group(1)), match.group(2).strip()
+        label = labels[idx] if idx < len(labels) else None
+        if label is None or pd.isna(label) or str(label).strip() != nom:
+            stale.append(item)
+    return stale
+
+
+class LayoutProfileStore:
+    # INPUT:
+    #   path (str): JSON file of the profiles (created on first save).
+    #   max_warm (int): MatchPlans kept in memory (least recently used dropped).
+    def __init__(self, path, max_warm=32):
+        self.path = path
+        self.max_warm = max_warm
+        self.lock = threading.Lock()
+        self.plans = OrderedDict()  # fingerprint → MatchPlan
+        self.profiles = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.profiles = json.load(f)
+
+    def _write(self):
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.profiles, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get(self, fingerprint):
+        with self.lock:
+            return self.profiles.get(fingerprint)
+
+    def list(self):
+        with self.lock:
+            return list(self.profiles.values())
+
+    # INPUT:
+    #   fingerprint (str): header_fingerprint of the validated sheet.
+    #   profile (dict): {"name", "extraction_type", "config", "keywords", "selection", "sheet_name"}.
+    # OUTPUT:
+    #   dict: stored profile (replaces the previous one of the same fingerprint).
+    def save(self, fingerprint, profile):
+        profile = dict(profile, fingerprint=fingerprint, updated=datetime.now().isoformat(timespec="seconds"))
+        with self.lock:
+            self.profiles[fingerprint] = profile
+            self._write()
+        return profile
+
+    def delete(self, fingerprint):
+        with self.lock:
+            removed = self.profiles.pop(fingerprint, None) is not None
+            self.plans.pop(fingerprint, None)
+            if removed:
+                self._write()
+        return removed
+
+    # OUTPUT:
+    #   MatchPlan | None: warm matcher of the profile, None if the fingerprint has no profile.
+    def match_plan(self, fingerprint):
+        with self.lock:
+            if fingerprint not in self.profiles:
+                return None
+            plan = self.plans.get(fingerprint)
+            if plan is None:
+                plan = self.plans[fingerprint] = MatchPlan()
+            self.plans.move_to_end(fingerprint)
+            while len(self.plans) > self.max_warm:
+                self.plans.popitem(last=False)
+            return plan
@@ -0,0 +1,110 @@
+import os
+import re
+import hashlib
+import threading
+
+import fitz  # PyMuPDF
+
+# === Script : DISK CACHE FOR PAGE RASTERS (PNG) + SOURCE PDFS ===
+# A page is rendered once per (document hash, page, dpi), then served from disk.
+# Access refreshes the file mtime, eviction removes the least recently used files (PNG or PDF) above max_bytes.
+# Directories are created on first write. Files are written to "<path>.<pid>.<thread>.tmp" then renamed :
+# eviction never touches .tmp files (write in progress) nor the newest entry (the file just written).
+#   <cache_dir>/pdf/<hash>.pdf
+#   <cache_dir>/png/<hash>_p<page>_<dpi>.png
+#
+
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+TMP_SUFFIX = ".tmp"
+
+
+def document_hash(pdf_bytes):
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+class PageRasterCache:
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.pdf_dir = os.path.join(cache_dir, "pdf")
+        self.png_dir = os.path.join(cache_dir, "png")
+        self.lock = threading.Lock()
+
+    def write_file(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TMP_SUFFIX}"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def pdf_path(self, doc_hash):
+        if not HASH_PATTERN.match(doc_hash):
+            raise ValueError(f"Hash de document invalide : {doc_hash}")
+        return os.path.join(self.pdf_dir, f"{doc_hash}.pdf")
+
+    def store_pdf(self, pdf_bytes):
+        doc_hash = document_hash(pdf_bytes)
+        path = self.pdf_path(doc_hash)
+        if os.path.exists(path):
+            os.utime(path)
+        else:
+            self.write_file(path, pdf_bytes)
+            self.evict()
+        return doc_hash
+
+    # INPUT:
+    #   doc_hash (str): hash returned by store_pdf.
+    #   page_number (int): 1-indexed.
+    #   dpi (int)
+    # OUTPUT:
+    #   str: path of the PNG (rendered on first request only).
+    def get_png(self, doc_hash, page_number, dpi):
+        pdf_path = self.pdf_path(doc_hash)
+        png_path = os.path.join(self.png_dir, f"{doc_hash}_p{int(page_number)}_{int(dpi)}.png")
+
+        if os.path.exists(png_path):
+            os.utime(png_path)
+            return png_path
+
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"Document inconnu du cache : {doc_hash}")
+        os.utime(pdf_path)
+
+        with fitz.open(pdf_path) as doc:
+            if not 1 <= page_number <= len(doc):
+                raise ValueError(f"Page {page_number} hors du document ({len(doc)} pages)")
+            pixmap = doc[page_number - 1].get_pixmap(dpi=int(dpi))
+            png_bytes = pixmap.tobytes("png")
+
+        self.write_file(png_path, png_bytes)
+        self.evict()
+        return png_path
+
+    def evict(self):
+        with self.lock:
+            entries = []
+            for d in (self.png_dir, self.pdf_dir):
+                try:
+                    names = os.listdir(d)
+                except FileNotFoundError:
+                    continue
+                for name in names:
+                    if name.endswith(TMP_SUFFIX):
+                        continue
+                    path = os.path.join(d, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            # Newest entry is kept even when it alone is above max_bytes
+            for _, size, path in sorted(entries)[:-1]:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
@@ -0,0 +1,327 @@
+import os
+import logging
+import argparse
+import statistics
+from decimal import Decimal, getcontext
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+from .borehole_names import detect_borehole_name, identifier_pattern
+from .pressio_pairing import pair_combined_values
+from .pressio_keywords import extract_values_near_keyword, get_keyword_x_positions, DEFAULT_TOLERANCE
+
+getcontext().prec = 10
+
+logging.getLogger("pdfminer").setLevel(logging.ERROR)
+logger = logging.getLogger(__name__)
+
+# === Script : HEADLESS ENGINE - ESSAIS PRESSIOMETRIQUES (Pf* / Pl* / Module) ===
+# Same page logic as the desktop PDFKeywordExtractor (pdf_sondage_extract.py), without any GUI import :
+# depth ranges are given as data, PDFs of a directory are processed in parallel,
+# results are written with the same Excel layout as the desktop export.
+# Keyword columns : services/pressio_keywords.py, shared with the web routes. Page diagnostics go to logging (DEBUG).
+#
+# CLI : python -m services.pdf_sondage_engine <pdf or directory> --start 0 --end 20 --step 1 [--output dir] [--workers n]
+#
+
+
+def detect_y_anomalies(y_val_list, keyword):
+    if len(y_val_list) < 3:
+        return [v for _, v in y_val_list], [], []
+
+    y_val_list = sorted(y_val_list, key=lambda x: x[0])
+    y_positions = [y for y, _ in y_val_list]
+    dy_list = [y2 - y1 for y1, y2 in zip(y_positions, y_positions[1:])]
+
+    median_dy = statistics.median(dy_list)
+    min_dy = 0.7 * median_dy
+    max_dy = 1.3 * median_dy
+
+    logger.debug("Médiane des écarts Y pour '%s' : %.2f pts, trop petit < %.2f pts, trop grand > %.2f pts",
+                 keyword, median_dy, min_dy, max_dy)
+
+    output = []
+    logs = []
+
+    highlight_indices = []
+
+    for i in range(len(y_val_list) - 1):
+        y1, v1 = y_val_list[i]
+        y2, v2 = y_val_list[i + 1]
+        dy = abs(y2 - y1)
+
+        logger.debug("dy[%d] = %.2f pts entre %s et %s", i, dy, v1, v2)
+
+        output.append(v1)
+
+        dy = Decimal(str(y2 - y1))
+        median_dy = Decimal(str(statistics.median(dy_list)))
+        min_dy = median_dy * Decimal("0.7")
+        max_dy = median_dy * Decimal("1.3")
+
+        if dy > max_dy:
+            logger.debug("Trou détecté")
+            output.append(None)
+            logs.append(f" NULL : Trou détecté pour '{keyword}' entre {v1} et {v2} (écart Y = {dy:.1f} pts)")
+        elif dy < min_dy:
+            logger.debug("Espacement trop petit")
+            highlight_indices.append(len(output) - 1)
+            highlight_indices.append(len(output))
+            logs.append(f" ⚠️  : Espacement trop petit pour '{keyword}' entre {v1} et {v2} (écart Y = {dy:.1f} pts)")
+
+    output.append(y_val_list[-1][1])  # Dernière valeur
+
+    return output, logs, highlight_indices
+
+
+def detect_sondage_name(words, pattern=None):
+    # pattern : precompiled identifier alternation (borehole_names.py), default SP only
+    return detect_borehole_name(words, pattern)
+
+
+# INPUT:
+#   start, end, step (float | str): depth range, same rules as the desktop dialog (start < end, step > 0).
+# OUTPUT:
+#   list[float]: depths from start to end.
+def depths_from_range(start, end, step):
+    d_start, d_end, d_step = float(start), float(end), float(step)
+    if d_start >= d_end or d_step <= 0:
+        raise ValueError(f"Plage de profondeur invalide : {start} → {end} (pas {step})")
+    return [round(d_start + i * d_step, 3) for i in range(int((d_end - d_start) / d_step) + 1)]
+
+
+# INPUT:
+#   depth_ranges (dict): {"default": {"start", "end", "step"}, "SP1": {...}, ...} - "default" is optional.
+#   sondage_name (str)
+# OUTPUT:
+#   list[float]: depths for the borehole, [] if no range applies.
+def resolve_depths(depth_ranges, sondage_name):
+    depth_range = (depth_ranges or {}).get(sondage_name) or (depth_ranges or {}).get("default")
+    if not depth_range:
+        return []
+    return depths_from_range(depth_range["start"], depth_range["end"], depth_range["step"])
+
+
+class PressioEngine:
+    def __init__(self, keywords, tolerances=None, column_distance_threshold=15, identifiers=None):
+        self.keywords = keywords
+        self.column_distance_threshold = column_distance_threshold
+        self.name_pattern = identifier_pattern(identifiers)
+
+        # Tolerance par mot-clef
+        self.tolerances = tolerances or {
+            self.keywords[0]: {"left": 10, "right": 30, "min_dy": 50},
+            self.keywords[1]: {"left": 10, "right": 30, "min_dy": 50},
+            self.keywords[2]: {"left": 10, "right": 54, "min_dy": 50}
+        }
+
+    def get_keyword_x_positions(self, words):
+        return get_keyword_x_positions(words, self.keywords)
+
+    def extract_values_near_keyword(self, words, keyword):
+        return extract_values_near_keyword(words, keyword, self.tolerances.get(keyword, DEFAULT_TOLERANCE))
+
+    # INPUT:
+    #   words (list[dict]): words of one page (pdfplumber extract_words).
+    # OUTPUT:
+    #   dict {"Pf*", "Pl*", "Module": values, "RedFlags": {kw: indices}, "Logs": [...]}
+    #   or None when combined Pf*/Pl* data is inconsistent (page skipped).
+    def process_page(self, words):
+        # Extraction des valeurs par mot-clé
+        values_by_keyword = {}
+        for kw in self.keywords:
+            values = self.extract_values_near_keyword(words, kw)
+            values_by_keyword[kw] = values
+            logger.debug("%s : %d valeurs", kw, len(values))
+
+        # Vérifie la position de Pf et Pl
+        pairing_logs = []
+        x_positions = self.get_keyword_x_positions(words)
+        is_combined = False
+        if self.keywords[0] in x_positions and self.keywords[1] in x_positions:
+            distance = abs(x_positions[self.keywords[0]] - x_positions[self.keywords[1]])
+            if distance <= self.column_distance_threshold:
+                is_combined = True
+
+        if is_combined:
+            logger.debug("Pf et Pl combinés → traitement spécial")
+            pf_values = values_by_keyword[self.keywords[0]]
+            pl_values = values_by_keyword[self.keywords[1]]
+            if pf_values != pl_values:
+                logger.warning("Données incohérentes pour traitement spécial. Saut de cette page.")
+                return None
+
+            pf_final, pl_final, unpaired = pair_combined_values(pf_values)
+            for y, v in unpaired:
+                pairing_logs.append(f" ⚠️  : Pf*/Pl* combinés, valeur {v} non appariée (y = {y:.1f} pts)")
+        else:
+            logger.debug("Pf et Pl séparés → traitement standard")
+            pf_final = values_by_keyword[self.keywords[0]]
+            pl_final = values_by_keyword[self.keywords[1]]
+
+        em_values = values_by_keyword[self.keywords[2]]
+
+        # Analyse des anomalies Y
+        pf_list, pf_logs, pf_red = detect_y_anomalies(pf_final, self.keywords[0])
+        pl_list, pl_logs, pl_red = detect_y_anomalies(pl_final, self.keywords[1])
+        em_list, em_logs, em_red = detect_y_anomalies(em_values, self.keywords[2])
+
+        return {
+            "Pf*": pf_list,
+            "Pl*": pl_list,
+            "Module": em_list,
+            "RedFlags": {
+                "Pf*": pf_red,
+                "Pl*": pl_red,
+                "Module": em_red
+            },
+            "Logs": pairing_logs + pf_logs + pl_logs + em_logs
+        }
+
+    # = PROCESSING ALL THE PAGES FOR A PDF DOCUMENT
+    # INPUT:
+    #   pdf_path (str)
+    #   depth_ranges (dict | None): see resolve_depths.
+    #   depth_for (callable | None): sondage_name -> list of depths, overrides depth_ranges (desktop dialog).
+    # OUTPUT:
+    #   results_by_sondage (dict): {sondage: {"Pf*", "Pl*", "Module", "Depth", "RedFlags"}}
+    def process_pdf(self, pdf_path, depth_ranges=None, depth_for=None):
+        if depth_for is None:
+            def depth_for(sondage_name):
+                return resolve_depths(depth_ranges, sondage_name)
+
+        results_by_sondage = {}
+        depths_by_sondage = {}
+
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_idx, page in enumerate(pdf.pages):
+                logger.debug("Traitement page %d", page_idx + 1)
+                words = page.extract_words()
+                sondage_name = detect_sondage_name(words, self.name_pattern) or f"Page {page_idx + 1}"
+
+                page_result = self.process_page(words)
+                if page_result is None:
+                    continue
+
+                # Une seule demande de profondeur par sondage
+                if sondage_name not in depths_by_sondage:
+                    depths_by_sondage[sondage_name] = depth_for(sondage_name)
+                depths = depths_by_sondage[sondage_name]
+
+                # Ajout ou accumulation des données par sondage
+                if sondage_name not in results_by_sondage:
+                    results_by_sondage[sondage_name] = {
+                        "Pf*": page_result["Pf*"],
+                        "Pl*": page_result["Pl*"],
+                        "Module": page_result["Module"],
+                        "Depth": depths,  # ✅ Ajouté une seule fois ici
+                        "RedFlags": page_result["RedFlags"]
+                    }
+                else:
+                    results_by_sondage[sondage_name]["Pf*"] += page_result["Pf*"]
+                    results_by_sondage[sondage_name]["Pl*"] += page_result["Pl*"]
+                    results_by_sondage[sondage_name]["Module"] += page_result["Module"]
+                    results_by_sondage[sondage_name]["RedFlags"]["Pf*"] += page_result["RedFlags"]["Pf*"]
+                    results_by_sondage[sondage_name]["RedFlags"]["Pl*"] += page_result["RedFlags"]["Pl*"]
+                    results_by_sondage[sondage_name]["RedFlags"]["Module"] += page_result["RedFlags"]["Module"]
+
+        return results_by_sondage
+
+    # INPUT:
+    #   directory (str): folder containing the PDFs (not recursive).
+    #   depth_ranges (dict | None): see resolve_depths, shared by every PDF.
+    #   workers (int | None): process pool size, None = os.cpu_count().
+    # OUTPUT:
+    #   dict[str, dict]: {pdf_path: results_by_sondage}, PDFs sorted by name.
+    def process_directory(self, directory, depth_ranges=None, workers=None):
+        pdf_paths = list_pdf_files(directory)
+        if not pdf_paths:
+            return {}
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_process_pdf_task, [self] * len(pdf_paths), pdf_paths, [depth_ranges] * len(pdf_paths))
+            return dict(zip(pdf_paths, results))
+
+    # INPUT:
+    #   results_by_sondage (dict): {sondage: {"Depth", "Module", "Pl*", ...}}
+    #   output_path (str): .xlsx path.
+    # OUTPUT:
+    #   output_path (str) - sheet "Sondages" : name on line 1, Profondeur | EM | PL on line 2, values from line 3,
+    #   one empty column between boreholes (same layout as the desktop export).
+    @staticmethod
+    def export_to_excel(results_by_sondage, output_path):
+        import openpyxl
+        from openpyxl.styles import Font
+
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Sondages"
+
+        col_index = 1
+        for sondage_name, data in results_by_sondage.items():
+            # Sondage name, line 1
+            ws.cell(row=1, column=col_index, value=sondage_name).font = Font(bold=True)
+
+            # Column header, line 2
+            headers = ["Profondeur", "EM", "PL"]
+            for offset, header in enumerate(headers):
+                ws.cell(row=2, column=col_index + offset, value=header).font = Font(italic=True)
+
+            # Données à partir de la ligne 3
+            for i, val in enumerate(data["Depth"]):
+                ws.cell(row=i + 3, column=col_index, value=val)
+            for i, val in enumerate(data["Module"]):
+                ws.cell(row=i + 3, column=col_index + 1, value=val)
+            for i, val in enumerate(data["Pl*"]):
+                ws.cell(row=i + 3, column=col_index + 2, value=val)
+
+            col_index += 4  # 3 colonnes + 1 vide
+
+        wb.save(output_path)
+        return output_path
+
+
+def list_pdf_files(directory):
+    # Extension matched case-insensitively once : "*.pdf" + "*.PDF" lists every file twice on Windows / macOS
+    return sorted(
+        entry.path for entry in os.scandir(directory)
+        if entry.is_file() and entry.name.lower().endswith(".pdf")
+    )
+
+
+def _process_pdf_task(engine, pdf_path, depth_ranges):
+    # Module level for the process pool (picklable)
+    return engine.process_pdf(pdf_path, depth_ranges=depth_ranges)
+
+
+# === Lancement (CLI) ===
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extraction Pf*/Pl*/Module des essais pressiométriques (sans interface).")
+    parser.add_argument("source", help="Fichier PDF ou dossier de PDF")
+    parser.add_argument("--start", required=True, help="Profondeur de départ")
+    parser.add_argument("--end", required=True, help="Profondeur de fin")
+    parser.add_argument("--step", required=True, help="Pas (ex: 0.2)")
+    parser.add_argument("--output", default=None, help="Dossier de sortie (défaut : dossier du PDF)")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus pour un dossier")
+    parser.add_argument("--identifiers", nargs="+", default=None, help="Familles de sondages (défaut : SP)")
+    args = parser.parse_args(argv)
+
+    engine = PressioEngine(keywords=["Pf*", "Pl*", "Module"], identifiers=args.identifiers)
+    depth_ranges = {"default": {"start": args.start, "end": args.end, "step": args.step}}
+
+    if os.path.isdir(args.source):
+        results_by_pdf = engine.process_directory(args.source, depth_ranges, workers=args.workers)
+    else:
+        results_by_pdf = {args.source: engine.process_pdf(args.source, depth_ranges=depth_ranges)}
+
+    for pdf_path, results_by_sondage in results_by_pdf.items():
+        output_dir = args.output or os.path.dirname(os.path.abspath(pdf_path))
+        os.makedirs(output_dir, exist_ok=True)
+        nom_base = os.path.splitext(os.path.basename(pdf_path))[0]
+        output_path = engine.export_to_excel(results_by_sondage, os.path.join(output_dir, f"{nom_base}_pressio.xlsx"))
+        print(f"✅ {len(results_by_sondage)} sondage(s) → {output_path}")
+
+
+if __name__ == "__main__":
+    main()
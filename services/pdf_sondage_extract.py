@@ -1,14 +1,6 @@
-import pdfplumber
 import logging
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
-import tkinter as tk
-from tkinter import Tk, filedialog, messagebox, ttk
-import re
 
-import statistics
-from decimal import Decimal, getcontext
-getcontext().prec = 10
+from .pdf_sondage_engine import PressioEngine, depths_from_range
 
 logging.getLogger("pdfminer").setLevel(logging.ERROR)
 
@@ -22,100 +14,27 @@ logging.getLogger("pdfminer").setLevel(logging.ERROR)
 # = v6.5 : Add log on UI and asking user for the keywords
 # = v7 : Exporting the data in Excel EM|Pl for each borehole after last validate on the verif UI + log on UI
 # = v7.5 : Re-opening data after validated lists is possible
+# = v8 : Page logic moved to the headless PressioEngine (pdf_sondage_engine.py), GUI imports only loaded here
 #
 
-def detect_y_anomalies(y_val_list, keyword):
-    if len(y_val_list) < 3:
-        return [v for _, v in y_val_list], []
 
-    y_val_list = sorted(y_val_list, key=lambda x: x[0])
-    y_positions = [y for y, _ in y_val_list]
-    dy_list = [y2 - y1 for y1, y2 in zip(y_positions, y_positions[1:])]
-
-    median_dy = statistics.median(dy_list)
-    min_dy = 0.7 * median_dy
-    max_dy = 1.3 * median_dy
-
-    print(f"\n📏 Médiane des écarts Y pour '{keyword}': {median_dy:.2f} pts")
-    print(f"🔍 Seuils → trop petit: < {min_dy:.2f} pts | trop grand: > {max_dy:.2f} pts")
-    print(f"↕️ Écarts Y pour '{keyword}':")
-
-    output = []
-    logs = []
-
-    highlight_indices = []
-
-    for i in range(len(y_val_list) - 1):
-        y1, v1 = y_val_list[i]
-        y2, v2 = y_val_list[i + 1]
-        dy = abs(y2 - y1)
-
-        print(f"  dy[{i}] = {dy:.2f} pts entre {v1} et {v2}")
-
-        output.append(v1)
-
-        dy = Decimal(str(y2 - y1))
-        median_dy = Decimal(str(statistics.median(dy_list)))
-        min_dy = median_dy * Decimal("0.7")
-        max_dy = median_dy * Decimal("1.3")
-
-        if dy > max_dy:
-            print("    → TROU détecté")
-            output.append(None)
-            logs.append(f" NULL : Trou détecté pour '{keyword}' entre {v1} et {v2} (écart Y = {dy:.1f} pts)")
-        elif dy < min_dy:
-            print("    → TROP PETIT")
-            highlight_indices.append(len(output) - 1)
-            highlight_indices.append(len(output))
-            logs.append(f" ⚠️  : Espacement trop petit pour '{keyword}' entre {v1} et {v2} (écart Y = {dy:.1f} pts)")
-
-    output.append(y_val_list[-1][1])  # Dernière valeur
-
-    return output, logs, highlight_indices
-
-
-def detect_sondage_name(words):
-    pattern = re.compile(r"\bSP\d{1,4}\b")
-    for w in words:
-        text = w.get('text', '')
-        if pattern.fullmatch(text.strip()):
-            return text.strip()
-    return None
-
-
-
-class PDFKeywordExtractor:
+class PDFKeywordExtractor(PressioEngine):
     def __init__(self, pdf_path, keywords, dpi=150, tolerances=None, column_distance_threshold=15):
+        super().__init__(keywords, tolerances=tolerances, column_distance_threshold=column_distance_threshold)
         self.pdf_path = pdf_path
-        self.keywords = keywords
         self.dpi = dpi
-        self.column_distance_threshold = column_distance_threshold
         self.drag_data = {}
 
-        # Tolerance par mot-clef
-        self.tolerances = tolerances or {
-            self.keywords[0]: {"left": 10, "right": 30, "min_dy": 50},
-            self.keywords[1]: {"left": 10, "right": 30, "min_dy": 50},
-            self.keywords[2]: {"left": 10, "right": 54, "min_dy": 50}
-        }
-
 
     def pt_to_px(self, val):
         return val * self.dpi / 72
 
-    def get_keyword_x_positions(self, words):
-        positions = {}
-        for kw in self.keywords:
-            for w in words:
-                if w['text'].strip().lower() == kw.lower():
-                    x = (w['x0'] + w['x1']) / 2
-                    positions[kw] = x
-                    break
-        return positions
-
     # =========================== DEBUG =======================================
     #
     def highlight_keywords_on_page(self, page):
+        import matplotlib.pyplot as plt
+        from matplotlib.patches import Rectangle
+
         words = page.extract_words()
         im = page.to_image(resolution=self.dpi)
         pil_image = im.original
@@ -161,6 +80,9 @@ class PDFKeywordExtractor:
     # = UI for validation of the list, and suppression of strange values
     #
     def show_validation_ui_with_tabs(self, results_by_sondage):
+        import tkinter as tk
+        from tkinter import filedialog, messagebox, ttk
+
         root = tk.Tk()
         root.title("Validation des sondages")
         notebook = ttk.Notebook(root)
@@ -312,40 +234,13 @@ class PDFKeywordExtractor:
                       command=lambda s=sondage_name: validate_tab(s)).pack(pady=10)
 
         def export_to_excel():
-            import openpyxl
-            from openpyxl.styles import Font
-
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Sondages"
-
-            col_index = 1
-            for sondage_name, data in validated_sondages.items():
-                # Sondage name, line 1
-                ws.cell(row=1, column=col_index, value=sondage_name).font = Font(bold=True)
-
-                # Column header, line 2
-                headers = ["Profondeur", "EM", "PL"]
-                for offset, header in enumerate(headers):
-                    ws.cell(row=2, column=col_index + offset, value=header).font = Font(italic=True)
-
-                # Données à partir de la ligne 3
-                for i, val in enumerate(data["Depth"]):
-                    ws.cell(row=i + 3, column=col_index, value=val)
-                for i, val in enumerate(data["Module"]):
-                    ws.cell(row=i + 3, column=col_index + 1, value=val)
-                for i, val in enumerate(data["Pl*"]):
-                    ws.cell(row=i + 3, column=col_index + 2, value=val)
-
-                col_index += 4  # 3 colonnes + 1 vide
-
             save_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
                 filetypes=[("Excel files", "*.xlsx")],
                 title="Enregistrer sous"
             )
             if save_path:
-                wb.save(save_path)
+                self.export_to_excel(validated_sondages, save_path)
                 messagebox.showinfo("Export réussi", f"Fichier enregistré :\n{save_path}")
 
         tk.Button(right_panel, text="Exporter vers Excel", font=("Helvetica", 10, "bold"),
@@ -439,20 +334,14 @@ class PDFKeywordExtractor:
         root.mainloop()
 
     def ask_user_for_depth_range(self, sondage_name):
+        import tkinter as tk
+        from tkinter import messagebox
+
         depth_values = []
 
         def on_submit():
             try:
-                d_start = float(entry_start.get())
-                d_end = float(entry_end.get())
-                d_step = float(entry_step.get())
-
-                if d_start >= d_end or d_step <= 0:
-                    raise ValueError
-
-                for i in range(int((d_end - d_start) / d_step) + 1):
-                    depth_values.append(round(d_start + i * d_step, 3))
-
+                depth_values.extend(depths_from_range(entry_start.get(), entry_end.get(), entry_step.get()))
                 win.destroy()
             except ValueError:
                 messagebox.showerror("Erreur", "Veuillez entrer des valeurs valides.")
@@ -485,129 +374,17 @@ class PDFKeywordExtractor:
 
 
 
-    def extract_values_near_keyword(self, words, keyword):
-        ref_word = next((w for w in words if w['text'].strip().lower() == keyword.lower()), None)
-        if not ref_word:
-            return []
-
-        tol = self.tolerances.get(keyword, {
-            "left": 10,
-            "right": 30,
-            "min_dy": 50
-        })
-
-        x_ref = (ref_word['x0'] + ref_word['x1']) / 2
-        y_ref = ref_word['top']
-
-        values = []
-        for w in words:
-            try:
-                val = float(w['text'].replace(",", "."))
-            except ValueError:
-                continue
-
-            x_c = (w['x0'] + w['x1']) / 2
-            y_c = w['top']
-
-            if (x_ref - tol['left'] <= x_c <= x_ref + tol['right']) and (y_c > y_ref + tol['min_dy']):
-                values.append((y_c, val))
-
-        return sorted(values, key=lambda x: x[0])
-
-
-
-
-
     # = PROCESSING ALL THE PAGES FOR A PDF DOCUMENT
     def process_all_pages(self):
-        results_by_sondage = {}
-        depths_by_sondage = {}
-
-        with pdfplumber.open(self.pdf_path) as pdf:
-            for page_idx, page in enumerate(pdf.pages):
-                print(f"\n📄 Traitement page {page_idx + 1}")
-                words = page.extract_words()
-                sondage_name = detect_sondage_name(words) or f"Page {page_idx + 1}"
-
-                # Extraction des valeurs par mot-clé
-                values_by_keyword = {}
-                for kw in self.keywords:
-                    values = self.extract_values_near_keyword(words, kw)
-                    values_by_keyword[kw] = values
-                    print(f"🔍 {kw} : {len(values)} valeurs")
-
-                # Vérifie la position de Pf et Pl
-                x_positions = self.get_keyword_x_positions(words)
-                is_combined = False
-                if self.keywords[0] in x_positions and self.keywords[1] in x_positions:
-                    distance = abs(x_positions[self.keywords[0]] - x_positions[self.keywords[1]])
-                    if distance <= self.column_distance_threshold:
-                        is_combined = True
-
-                if is_combined:
-                    print("✅ Pf et Pl combinés → traitement spécial")
-                    pf_values = values_by_keyword[self.keywords[0]]
-                    pl_values = values_by_keyword[self.keywords[1]]
-                    if pf_values != pl_values or len(pf_values) % 2 != 0:
-                        print("⚠️ Données incohérentes pour traitement spécial. Saut de cette page.")
-                        continue
-
-                    pf_final, pl_final = [], []
-                    for i in range(len(pf_values) - 2, -1, -2):
-                        a, b = pf_values[i][1], pf_values[i + 1][1]
-                        if a < b:
-                            pf_final.append((pf_values[i][0], a))
-                            pl_final.append((pf_values[i + 1][0], b))
-                        else:
-                            pf_final.append((pf_values[i + 1][0], b))
-                            pl_final.append((pf_values[i][0], a))
-
-                    pf_final.reverse()
-                    pl_final.reverse()
-                else:
-                    print("✅ Pf et Pl séparés → traitement standard")
-                    pf_final = values_by_keyword[self.keywords[0]]
-                    pl_final = values_by_keyword[self.keywords[1]]
-
-                em_values = values_by_keyword[self.keywords[2]]
-
-                # Analyse des anomalies Y
-                pf_list, pf_logs, pf_red = detect_y_anomalies(pf_final, self.keywords[0])
-                pl_list, pl_logs, pl_red = detect_y_anomalies(pl_final, self.keywords[1])
-                em_list, em_logs, em_red = detect_y_anomalies(em_values, self.keywords[2])
-
-                # Une seule demande de profondeur par sondage
-                if sondage_name not in depths_by_sondage:
-                    depths_by_sondage[sondage_name] = self.ask_user_for_depth_range(sondage_name)
-                depths = depths_by_sondage[sondage_name]
-
-                # Ajout ou accumulation des données par sondage
-                if sondage_name not in results_by_sondage:
-                    results_by_sondage[sondage_name] = {
-                        "Pf*": pf_list,
-                        "Pl*": pl_list,
-                        "Module": em_list,
-                        "Depth": depths,  # ✅ Ajouté une seule fois ici
-                        "RedFlags": {
-                            "Pf*": pf_red,
-                            "Pl*": pl_red,
-                            "Module": em_red
-                        }
-                    }
-                else:
-                    results_by_sondage[sondage_name]["Pf*"] += pf_list
-                    results_by_sondage[sondage_name]["Pl*"] += pl_list
-                    results_by_sondage[sondage_name]["Module"] += em_list
-                    results_by_sondage[sondage_name]["RedFlags"]["Pf*"] += pf_red
-                    results_by_sondage[sondage_name]["RedFlags"]["Pl*"] += pl_red
-                    results_by_sondage[sondage_name]["RedFlags"]["Module"] += em_red
-
+        results_by_sondage = self.process_pdf(self.pdf_path, depth_for=self.ask_user_for_depth_range)
         self.show_validation_ui_with_tabs(results_by_sondage)
 
 
 
 # === Lancement ===
 def choose_pdf():
+    from tkinter import Tk, filedialog
+
     root = Tk()
     root.withdraw()
     return filedialog.askopenfilename(
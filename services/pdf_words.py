@@ -0,0 +1,109 @@
+import io
+import logging
+from contextlib import contextmanager
+
+import fitz  # PyMuPDF
+import pdfplumber
+
+logging.getLogger("pdfminer").setLevel(logging.ERROR)
+
+# === Script : WORD BOXES FROM PDF PAGES - PLUGGABLE BACKEND FOR THE GEOTECH PIPELINE ===
+# Every backend yields pages exposing :
+#   page_number (int, 1-indexed)
+#   extract_words() -> list[dict] with pdfplumber semantics : text, x0, x1, top, bottom (pts, origin top-left)
+#   extract_words_in(boxes) -> same, restricted to chars/words whose center is in one of the boxes
+#                              box = (x0, top, x1, bottom), top/bottom None = full page height
+#
+
+LINE_Y_TOLERANCE = 3  # pts, same default as pdfplumber extract_words
+
+# Small glyph heights : box height = font size, bottom = baseline - descent, as pdfminer chars.
+# Process-wide MuPDF setting, set once at import (toggling it per page would race between threads) ;
+# plain get_text() (pdf_table_extract) is not affected, only the glyph boxes.
+fitz.TOOLS.set_small_glyph_heights(True)
+
+
+def _center_in_boxes(obj, boxes):
+    x_c = (obj['x0'] + obj['x1']) / 2
+    y_c = (obj['top'] + obj['bottom']) / 2
+    return any(
+        x0 <= x_c <= x1 and (top is None or top <= y_c <= bottom)
+        for x0, top, x1, bottom in boxes
+    )
+
+
+class PlumberWordPage:
+    def __init__(self, page):
+        self.page = page
+        self.page_number = page.page_number
+
+    def extract_words(self):
+        return self.page.extract_words()
+
+    def extract_words_in(self, boxes):
+        # One pass over the page chars (page.crop() would clip every object once per box)
+        return self.page.filter(
+            lambda obj: obj.get("object_type") == "char" and _center_in_boxes(obj, boxes)
+        ).extract_words()
+
+
+class MuPDFWordPage:
+    def __init__(self, page):
+        self.page = page
+        self.page_number = page.number + 1
+
+    def extract_words(self):
+        raw = self.page.get_text("words")
+        words = [
+            {"text": text, "x0": x0, "x1": x1, "top": y0, "bottom": y1}
+            for x0, y0, x1, y1, text, *_ in raw
+        ]
+        return sort_words_like_pdfplumber(words)
+
+    def extract_words_in(self, boxes):
+        return [w for w in self.extract_words() if _center_in_boxes(w, boxes)]
+
+
+# INPUT:
+#   words (list[dict]): word boxes in any order.
+# OUTPUT:
+#   list[dict]: lines clustered on `top` (LINE_Y_TOLERANCE), top to bottom, each line left to right.
+#               "First match" helpers (detect_pressio_name, get_keyword_x_positions...) then behave as with pdfplumber.
+def sort_words_like_pdfplumber(words):
+    lines = []
+    for w in sorted(words, key=lambda w: w['top']):
+        if lines and w['top'] - lines[-1][0]['top'] <= LINE_Y_TOLERANCE:
+            lines[-1].append(w)
+        else:
+            lines.append([w])
+    return [w for line in lines for w in sorted(line, key=lambda w: w['x0'])]
+
+
+@contextmanager
+def _open_pdfplumber(source):
+    with pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source) as doc:
+        yield [PlumberWordPage(p) for p in doc.pages]
+
+
+@contextmanager
+def _open_pymupdf(source):
+    doc = fitz.open(stream=source, filetype="pdf") if isinstance(source, bytes) else fitz.open(source)
+    try:
+        yield [MuPDFWordPage(p) for p in doc]
+    finally:
+        doc.close()
+
+
+WORD_BACKENDS = {
+    "pdfplumber": _open_pdfplumber,
+    "pymupdf": _open_pymupdf,
+}
+
+
+# INPUT:
+#   source (bytes | str): PDF content, or path of the PDF (worker processes reopen the file instead of receiving it).
+#   backend (str): key of WORD_BACKENDS.
+def open_word_pages(source, backend="pdfplumber"):
+    if backend not in WORD_BACKENDS:
+        raise ValueError(f"Backend de mots inconnu : {backend} (attendu : {', '.join(WORD_BACKENDS)})")
+    return WORD_BACKENDS[backend](source)
@@ -0,0 +1,185 @@
+import os
+import zlib
+import base64
+import binascii
+import gzip
+import json
+
+import numpy as np
+
+try:
+    import brotli  # optional : "br" is only negotiated when installed
+except ImportError:
+    brotli = None
+
+# === Script : COMPACT COLUMNAR PAYLOAD FOR PRESSIO RESULTS (/process-pressio, /export-pressio) ===
+# Default payload stays the nested JSON { pressio : {"Depth": [...], "Pf*": [...], ..., "RedFlags": {kw: [idx]},
+#                                                    "Warnings": [str]} }
+# Columnar payload, negotiated with Accept / Content-Type = COLUMNAR_MEDIA_TYPE, lossless :
+#   {"format": "pressio-columnar-v2",
+#    "boreholes": { pressio : {"Depth": {"f8": b64}, "Pf*": {"f8": b64}, ...,    ← float64 LE, NaN = null
+#                              "RedFlags": {kw: {"i4": b64}},                    ← int32 LE, order and duplicates kept
+#                              "Warnings": [...], other fields as is}}}
+# A value column holding anything else than floats / null (ints, text...) is sent as a plain JSON list.
+#
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.pressio.columnar+json"
+COLUMNAR_FORMAT = "pressio-columnar-v2"
+VALUE_COLUMNS = ("Depth", "Pf*", "Pl*", "Module")
+VALUE_DTYPE = "<f8"
+FLAG_DTYPE = "<i4"
+MAX_DECOMPRESSED_BYTES = int(os.getenv("PRESSIO_MAX_BODY_MB", "64")) * 1024 * 1024
+
+
+class PayloadTooLarge(ValueError):
+    pass
+
+
+def _encode_values(values):
+    if not all(v is None or type(v) is float for v in values):
+        return list(values)
+    arr = np.array([np.nan if v is None else v for v in values], dtype=VALUE_DTYPE)
+    return {"f8": base64.b64encode(arr.tobytes()).decode("ascii")}
+
+
+def _decode_values(encoded):
+    if isinstance(encoded, list):
+        return encoded
+    arr = np.frombuffer(base64.b64decode(encoded["f8"], validate=True), dtype=VALUE_DTYPE)
+    return [None if np.isnan(v) else v for v in arr.tolist()]
+
+
+def _encode_flags(indices):
+    if not all(type(i) is int and -2 ** 31 <= i < 2 ** 31 for i in indices):
+        return list(indices)
+    return {"i4": base64.b64encode(np.array(indices, dtype=FLAG_DTYPE).tobytes()).decode("ascii")}
+
+
+def _decode_flags(encoded):
+    if isinstance(encoded, list):
+        return encoded
+    return np.frombuffer(base64.b64decode(encoded["i4"], validate=True), dtype=FLAG_DTYPE).tolist()
+
+
+def encode_pressio_columnar(final_data):
+    boreholes = {}
+    for pressio, data in final_data.items():
+        entry = dict(data)
+        for col in VALUE_COLUMNS:
+            if col in data:
+                entry[col] = _encode_values(data[col])
+        if "RedFlags" in data:
+            entry["RedFlags"] = {kw: _encode_flags(flags) for kw, flags in data["RedFlags"].items()}
+        boreholes[pressio] = entry
+    return {"format": COLUMNAR_FORMAT, "boreholes": boreholes}
+
+
+def decode_pressio_columnar(payload):
+    if payload.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"Format colonnaire inconnu : {payload.get('format')}")
+
+    final_data = {}
+    for pressio, entry in payload["boreholes"].items():
+        data = dict(entry)
+        for col in VALUE_COLUMNS:
+            if col in entry:
+                data[col] = _decode_values(entry[col])
+        if "RedFlags" in entry:
+            data["RedFlags"] = {kw: _decode_flags(flags) for kw, flags in entry["RedFlags"].items()}
+        final_data[pressio] = data
+    return final_data
+
+
+# = HTTP BODIES : Content-Encoding / Accept-Encoding (gzip, br)
+#
+def supported_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding):
+    accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+    return next((enc for enc in supported_encodings() if enc in accepted), None)
+
+
+def compress_body(body, encoding):
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return body
+
+
+# OUTPUT:
+#   bytes: decoded body, PayloadTooLarge past max_bytes (checked while inflating, a small "zip bomb" body is not
+#          expanded in memory), ValueError on a corrupt stream.
+def decompress_body(body, content_encoding, max_bytes=MAX_DECOMPRESSED_BYTES):
+    encoding = (content_encoding or "").strip().lower()
+    if encoding in ("", "identity"):
+        out = body
+    elif encoding == "gzip":
+        inflater = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        out = inflater.decompress(body, max_bytes + 1)
+        if len(out) > max_bytes:
+            raise PayloadTooLarge(f"Corps décompressé supérieur à {max_bytes // (1024 * 1024)} Mo")
+        if not inflater.eof:
+            raise ValueError("Flux gzip tronqué")
+    elif encoding == "br" and brotli is not None:
+        decompressor = brotli.Decompressor()
+        out = bytearray()
+        for i in range(0, len(body), 1024):
+            out += decompressor.process(body[i:i + 1024])
+            if len(out) > max_bytes:
+                raise PayloadTooLarge(f"Corps décompressé supérieur à {max_bytes // (1024 * 1024)} Mo")
+        if not decompressor.is_finished():
+            raise ValueError("Flux brotli tronqué")
+        out = bytes(out)
+    else:
+        raise ValueError(f"Content-Encoding non supporté : {content_encoding}")
+    if len(out) > max_bytes:
+        raise PayloadTooLarge(f"Corps supérieur à {max_bytes // (1024 * 1024)} Mo")
+    return out
+
+
+# INPUT:
+#   final_data (dict): pressio results in the default nested layout.
+#   accept (str | None), accept_encoding (str | None): request headers.
+# OUTPUT:
+#   (body bytes, headers dict) : columnar if asked through Accept, compressed if Accept-Encoding allows it.
+def render_pressio_payload(final_data, accept, accept_encoding):
+    if accept and COLUMNAR_MEDIA_TYPE in accept:
+        payload, media_type = encode_pressio_columnar(final_data), COLUMNAR_MEDIA_TYPE
+    else:
+        payload, media_type = final_data, "application/json"
+
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+    headers = {"Content-Type": media_type, "Vary": "Accept, Accept-Encoding"}
+
+    encoding = choose_encoding(accept_encoding)
+    if encoding:
+        body = compress_body(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return body, headers
+
+
+# INPUT:
+#   body (bytes), content_type (str | None), content_encoding (str | None): raw request and its headers.
+# OUTPUT:
+#   dict: pressio results in the default nested layout, whatever the payload format was.
+#   ValueError (PayloadTooLarge) on any body that cannot be decoded into {pressio: {column: list}}.
+def parse_pressio_payload(body, content_type, content_encoding):
+    raw = decompress_body(body, content_encoding)
+    try:
+        payload = json.loads(raw)
+        if (content_type and COLUMNAR_MEDIA_TYPE in content_type) or (
+                isinstance(payload, dict) and payload.get("format") == COLUMNAR_FORMAT):
+            payload = decode_pressio_columnar(payload)
+    except (UnicodeDecodeError, json.JSONDecodeError, binascii.Error, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"Corps illisible : {type(e).__name__} : {e}") from e
+
+    if not isinstance(payload, dict) or not all(isinstance(data, dict) for data in payload.values()):
+        raise ValueError("Corps attendu : {sondage: {colonne: valeurs}}")
+    for pressio, data in payload.items():
+        for col in VALUE_COLUMNS:
+            if not isinstance(data.get(col, []), list):
+                raise ValueError(f"{pressio} : '{col}' doit être une liste")
+    return payload
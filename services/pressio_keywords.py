@@ -0,0 +1,59 @@
+# === Script : PRESSIOMETER KEYWORD COLUMNS - VALUES UNDER THE Pf* / Pl* / Module HEADERS ===
+# Shared by the web routes (routes/extract_geotech.py) and the headless engine (pdf_sondage_engine.py) :
+# a value belongs to a keyword when its word is centred in [x_ref - left, x_ref + right] around the header
+# and lies more than min_dy below it. Words come from pdfplumber or services/pdf_words.py (same dict keys).
+#
+
+DEFAULT_TOLERANCE = {"left": 10, "right": 30, "min_dy": 50}
+
+
+def keyword_reference(words, keyword):
+    # First match of the keyword : the header used for extraction
+    return next((w for w in words if w['text'].strip().lower() == keyword.lower()), None)
+
+
+# INPUT:
+#   words (list[dict]): word boxes of the page.
+#   ref_word (dict): keyword header (keyword_reference).
+#   tolerance (dict): {"left", "right", "min_dy"}.
+# OUTPUT (generator):
+#   (word, value) for every numeric word centred in [x_ref - left, x_ref + right] and below top + min_dy.
+def words_near_keyword(words, ref_word, tolerance):
+    x_ref = (ref_word['x0'] + ref_word['x1']) / 2
+    y_ref = ref_word['top']
+
+    for w in words:
+        try:
+            val = float(w['text'].replace(",", "."))
+        except ValueError:
+            continue
+
+        x_c = (w['x0'] + w['x1']) / 2
+        y_c = w['top']
+
+        if (x_ref - tolerance['left'] <= x_c <= x_ref + tolerance['right']) and (y_c > y_ref + tolerance['min_dy']):
+            yield w, val
+
+
+# OUTPUT:
+#   list[tuple[float, float]]: (y, value) under the keyword header, sorted by y, [] if the header is missing.
+def extract_values_near_keyword(words, keyword, tolerance):
+    ref_word = keyword_reference(words, keyword)
+    if not ref_word:
+        return []
+
+    values = [(w['top'], val) for w, val in words_near_keyword(words, ref_word, tolerance)]
+    return sorted(values, key=lambda x: x[0])
+
+
+# OUTPUT:
+#   dict[str, float]: x centre of the first header of each keyword found on the page.
+def get_keyword_x_positions(words, keywords):
+    positions = {}
+    for kw in keywords:
+        for w in words:
+            if w['text'].strip().lower() == kw.lower():
+                x = (w['x0'] + w['x1']) / 2
+                positions[kw] = x
+                break
+    return positions
@@ -0,0 +1,27 @@
+# === Script : COMBINED Pf*/Pl* COLUMN - DE-INTERLEAVING OF THE VALUE PAIRS ===
+# When Pf* and Pl* share a column, values come as consecutive pairs (one Pf*, one Pl*) sorted by y.
+# Pairs are anchored on the last value of the page (same as the former backward walk) :
+# with an odd count, the first value of the page is left unpaired and reported instead of dropping the page.
+# In each pair : Pf* = smallest value, Pl* = largest (on a tie, Pf* takes the second value).
+# Plain Python : a page holds a few dozen values, converting them for NumPy costs more than the pairing itself.
+# Parity with the former backward walk : tests/test_pressio_pairing.py, timings : benchmarks/pressio_pairing.py
+#
+
+
+# INPUT:
+#   values (list[tuple[float, float]]): (y, value) of one page, sorted by y.
+# OUTPUT:
+#   pf_final (list[tuple]), pl_final (list[tuple]): (y, value) of each pair, in y order.
+#   unpaired (list[tuple]): first value of the page if the count is odd, else empty.
+def pair_combined_values(values):
+    pf_final, pl_final = [], []
+    start = len(values) % 2
+    for idx in range(start, len(values), 2):
+        a, b = values[idx], values[idx + 1]
+        if a[1] < b[1]:
+            pf_final.append(a)
+            pl_final.append(b)
+        else:
+            pf_final.append(b)
+            pl_final.append(a)
+    return pf_final, pl_final, values[:start]
@@ -0,0 +1,100 @@
+import os
+import re
+import tempfile
+
+import xlsxwriter
+
+# === Script : EXPORT PRESSIO RESULTS WITH XLSXWRITER (CONSTANT MEMORY) ===
+# Rows are written straight from the Depth/Pf*/Pl*/Module lists, no DataFrame per sheet.
+# layout "wide" : one sheet per borehole, columns Profondeur | Pf* | Pl* | Module (same as the openpyxl export)
+# layout "long" : one sheet "Pressio", columns Sondage | Profondeur | Pf* | Pl* | Module
+# Sheet names : forbidden characters replaced, cut to 31 characters, made unique (Excel compares them
+# case-insensitively) with a " (2)", " (3)"... suffix, same names for both exporters.
+#
+# xlsxwriter only assembles the .xlsx archive on close() : the workbook is written to a temporary file
+# (constant_memory flushes each row to disk) and the file is then streamed by chunks.
+#
+
+EXPORTERS = ("openpyxl", "xlsxwriter")
+EXPORT_LAYOUTS = ("wide", "long")
+EXPORT_COLUMNS = ("Depth", "Pf*", "Pl*", "Module")
+EXPORT_HEADERS = ("Profondeur", "Pf*", "Pl*", "Module")
+CHUNK_SIZE = 64 * 1024
+
+
+def safe_sheet_name(pressio):
+    return re.sub(r'[:\\/*?[\]]', '_', pressio)[:31]
+
+
+# INPUT:
+#   names (iterable[str]): borehole names, in export order.
+# OUTPUT:
+#   dict[str, str]: {borehole name: sheet name}, no two sheet names equal once lowercased.
+def unique_sheet_names(names):
+    sheet_names, used = {}, set()
+    for pressio in names:
+        base = safe_sheet_name(pressio)
+        sheet_name, n = base, 1
+        while sheet_name.lower() in used:
+            n += 1
+            suffix = f" ({n})"
+            sheet_name = base[:31 - len(suffix)] + suffix
+        used.add(sheet_name.lower())
+        sheet_names[pressio] = sheet_name
+    return sheet_names
+
+
+def _padded_rows(data):
+    columns = [data.get(col, []) or [] for col in EXPORT_COLUMNS]
+    max_len = max(len(c) for c in columns)
+    for i in range(max_len):
+        yield [c[i] if i < len(c) else None for c in columns]
+
+
+# INPUT:
+#   validated_data (dict): { pressio : {"Depth": [...], "Pf*": [...], "Pl*": [...], "Module": [...]} }
+#   layout (str): "wide" or "long".
+# OUTPUT:
+#   str: path of the temporary .xlsx file (to be removed by the caller).
+def write_pressio_xlsx(validated_data, layout="wide"):
+    if layout not in EXPORT_LAYOUTS:
+        raise ValueError(f"Layout d'export inconnu : {layout} (attendu : {', '.join(EXPORT_LAYOUTS)})")
+
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
+    tmp.close()
+
+    workbook = xlsxwriter.Workbook(tmp.name, {"constant_memory": True, "nan_inf_to_errors": True})
+    # Same header style as pandas.to_excel
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+
+    try:
+        if layout == "wide":
+            sheet_names = unique_sheet_names(validated_data)
+            for pressio, data in validated_data.items():
+                ws = workbook.add_worksheet(sheet_names[pressio])
+                ws.write_row(0, 0, EXPORT_HEADERS, header_format)
+                for row_idx, row in enumerate(_padded_rows(data), start=1):
+                    ws.write_row(row_idx, 0, row)
+        else:
+            ws = workbook.add_worksheet("Pressio")
+            ws.write_row(0, 0, ("Sondage",) + EXPORT_HEADERS, header_format)
+            row_idx = 1
+            for pressio, data in validated_data.items():
+                for row in _padded_rows(data):
+                    ws.write_row(row_idx, 0, [pressio] + row)
+                    row_idx += 1
+        workbook.close()
+    except Exception:
+        os.unlink(tmp.name)
+        raise
+
+    return tmp.name
+
+
+def iter_file_chunks(path, chunk_size=CHUNK_SIZE):
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+    finally:
+        os.unlink(path)
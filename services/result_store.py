@@ -0,0 +1,150 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from .extract_utils import format_lq_values, sum_lq_arrays, GROUP_LQ_TEXT
+from .thresholds import parse_result_column, NUMBER
+
+# === Script : RESULT STORE - EXTRACTED VALUES AS ARRAYS INSTEAD OF A DICT OF DICTS PER SAMPLE ===
+# samples x items matrices (column-major, one column per output item, in the former resultats key order) :
+#   numbers (float64) : value of the cells read as floats (and group sums), rebuilt as str(number)
+#   codes (int32)     : every other cell, index in a pool of distinct unformatted texts ("<LQ (<0,05)", "12,5", "")
+#                       -1 = the cell is numbers[i, j]
+# LQ formatting ("<LQ (<lq (<0,05))", -1 with replace_lq_with_minus_one) is applied on the pool, per kind of column
+# (group member as extracted, keyword formatted, group sum), never per cell.
+# Read-only Mapping view for the former code : store[nom_echantillon] → {item: value}, same values and key order.
+# Parity with the former dict of dicts : tests/test_result_store.py, memory : benchmarks/result_store.py
+#
+MEMBER, KEYWORD, GROUP = 0, 1, 2
+
+
+class ResultStore(Mapping):
+    def __init__(self, sample_names=(), items=(), kinds=(), numbers=None, codes=None, pool=(), minus_one=False):
+        self.sample_names = list(sample_names)
+        self.sample_index = {nom: s for s, nom in enumerate(self.sample_names)}
+        self.item_names = list(items)
+        self.item_index = {item: j for j, item in enumerate(self.item_names)}
+        self.kinds = np.asarray(kinds, dtype=np.int8)
+        shape = (len(self.sample_names), len(self.item_names))
+        self.numbers = np.full(shape, np.nan, order="F") if numbers is None else numbers
+        self.codes = np.full(shape, -1, dtype=np.int32, order="F") if codes is None else codes
+        self.pool = np.asarray(pool, dtype=object)
+        self.minus_one = minus_one
+        self._formatted = {}
+        self._parsed = None  # parse_result_column of the pool, + NUMBER for the code -1
+
+    # INPUT:
+    #   sample_names (list[str]): "Nom échantillon" per extracted row ; a name found twice keeps its first position
+    #                             and the values of its last row, like the former dict (same for the items).
+    #   columns (list[tuple]): (item, kind, text, numbers, from_float) in writing order, one value per row.
+    #   minus_one (bool): see extract_utils.format_lq_values.
+    @classmethod
+    def from_columns(cls, sample_names, columns, minus_one=False):
+        last_row = {}
+        for s, nom in enumerate(sample_names):
+            last_row[nom] = s
+        rows = np.fromiter(last_row.values(), dtype=np.intp, count=len(last_row))
+        latest = {}
+        for item, kind, text, numbers, from_float in columns:
+            latest[item] = (kind, text, numbers, from_float)
+
+        n, m = len(rows), len(latest)
+        store_numbers = np.full((n, m), np.nan, order="F")
+        store_codes = np.full((n, m), -1, dtype=np.int32, order="F")
+        pool_index = {}
+        for j, (kind, text, numbers, from_float) in enumerate(latest.values()):
+            from_float = from_float[rows]
+            store_numbers[from_float, j] = numbers[rows][from_float]
+            rest = np.flatnonzero(~from_float)
+            codes, uniques = pd.factorize(np.asarray(text, dtype=object)[rows][rest])
+            ids = np.array([pool_index.setdefault(u, len(pool_index)) for u in uniques.tolist()], dtype=np.int32)
+            store_codes[rest, j] = ids[codes]
+        kinds = [kind for kind, _, _, _ in latest.values()]
+        return cls(list(last_row), list(latest), kinds, store_numbers, store_codes, list(pool_index), minus_one)
+
+    # Pool formatted for one kind of column (computed once)
+    def formatted_pool(self, kind):
+        pool = self._formatted.get(kind)
+        if pool is None:
+            if kind == KEYWORD:
+                pool = format_lq_values(self.pool, self.minus_one)
+            elif kind == GROUP and self.minus_one:
+                pool = np.array([-1 if t == GROUP_LQ_TEXT else t for t in self.pool.tolist()], dtype=object)
+            else:
+                pool = self.pool
+            self._formatted[kind] = pool
+        return pool
+
+    # OUTPUT:
+    #   np.ndarray[object]: values of one item for every sample, as the former resultats[nom][item].
+    def column(self, item):
+        j = self.item_index[item]
+        codes = self.codes[:, j]
+        out = np.empty(len(codes), dtype=object)
+        text = codes >= 0
+        out[text] = self.formatted_pool(self.kinds[j])[codes[text]]
+        out[~text] = [str(v) for v in self.numbers[~text, j].tolist()]
+        return out
+
+    # OUTPUT:
+    #   (state, values, lq_bound): thresholds.parse_result_column of the unformatted values (no -1 replacement),
+    #   distinct texts parsed once, float cells taken from numbers.
+    def parsed_column(self, item):
+        j = self.item_index[item]
+        codes = self.codes[:, j]
+        if self._parsed is None:
+            u_state, u_values, u_bound = parse_result_column(self.pool) if len(self.pool) else ([], [], [])
+            self._parsed = (np.append(u_state, NUMBER), np.append(u_values, np.nan), np.append(u_bound, np.nan))
+        u_state, u_values, u_bound = self._parsed
+        state, values, bounds = u_state[codes].astype(np.int8), u_values[codes], u_bound[codes]  # -1 → last
+        floats = codes < 0
+        values[floats] = self.numbers[floats, j]
+        return state, values, bounds
+
+    # OUTPUT:
+    #   np.ndarray[object]: unformatted text of the text cells of one item, None for the float cells.
+    def text_column(self, item):
+        codes = self.codes[:, self.item_index[item]]
+        out = np.full(len(codes), None, dtype=object)
+        text = codes >= 0
+        out[text] = self.pool[codes[text]]
+        return out
+
+    # INPUT:
+    #   items (list[str] | None): columns to build, default every item.
+    # OUTPUT:
+    #   pd.DataFrame: samples as index, same frame as pd.DataFrame.from_dict(resultats, orient="index").
+    def to_frame(self, items=None):
+        items = self.item_names if items is None else items
+        data = {item: self.column(item) for item in items}
+        index = pd.Index(self.sample_names, dtype=object)
+        return pd.DataFrame(data, index=index, columns=pd.Index(items, dtype=object)).infer_objects()
+
+    # Mapping view : nom_echantillon → {item: value} (read-only)
+    def __getitem__(self, nom_echantillon):
+        s = self.sample_index[nom_echantillon]
+        row = {}
+        for j, item in enumerate(self.item_names):
+            code = self.codes[s, j]
+            row[item] = str(self.numbers[s, j].item()) if code < 0 else self.formatted_pool(self.kinds[j])[code]
+        return MappingProxyType(row)
+
+    def __iter__(self):
+        return iter(self.sample_names)
+
+    def __len__(self):
+        return len(self.sample_names)
+
+
+# INPUT:
+#   nom_groupe (str), members (list[tuple]), n (int): see extract_utils.sum_lq_arrays.
+# OUTPUT:
+#   tuple: ResultStore.from_columns column of the group sum (str(total), "<LQ (<lq)" or "").
+def group_column(nom_groupe, members, n):
+    total, has_value, lq_detected = sum_lq_arrays(members, n)
+    from_float = has_value & ~np.isnan(total)
+    text = np.full(n, "", dtype=object)
+    text[lq_detected & ~has_value] = GROUP_LQ_TEXT
+    return nom_groupe, GROUP, text, total, from_float
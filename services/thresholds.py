@@ -0,0 +1,172 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from .extract_utils import ND_VALUES
+
+# === Script : REGULATORY THRESHOLDS - EXTRACTED RESULTS VS ACCEPTANCE LIMITS (ISDI-STYLE) ===
+# Thresholds : {key: limit}, key = base keyword ("naphtalene"), full item ("toluene → (3, Toluène)") or group name
+# ("BTEX"), limit = number (or "0,5"). Every column of the export frame is parsed once (distinct values),
+# then compared for all the samples at once (samples x parameters matrices).
+# LQ-aware :
+#   number                    : exceeded when value > limit, ratio = value / limit
+#   "<LQ (<b)"  with b ≤ limit : compliant (not quantified below the limit)
+#   "<LQ (<b)"  with b > limit : undetermined (the LQ does not allow to conclude)
+#   "<LQ" / n.d. without bound : undetermined (nothing says the LQ is below the limit)
+#   empty / other text        : not compared
+# Bound b : last "<number" of the cell, units and exponents allowed ("<0,05", "<LQ (<0.05 mg/kg)", "<5e-2").
+# Verdict per sample : "Non conforme" if one limit is exceeded, otherwise "Indéterminé (LQ > seuil)" if one LQ is
+# above its limit (or has no bound), otherwise "Conforme" if at least one parameter was compared, otherwise "".
+# Parity with a cell by cell comparison : tests/test_thresholds.py, timings : benchmarks/thresholds.py
+#
+
+EMPTY, NUMBER, LQ, TEXT = 0, 1, 2, 3
+VERDICT_OK = "Conforme"
+VERDICT_EXCEEDED = "Non conforme"
+VERDICT_UNDETERMINED = "Indéterminé (LQ > seuil)"
+LQ_BOUND = re.compile(r"<\s*(\d+(?:[.,]\d+)?(?:e[+-]?\d+)?)")
+
+
+# INPUT:
+#   value: one distinct cell of the export frame ("12.5", "<LQ (<0,05)", "<LQ", "", -1...).
+# OUTPUT:
+#   (state (int), value (float), lq_bound (float))
+def parse_result_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return EMPTY, np.nan, np.nan
+    if not isinstance(value, str):
+        try:
+            return NUMBER, float(value), np.nan
+        except (TypeError, ValueError):
+            return TEXT, np.nan, np.nan
+
+    val_str = value.strip().lower()
+    if not val_str:
+        return EMPTY, np.nan, np.nan
+    if val_str.startswith("<"):
+        bounds = LQ_BOUND.findall(val_str)
+        return LQ, np.nan, float(bounds[-1].replace(",", ".")) if bounds else np.nan
+    if val_str in ND_VALUES:
+        return LQ, np.nan, np.nan
+    try:
+        return NUMBER, float(val_str.replace(",", ".")), np.nan
+    except ValueError:
+        return TEXT, np.nan, np.nan
+
+
+# INPUT:
+#   column (array-like): one column of the export frame.
+# OUTPUT:
+#   (state (np.ndarray[int8]), values (np.ndarray[float]), lq_bound (np.ndarray[float])), each distinct cell parsed once.
+def parse_result_column(column):
+    codes, uniques = pd.factorize(np.asarray(column, dtype=object), use_na_sentinel=True)
+    m = len(uniques)
+    u_state = np.full(m + 1, EMPTY, dtype=np.int8)  # code -1 (NaN) → last
+    u_values = np.full(m + 1, np.nan)
+    u_bound = np.full(m + 1, np.nan)
+
+    # Numeric strings converted at once ("12,5" on a second pass), the few others parsed one by one
+    numbers = pd.to_numeric(pd.Series(uniques, dtype=object), errors="coerce").to_numpy(dtype=float, copy=True)
+    retry = np.flatnonzero(np.isnan(numbers))
+    if len(retry):
+        numbers[retry] = pd.to_numeric(pd.Series(uniques[retry], dtype=object).str.replace(",", ".", regex=False),
+                                       errors="coerce").to_numpy(dtype=float)
+    quick = ~np.isnan(numbers)
+    u_state[:m][quick] = NUMBER
+    u_values[:m][quick] = numbers[quick]
+    for i in np.flatnonzero(~quick).tolist():
+        u_state[i], u_values[i], u_bound[i] = parse_result_value(uniques[i])
+    return u_state[codes], u_values[codes], u_bound[codes]
+
+
+# INPUT:
+#   thresholds (dict[str, float | str]): see the header, as sent by the client.
+# OUTPUT:
+#   dict[str, float]: limit per key, empty limits skipped. ValueError when a limit is not a finite number.
+def parse_thresholds(thresholds):
+    if not isinstance(thresholds, dict):
+        raise ValueError("Seuils invalides : objet {paramètre: seuil} attendu")
+    limites = {}
+    for key, value in thresholds.items():
+        if value is None or str(value).strip() == "":
+            continue
+        try:
+            limit = float(str(value).strip().replace(",", "."))
+        except ValueError:
+            limit = np.nan
+        if isinstance(value, bool) or not np.isfinite(limit):
+            raise ValueError(f"Seuil invalide pour '{key}' : {value!r}")
+        limites[str(key).strip()] = limit
+    return limites
+
+
+# INPUT:
+#   columns (list[str]): columns of the export frame (items and group names).
+#   thresholds (dict[str, float | str]): see the header.
+# OUTPUT:
+#   np.ndarray[float]: limit per column, NaN when no threshold applies.
+def threshold_limits(columns, thresholds):
+    limites = parse_thresholds(thresholds)
+    out = np.full(len(columns), np.nan)
+    for j, col in enumerate(columns):
+        for key in (str(col).strip(), str(col).split("→")[0].strip()):
+            if key in limites:
+                out[j] = limites[key]
+                break
+    return out
+
+
+# INPUT:
+#   df_export (pd.DataFrame): BaseExtract.export_frame() (samples as index), before any LQ replacement.
+#   thresholds (dict[str, float | str]): see the header.
+# OUTPUT:
+#   summary (pd.DataFrame): "Verdict", "Nb dépassements", "Ratio max", "Paramètres dépassés" per sample.
+#   ratios (pd.DataFrame): value / limit for the columns with a threshold (NaN when not quantified).
+def compare_thresholds(df_export, thresholds):
+    columns = list(df_export.columns)
+    limits = threshold_limits(columns, thresholds)
+    compared = np.flatnonzero(~np.isnan(limits))
+    n = len(df_export)
+
+    shape = (n, len(compared))
+    state = np.zeros(shape, dtype=np.int8)
+    values = np.full(shape, np.nan)
+    bounds = np.full(shape, np.nan)
+    for k, j in enumerate(compared):
+        state[:, k], values[:, k], bounds[:, k] = parse_result_column(df_export.iloc[:, j].to_numpy(dtype=object))
+
+    limit_row = limits[compared]
+    is_number = state == NUMBER
+    is_lq = state == LQ
+    with np.errstate(invalid="ignore", divide="ignore"):
+        exceed = is_number & (values > limit_row)
+        lq_above = is_lq & ~(bounds <= limit_row)  # no bound : undetermined
+        ratios = np.where(is_number, values / limit_row, np.nan)
+
+    n_exceed = exceed.sum(axis=1)
+    any_compared = (is_number | is_lq).any(axis=1)
+    verdicts = np.full(n, "", dtype=object)
+    verdicts[any_compared] = VERDICT_OK
+    verdicts[lq_above.any(axis=1)] = VERDICT_UNDETERMINED
+    verdicts[n_exceed > 0] = VERDICT_EXCEEDED
+
+    ratio_max = np.where(np.isnan(ratios), -np.inf, ratios).max(axis=1, initial=-np.inf)
+    ratio_max[np.isneginf(ratio_max)] = np.nan
+
+    # Names of the exceeded parameters, one pass per parameter (not per sample)
+    depasses = np.full(n, "", dtype=object)
+    for k, j in enumerate(compared):
+        rows = np.flatnonzero(exceed[:, k])
+        if len(rows):
+            depasses[rows] = depasses[rows] + f"; {columns[j]}"
+    depasses = np.array([d[2:] for d in depasses.tolist()], dtype=object)
+
+    summary = pd.DataFrame({
+        "Verdict": verdicts,
+        "Nb dépassements": n_exceed,
+        "Ratio max": ratio_max,
+        "Paramètres dépassés": depasses,
+    }, index=df_export.index)
+    ratios = pd.DataFrame(ratios, index=df_export.index, columns=[columns[j] for j in compared])
+    return summary, ratios
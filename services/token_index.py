@@ -0,0 +1,80 @@
+from collections import defaultdict, OrderedDict
+from functools import lru_cache
+
+from .extract_utils import clean_tokens
+
+# === Script : INVERTED TOKEN INDEX FOR KEYWORD → LABEL MATCHING ===
+# A keyword matches a label when every token of the keyword is a token of the label (clean_tokens),
+# labels containing "%" are never matched (same rules as the former BaseExtract.get_matching_columns).
+# The label row is tokenized once into token → label indices, keywords are tokenized once (cached),
+# and each keyword is resolved by intersecting the posting lists of its tokens (smallest first).
+# Parity with the former nested loop : tests/test_token_index.py, timings : benchmarks/token_index.py
+#
+
+
+@lru_cache(maxsize=4096)
+def keyword_tokens(keyword):
+    return frozenset(clean_tokens(keyword))
+
+
+class TokenIndex:
+    # INPUT:
+    #   labels (list[str] | pd.Series): label row (columns) or label column (rows) of the sheet.
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self.postings = defaultdict(set)
+        self.candidates = []  # labels without "%", for keywords without any token
+        for i, label in enumerate(self.labels):
+            if "%" in str(label):
+                continue
+            self.candidates.append(i)
+            for tok in clean_tokens(str(label)):
+                self.postings[tok].add(i)
+
+    def lookup(self, keyword):
+        tokens = keyword_tokens(keyword)
+        if not tokens:
+            return self.candidates
+        lists = sorted((self.postings.get(tok, ()) for tok in tokens), key=len)
+        hits = set(lists[0]).intersection(*lists[1:])
+        return sorted(hits)
+
+    # OUTPUT: same as BaseExtract.get_matching_columns
+    #   matched (dict[str, list[tuple[int, str]]]), multiple_matches (list[str])
+    def match(self, keywords):
+        matched = {kw: [] for kw in keywords}
+        for kw in matched:
+            matched[kw] = [(i, self.labels[i]) for i in self.lookup(kw)]
+        multiple_matches = [kw for kw, matches in matched.items() if len(matches) > 1]
+        return matched, multiple_matches
+
+
+class MatchPlan:
+    # Warm matcher of a recurring layout : one TokenIndex per label list seen, keyword results memoized,
+    # a known (labels, keyword) pair is a dict lookup (no tokenization, no intersection).
+    def __init__(self, max_label_sets=4):
+        self.max_label_sets = max_label_sets
+        self.indexes = OrderedDict()  # tuple(str(label)) → (TokenIndex, {keyword: [(idx, label), ...]})
+
+    # OUTPUT: same as BaseExtract.get_matching_columns
+    def get_matching_columns(self, columns, keywords):
+        key = tuple(str(c) for c in columns)
+        entry = self.indexes.get(key)
+        if entry is None:
+            entry = (TokenIndex(columns), {})
+            self.indexes[key] = entry
+            while len(self.indexes) > self.max_label_sets:
+                self.indexes.popitem(last=False)
+        else:
+            self.indexes.move_to_end(key)
+
+        index, known = entry
+        matched = {}
+        for kw in keywords:
+            if kw not in matched:
+                hits = known.get(kw)
+                if hits is None:
+                    hits = known[kw] = [(i, index.labels[i]) for i in index.lookup(kw)]
+                matched[kw] = list(hits)
+        multiple_matches = [kw for kw, matches in matched.items() if len(matches) > 1]
+        return matched, multiple_matches
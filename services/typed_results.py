@@ -0,0 +1,131 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from .thresholds import EMPTY, NUMBER, LQ, TEXT
+
+try:
+    import pyarrow  # optional : Parquet output only when installed
+except ImportError:
+    pyarrow = None
+
+# === Script : TYPED GEOCHEM RESULTS - NUMBERS, LQ FLAG, LQ BOUND AND UNIT INSTEAD OF "<LQ (<0,05)" STRINGS ===
+# Built from the extractor arrays (BaseExtract.resultats, ResultStore.parsed_column : values before the LQ
+# formatting, each distinct text parsed once).
+#   long : "Nom échantillon" | "Paramètre" | "Valeur" | "LQ" | "Limite LQ" | "Texte" | "Unité", one row per
+#          analysed cell (empty cells = not analysed, skipped), samples in extraction order, parameters in ordre_colonnes
+#   wide : "Nom échantillon" | "<param> | valeur" | "<param> | LQ" | "<param> | limite LQ" | "<param> | texte"
+#          | "<param> | unité" ...
+# Texte : cell text when it is neither a number nor an LQ ("n.a.", comments), empty otherwise : such a cell has no
+# value and LQ = False, the text tells it apart from an empty cell.
+# Unit : last parenthesis of the label that looks like a unit ("Toluène - (mg/kg M.S.)" → "mg/kg M.S."), or a final
+# "%" ; label of the first candidate for "kw → all" items, first member with a unit for groups.
+#
+
+TYPED_SHAPES = ("long", "wide")
+TYPED_FORMATS = ("xlsx", "csv", "parquet")
+UNIT_PATTERN = re.compile(r"\(([^()]*)\)\s*$")
+UNIT_HINT = re.compile(r"/|%|^\s*[mµunk]?g\b", re.IGNORECASE)
+
+
+def label_unit(label):
+    if not isinstance(label, str):
+        return ""
+    match = UNIT_PATTERN.search(label.strip())
+    if match and UNIT_HINT.search(match.group(1)):
+        return match.group(1).strip()
+    return "%" if label.strip().endswith("%") else ""
+
+
+# INPUT:
+#   item (str): "kw → (idx, nom)", "kw → all" or "kw".
+#   correspondances_input (dict[str, list[tuple[int, str]]]): "→ all" candidates.
+# OUTPUT:
+#   str: unit of the label the item reads ("" if unknown).
+def item_unit(item, correspondances_input):
+    match = re.search(r"→\s*\(\d+,\s*(.+)\)\s*$", item)
+    if match:
+        return label_unit(match.group(1))
+    candidates = correspondances_input.get(item.strip(), [])
+    return label_unit(candidates[0][1]) if candidates else ""
+
+
+# INPUT:
+#   sample_names (list[str]): samples in extraction order.
+#   columns (list[str]): output columns (keywords and group names) in export order.
+#   parsed (dict[str, tuple]): (state, values, lq_bound) per column, see thresholds.parse_result_column.
+#   units (dict[str, str]): unit per column.
+#   shape (str): "long" or "wide".
+#   texts (dict[str, np.ndarray] | None): cell text per column (ResultStore.text_column), for the TEXT cells.
+# OUTPUT:
+#   pd.DataFrame: typed frame (float values, bool LQ flags, float LQ bounds, text of the TEXT cells,
+#                 categorical units / parameters).
+def typed_frame(sample_names, columns, parsed, units, shape="long", texts=None):
+    if shape not in TYPED_SHAPES:
+        raise ValueError(f"Format de sortie inconnu : {shape} (attendu : {', '.join(TYPED_SHAPES)})")
+    names = np.asarray(sample_names, dtype=object)
+    texts = texts or {}
+
+    def text_cells(col, state):
+        out = np.full(len(state), "", dtype=object)
+        is_text = state == TEXT
+        if col in texts:
+            out[is_text] = [str(t).strip() for t in np.asarray(texts[col], dtype=object)[is_text].tolist()]
+        return out
+
+    if shape == "wide":
+        data = {"Nom échantillon": names}
+        for col in columns:
+            state, values, bounds = parsed[col]
+            data[f"{col} | valeur"] = np.where(state == NUMBER, values, np.nan)
+            data[f"{col} | LQ"] = state == LQ
+            data[f"{col} | limite LQ"] = bounds
+            data[f"{col} | texte"] = text_cells(col, state)
+            data[f"{col} | unité"] = pd.Categorical([units.get(col, "")] * len(names))
+        return pd.DataFrame(data)
+
+    sample_pos, param_pos, values, lq, bounds, cell_texts = [], [], [], [], [], []
+    for p, col in enumerate(columns):
+        state, col_values, col_bounds = parsed[col]
+        rows = np.flatnonzero(state != EMPTY)
+        sample_pos.append(rows)
+        param_pos.append(np.full(len(rows), p, dtype=np.intp))
+        values.append(np.where(state[rows] == NUMBER, col_values[rows], np.nan))
+        lq.append(state[rows] == LQ)
+        bounds.append(col_bounds[rows])
+        cell_texts.append(text_cells(col, state)[rows])
+
+    if not columns:
+        return pd.DataFrame(columns=["Nom échantillon", "Paramètre", "Valeur", "LQ", "Limite LQ", "Texte", "Unité"])
+    sample_pos, param_pos = np.concatenate(sample_pos), np.concatenate(param_pos)
+    order = np.lexsort((param_pos, sample_pos))  # sample-major, parameters in export order
+    param_pos = param_pos[order]
+    unit_codes = [units.get(col, "") for col in columns]
+    return pd.DataFrame({
+        "Nom échantillon": names[sample_pos[order]],
+        "Paramètre": pd.Categorical.from_codes(param_pos, categories=pd.Index(columns, dtype=object)),
+        "Valeur": np.concatenate(values)[order],
+        "LQ": np.concatenate(lq)[order],
+        "Limite LQ": np.concatenate(bounds)[order],
+        "Texte": np.concatenate(cell_texts)[order],
+        "Unité": pd.Categorical(np.asarray(unit_codes, dtype=object)[param_pos]),
+    })
+
+
+# INPUT:
+#   df (pd.DataFrame): typed_frame output.
+#   output_path (str): destination, extension matching fmt.
+#   fmt (str): "xlsx", "csv" (UTF-8, "." decimals) or "parquet" (needs pyarrow).
+def write_typed(df, output_path, fmt):
+    if fmt == "xlsx":
+        df.to_excel(output_path, index=False)
+    elif fmt == "csv":
+        df.to_csv(output_path, index=False, encoding="utf-8")
+    elif fmt == "parquet":
+        if pyarrow is None:
+            raise ValueError("Sortie Parquet indisponible : installer pyarrow")
+        df.to_parquet(output_path, index=False)
+    else:
+        raise ValueError(f"Format de fichier inconnu : {fmt} (attendu : {', '.join(TYPED_FORMATS)})")
+    return output_path
@@ -0,0 +1,105 @@
+import io
+
+import numpy as np
+import openpyxl
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+# === Script : LAZY WORKBOOK READER (OPENPYXL READ-ONLY) - LABELS AND SHEET LIST WITHOUT LOADING THE SHEET ===
+# /extract-geochem only needs the label row (param_row, "colonnes") or the label column (param_col, "lignes").
+# Cells are converted like pd.read_excel(header=None) : empty / error / pandas NA strings → NaN,
+# integral numbers → int. Positions are absolute (row / column index in the sheet, 0-indexed).
+# Numeric labels are not upcast by the dtype of their column (pandas would read 12 as 12.0 in a float column),
+# trailing empty cells may differ in count when the declared dimension is wrong : neither changes keyword matches.
+#
+
+# Default na_values of pd.read_excel
+PANDAS_NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+
+def _open(file_bytes):
+    return openpyxl.load_workbook(io.BytesIO(file_bytes), read_only=True, data_only=True, keep_links=False)
+
+
+def convert_cell(cell):
+    value = cell.value
+    if value is None or cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        as_int = int(value)
+        return as_int if as_int == value else float(value)
+    if isinstance(value, str) and value in PANDAS_NA_STRINGS:
+        return np.nan
+    return value
+
+
+# OUTPUT:
+#   list[dict]: {"name", "max_row", "max_column", "dimensions"} per sheet, from the <dimension> declared in each
+#               sheet (no cell is read, None when the workbook does not declare it).
+def workbook_metadata(file_bytes):
+    wb = _open(file_bytes)
+    try:
+        sheets = []
+        for ws in wb.worksheets:
+            max_row, max_column = ws.max_row, ws.max_column
+            sheets.append({
+                "name": ws.title,
+                "max_row": max_row,
+                "max_column": max_column,
+                "dimensions": ws.calculate_dimension() if max_row and max_column else None,
+            })
+        return sheets
+    finally:
+        wb.close()
+
+
+# INPUT:
+#   row (int): 0-indexed row (param_row). Rows after it are never parsed.
+# OUTPUT:
+#   list: converted cells of the row, from column A.
+def read_label_row(file_bytes, sheet_name, row):
+    wb = _open(file_bytes)
+    try:
+        ws = wb[sheet_name]
+        width = ws.max_column or 0
+        ws.reset_dimensions()  # declared dimension can be wrong, same as pandas
+        values = []
+        for cells in ws.iter_rows(min_row=row + 1, max_row=row + 1):
+            values = [convert_cell(c) for c in cells]
+        # Padded to the declared width, like the empty cells of a DataFrame row
+        return values + [np.nan] * (width - len(values))
+    finally:
+        wb.close()
+
+
+# INPUT:
+#   col (int): 0-indexed column (param_col).
+#   start_row (int): first 0-indexed row returned (positions stay absolute, earlier rows are skipped).
+# OUTPUT:
+#   list: converted cells of the column from start_row to the last row of the sheet.
+def read_label_column(file_bytes, sheet_name, col, start_row=0):
+    wb = _open(file_bytes)
+    try:
+        ws = wb[sheet_name]
+        ws.reset_dimensions()
+        values = []
+        for cells in ws.iter_rows(min_row=start_row + 1, min_col=col + 1, max_col=col + 1):
+            values.append(convert_cell(cells[0]) if cells else np.nan)
+        return values
+    finally:
+        wb.close()
+
+
+# INPUT:
+#   n_rows, n_cols (int): size of the top-left block (layout fingerprint).
+# OUTPUT:
+#   list[list]: converted cells, rows shorter than n_cols when the sheet is narrower.
+def read_block(file_bytes, sheet_name, n_rows, n_cols):
+    wb = _open(file_bytes)
+    try:
+        ws = wb[sheet_name]
+        return [[convert_cell(c) for c in cells] for cells in ws.iter_rows(max_row=n_rows, max_col=n_cols)]
+    finally:
+        wb.close()
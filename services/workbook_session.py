@@ -0,0 +1,165 @@
+import io
+import time
+import shutil
+import tempfile
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .workbook_reader import workbook_metadata, read_label_row, read_label_column, read_block
+from .layout_profiles import FINGERPRINT_ROWS, FINGERPRINT_COLS, header_fingerprint
+
+# === Script : GEOCHEM WORKBOOK SESSIONS - PARSE ONCE, REUSE FOR EVERY CALL ===
+# The UI calls /extract-geochem, /randomize-geochem (many times), /preview-geochem and /export-geochem
+# on the same workbook. A session keeps the uploaded bytes and every sheet already parsed
+# (pd.read_excel header=None, one DataFrame per sheet, never modified), keyed by the content hash.
+# Eviction : least recently used above max_sessions, and sessions idle for more than ttl seconds.
+#
+# session_id = sha256 of the workbook : re-uploading the same file lands in the same session.
+# Export files are written to one temp directory per session (created on first export), deleted with the session.
+# Labels and sheet list are read lazily (openpyxl read-only) until a sheet is really needed.
+# Parity with pd.read_excel : tests/test_workbook_session.py, timings : benchmarks/workbook_session.py
+#
+
+
+def workbook_hash(file_bytes):
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+class WorkbookSession:
+    def __init__(self, session_id, file_bytes, filename=None):
+        self.session_id = session_id
+        self.file_bytes = file_bytes
+        self.filename = filename
+        self.frames = {}  # sheet_name → pd.DataFrame parsed once (read only by the extractors)
+        self.metadata = None
+        self.fingerprints = {}  # sheet_name → header layout fingerprint (layout_profiles)
+        self.lock = threading.Lock()
+        self.last_access = time.monotonic()
+        self.work_dir = None
+
+    # OUTPUT:
+    #   str: temp directory of the session (export outputs, selection JSON), created on first call.
+    def get_work_dir(self):
+        with self.lock:
+            if self.work_dir is None:
+                self.work_dir = tempfile.mkdtemp(prefix="geochem_session_")
+            return self.work_dir
+
+    def cleanup(self):
+        with self.lock:
+            work_dir, self.work_dir = self.work_dir, None
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    # INPUT:
+    #   sheet_name (str): sheet to read, parsed on first request only.
+    # OUTPUT:
+    #   pd.DataFrame: pd.read_excel(..., header=None), parsed on first call and shared between calls
+    #                 (never modified in place).
+    def get_dataframe(self, sheet_name):
+        with self.lock:
+            df = self.frames.get(sheet_name)
+            if df is None:
+                df = pd.read_excel(io.BytesIO(self.file_bytes), sheet_name=sheet_name, header=None)
+                self.frames[sheet_name] = df
+        return df
+
+    # OUTPUT:
+    #   list[dict]: sheet names and declared dimensions (see workbook_reader.workbook_metadata).
+    def get_metadata(self):
+        with self.lock:
+            if self.metadata is None:
+                self.metadata = workbook_metadata(self.file_bytes)
+        return self.metadata
+
+    # INPUT:
+    #   axis (str): "columns" → label row `index`, "rows" → label column `index` (from the first row).
+    # OUTPUT:
+    #   list: labels at absolute positions, from the parsed sheet if already loaded, otherwise read lazily.
+    def get_labels(self, sheet_name, axis, index):
+        with self.lock:
+            df = self.frames.get(sheet_name)
+        if df is not None:
+            return df.iloc[index].tolist() if axis == "columns" else df.iloc[:, index].tolist()
+        if axis == "columns":
+            return read_label_row(self.file_bytes, sheet_name, index)
+        return read_label_column(self.file_bytes, sheet_name, index)
+
+
+    # OUTPUT:
+    #   str: header_fingerprint of the top-left block, from the parsed sheet if already loaded, otherwise read lazily.
+    def get_fingerprint(self, sheet_name):
+        with self.lock:
+            fingerprint = self.fingerprints.get(sheet_name)
+            df = self.frames.get(sheet_name)
+        if fingerprint is None:
+            if df is not None:
+                block = df.iloc[:FINGERPRINT_ROWS, :FINGERPRINT_COLS].to_numpy(dtype=object).tolist()
+            else:
+                block = read_block(self.file_bytes, sheet_name, FINGERPRINT_ROWS, FINGERPRINT_COLS)
+            fingerprint = header_fingerprint(block)
+            with self.lock:
+                self.fingerprints[sheet_name] = fingerprint
+        return fingerprint
+
+
+class WorkbookSessionStore:
+    def __init__(self, max_sessions=8, ttl=1800):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    # OUTPUT:
+    #   list[WorkbookSession]: sessions removed, their directories are deleted by the caller (outside the lock).
+    def _evict(self):
+        now = time.monotonic()
+        evicted = []
+        for session_id in [sid for sid, s in self.sessions.items() if now - s.last_access > self.ttl]:
+            evicted.append(self.sessions.pop(session_id))
+        while len(self.sessions) > self.max_sessions:
+            evicted.append(self.sessions.popitem(last=False)[1])
+        return evicted
+
+    # INPUT:
+    #   file_bytes (bytes): uploaded workbook.
+    #   filename (str | None): original name, kept for the export file name.
+    # OUTPUT:
+    #   WorkbookSession: existing session for the same content, or a new one.
+    def open(self, file_bytes, filename=None):
+        session_id = workbook_hash(file_bytes)
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = WorkbookSession(session_id, file_bytes, filename)
+                self.sessions[session_id] = session
+            self.sessions.move_to_end(session_id)
+            session.last_access = time.monotonic()
+            evicted = self._evict()
+        for old in evicted:
+            old.cleanup()
+        return session
+
+    # OUTPUT:
+    #   WorkbookSession | None: None if unknown or expired.
+    def get(self, session_id):
+        with self.lock:
+            evicted = self._evict()
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+                session.last_access = time.monotonic()
+        for old in evicted:
+            old.cleanup()
+        return session
+
+    def close(self, session_id):
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.cleanup()
+        return True
@@ -0,0 +1,115 @@
+import io
+import json
+import random
+
+import fitz
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+# Pressiometer log sheets : borehole name header, Pf* / Pl* / Module columns (combined Pf*/Pl* column every
+# `combined_every` pages), values every 20 pts with a few gaps, noise columns on the left.
+# From page `drift_from` on, the value columns (headers and values) are moved right by `drift` pts.
+def make_pressio_pdf(n_pages=12, combined_every=4, seed=1, drift_from=None, drift=60):
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for p in range(n_pages):
+        page = doc.new_page(width=595, height=842)
+        name = f"SP{p // 3 + 1}" if p % 7 != 6 else f"PR{p}"
+        page.insert_text((60, 40), "Sondage", fontsize=9)
+        page.insert_text((110, 40), name, fontsize=9)
+        combined = p % combined_every == combined_every - 1
+        dx = drift if drift_from is not None and p >= drift_from else 0
+        page.insert_text((300 + dx, 100), "Pf*", fontsize=8)
+        page.insert_text((305 + dx, 110) if combined else (350 + dx, 100), "Pl*", fontsize=8)
+        page.insert_text((420 + dx, 100), "Module", fontsize=8)
+        y = 170
+        for i in range(25):
+            if rng.random() < 0.05:
+                y += 20
+            pf = round(rng.uniform(0.1, 2), 2)
+            pl = round(pf + rng.uniform(0.1, 2), 2)
+            if combined:
+                page.insert_text((302 + dx, y), f"{pl if i % 2 else pf}".replace(".", ","), fontsize=7)
+                page.insert_text((302 + dx, y + 8), f"{pf if i % 2 else pl}".replace(".", ","), fontsize=7)
+            else:
+                page.insert_text((302 + dx, y), f"{pf}", fontsize=7)
+                page.insert_text((352 + dx, y), f"{pl}", fontsize=7)
+            page.insert_text((425 + dx, y), f"{round(rng.uniform(1, 90), 1)}", fontsize=7)
+            for k in range(6):
+                page.insert_text((20 + k * 45, y), f"{rng.randint(1, 999)}x", fontsize=6)
+            y += 24 if combined else 20
+    return doc.tobytes()
+
+
+@pytest.fixture(scope="session")
+def pressio_pdf():
+    return make_pressio_pdf()
+
+
+@pytest.fixture(scope="session")
+def pressio_pdf_factory():
+    return make_pressio_pdf
+
+
+@pytest.fixture
+def geotech_client():
+    from routes import extract_geotech
+
+    extract_geotech.pressio_page_cache.clear()
+    app = FastAPI()
+    app.include_router(extract_geotech.router)
+    return TestClient(app)
+
+
+# Lab results workbook, sheet "Data" : title line, labels on line 2 (B2...), samples from A3, values with LQ
+# ("<0,05"), "n.d." and empty cells.
+def make_geochem_workbook(n_samples=30, n_params=12, seed=0):
+    rng = random.Random(seed)
+    names = [f"Param{i} - (mg/kg M.S.)" for i in range(n_params)]
+    names[:6] = ["Naphtalène - (mg/kg M.S.)", "Benzo(a)pyrène - (mg/kg M.S.)", "Toluène - (mg/kg M.S.)",
+                 "Benzène - (mg/kg M.S.)", "Plomb (Pb) - (mg/kg M.S.)", "Matière sèche %"]
+    rows = [["Rapport labo"] + [None] * n_params, ["Code"] + names]
+    for s in range(n_samples):
+        values = []
+        for _ in range(n_params):
+            r = rng.random()
+            values.append("<0,05" if r < 0.2 else "n.d." if r < 0.25 else None if r < 0.3 else round(rng.uniform(0, 50), 3))
+        rows.append([f"S{s}"] + values)
+    buffer = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buffer, sheet_name="Data", header=False, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session")
+def geochem_workbook():
+    return make_geochem_workbook()
+
+
+@pytest.fixture
+def geochem_form():
+    # /export-geochem and /preview-geochem form for the "Colonnes" layout of make_geochem_workbook
+    selection = {
+        "keywords_valides": ["naphtalene → all", "toluene → (3, Toluène - (mg/kg M.S.))", "plomb → all"],
+        "groupes_personnalises": {"BTEX": ["benzene → all", "toluene → all"]},
+    }
+    selection["ordre_selection"] = selection["keywords_valides"] + ["BTEX"]
+    return {
+        "extraction_type": "Colonnes",
+        "sheet_name": "Data",
+        "config_json": json.dumps({"cell_nom_echantillon": "A3", "cell_parametres": "B2", "cell_data_start": "B3"}),
+        "selection_json": json.dumps(selection),
+    }
+
+
+@pytest.fixture
+def geochem_client():
+    from routes import extract_geochem
+
+    for session_id in list(extract_geochem.workbook_sessions.sessions):
+        extract_geochem.workbook_sessions.close(session_id)
+    app = FastAPI()
+    app.include_router(extract_geochem.router)
+    return TestClient(app)
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from services.borehole_names import identifier_pattern, identifiers_key, detect_borehole_name
+
+
+def words(*texts):
+    return [{"text": t} for t in texts]
+
+
+def test_families_and_literal_prefixes():
+    pattern = identifier_pattern(["SP", "PZ", "F-"])
+    assert detect_borehole_name(words("Sondage", "SP12"), pattern) == "SP12"
+    assert detect_borehole_name(words("PZ3"), pattern) == "PZ3"
+    assert detect_borehole_name(words("F-101"), pattern) == "F-101"
+    assert detect_borehole_name(words("SP12345", "PZ", "Fx101"), pattern) is None
+
+
+def test_user_identifiers_are_escaped():
+    pattern = identifier_pattern(["S.P", "F\\d{2}[A-Z]", "(a+)+$"])
+    assert detect_borehole_name(words("S.P1"), pattern) == "S.P1"
+    assert detect_borehole_name(words("SxP1", "F12A"), pattern) is None
+
+
+def test_single_string_is_one_identifier():
+    assert identifiers_key("PR") == ("PR",)
+    assert identifier_pattern("PR").fullmatch("PR7")
+    assert not identifier_pattern("PR").fullmatch("P7")
+
+
+@pytest.mark.parametrize("identifiers", [[""], [3], [None], {"SP": 1}, 12])
+def test_invalid_identifiers_raise_value_error(identifiers):
+    with pytest.raises(ValueError):
+        identifier_pattern(identifiers)
+
+
+def test_routes_reject_invalid_identifiers(geotech_client, pressio_pdf):
+    response = geotech_client.post("/extract-pressio", files={"pdf": ("s.pdf", pressio_pdf)},
+                                   data={"identifiers_json": json.dumps([""])})
+    assert response.status_code == 400
+    config = {"mode": "global", "config": {"start": 0, "end": 1, "step": 0.5}, "pressio": ["SP1"], "identifiers": [7]}
+    for path in ("/process-pressio", "/process-pressio-stream"):
+        response = geotech_client.post(path, files={"pdf": ("s.pdf", pressio_pdf)}, data={"config": json.dumps(config)})
+        assert response.status_code == 400
+    response = geotech_client.post("/extract-pressio", files={"pdf": ("s.pdf", pressio_pdf)},
+                                   data={"identifiers_json": json.dumps("SP")})
+    assert response.status_code == 200
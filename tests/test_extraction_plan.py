@@ -0,0 +1,68 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.analysis_extract import ColumnsExtract, RowsExtract
+from services.extract_utils import values_lq_or_none
+from services.extraction_plan import ExtractionPlan
+
+
+def make_sheet(n_samples, n_params, seed):
+    rng = random.Random(seed)
+    labels = [f"Param {i} - (mg/kg M.S.)" for i in range(n_params)]
+    pool = ["<0,05", "n.d.", "-", " ", "", None, "1,5"]
+    rows = [["Code"] + labels]
+    for s in range(n_samples):
+        rows.append([f"S{s}"] + [rng.choice(pool) if rng.random() < 0.5 else round(rng.uniform(0, 50), 3)
+                                 for _ in range(n_params)])
+    return pd.DataFrame(rows).infer_objects(), labels
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_gather_matches_extract_values(seed):
+    n_samples, n_params = 60, 25
+    df, labels = make_sheet(n_samples, n_params, seed)
+    extractor = ColumnsExtract(None, None, "Data", col_config={"nom_row": 1, "nom_col": 0, "param_row": 0})
+    noms_reference = list(df.iloc[0])
+    correspondances = {
+        "param → all": [(i + 1, labels[i]) for i in range(n_params)],
+        "rare → all": [(n_params, labels[-1]), (3, labels[2]), (n_params + 5, "hors feuille")],
+        "vide → all": [],
+    }
+    items = ([f"p{i} → ({i + 1}, {labels[i]})" for i in range(n_params)]
+             + list(correspondances) + ["absent → all", f"nom → {labels[4]}", "inconnu → Pas un libellé",
+                                        f"hors → ({n_params + 3}, x)", "neg → (-1, x)", "sans fleche"])
+    sample_idx = np.arange(1, n_samples + 1)
+
+    expected = {item: [extractor.extract_values(item, df, noms_reference, correspondances, "columns", idx=int(r))
+                       for r in sample_idx] for item in items}
+    raw = ExtractionPlan(items, correspondances, noms_reference, df.shape[1]).gather(df.to_numpy(dtype=object),
+                                                                                     sample_idx)
+    assert list(raw) == items
+    assert {item: [values_lq_or_none(v) for v in col] for item, col in raw.items()} == expected
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_rows_layout_matches_transposed_columns(seed):
+    # Wide lab export (one column per sample) : RowsExtract on the transposed sheet gives the ColumnsExtract frame
+    df, labels = make_sheet(40, 20, seed)
+    layouts = {
+        "colonnes": (ColumnsExtract, df, {"nom_row": 1, "nom_col": 0, "param_row": 0}),
+        "lignes": (RowsExtract, pd.DataFrame(df.to_numpy(dtype=object).T).infer_objects(),
+                   {"nom_row": 0, "param_col": 0, "param_row": 1, "data_start_col": 1}),
+    }
+    selection = {
+        "keywords_valides": ["param → all"] + [f"p{i} → ({i + 1}, {labels[i]})" for i in range(3, 20)],
+        "groupes_personnalises": {"Somme": ["p0 → (1, Param 0 - (mg/kg M.S.))", "p1 → (2, Param 1 - (mg/kg M.S.))"]},
+    }
+    frames = {}
+    for mode, (cls, sheet, config) in layouts.items():
+        extractor = cls(None, None, "Data", config)
+        extractor.load_selection(selection)
+        extractor.df = sheet
+        extractor.extract()
+        frames[mode] = extractor.export_frame()
+    assert len(frames["colonnes"]) == 40
+    assert frames["lignes"].equals(frames["colonnes"])
@@ -0,0 +1,97 @@
+import json
+import random
+
+import pytest
+
+from routes import extract_geochem
+from services.fuzzy_index import FuzzyTokenIndex, bounded_levenshtein
+from services.layout_profiles import LayoutProfileStore
+from services.token_index import TokenIndex
+
+VOCAB = ["benzo", "pyrène", "fluoranthène", "naphtalène", "toluène", "xylène", "plomb", "cuivre", "chrome",
+         "mercure", "cadmium", "arsenic", "hydrocarbures", "aliphatique", "aromatique", "fraction", "total",
+         "lixiviation", "éluat", "chlorures", "sulfates", "fluorures", "phénol", "indice", "carbone", "organique"]
+UNITS = ["- (mg/kg M.S.)", "- (µg/l)", "(mg/kg MS)", ""]
+
+
+def make_case(seed, n_labels=400, n_keywords=80):
+    rng = random.Random(seed)
+    labels = [" ".join(rng.sample(VOCAB, rng.randint(1, 3))) + f" C{rng.randint(5, 40)} {rng.choice(UNITS)}"
+              for _ in range(n_labels)]
+
+    def typo(word):
+        i = rng.randrange(len(word))
+        return rng.choice([word[:i] + word[i + 1:], word[:i] + rng.choice("aeilnorst") + word[i + 1:]])
+
+    keywords, sans_faute = [], []
+    for _ in range(n_keywords):
+        words = rng.sample(VOCAB, rng.randint(1, 2))
+        keywords.append(" ".join(typo(w) if len(w) > 7 and rng.random() < 0.5 else w for w in words))
+        sans_faute.append(" ".join(words))
+    return labels, keywords, sans_faute
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_exact_matches_found_with_full_score(seed):
+    labels, keywords, sans_faute = make_case(seed)
+    exact, _ = TokenIndex(labels).match(keywords + sans_faute)
+    ranked, _ = FuzzyTokenIndex(labels).match(keywords + sans_faute)
+    for kw, hits in exact.items():
+        scores = {i: score for i, _, score in ranked[kw]}
+        assert all(scores.get(i) == 1.0 for i, _ in hits), kw
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_typos_found_again(seed):
+    labels, keywords, sans_faute = make_case(seed)
+    expected, _ = TokenIndex(labels).match(sans_faute)
+    ranked, _ = FuzzyTokenIndex(labels).match(keywords)
+    for kw, ref in zip(keywords, sans_faute):
+        assert {i for i, _ in expected[ref]} <= {i for i, _, _ in ranked[kw]}, (kw, ref)
+
+
+def test_digit_tokens_match_exactly():
+    labels = ["HCT C10-C40 - (mg/kg M.S.)", "HCT C12-C16 - (mg/kg M.S.)", "PCB 28", "PCB 52"]
+    ranked, multiple = FuzzyTokenIndex(labels).match(["hct c10", "pcb 28", "PCB"])
+    assert [i for i, _, _ in ranked["hct c10"]] == [0]
+    assert [i for i, _, _ in ranked["pcb 28"]] == [2]
+    assert multiple == ["PCB"]
+
+
+def test_bounded_levenshtein():
+    assert bounded_levenshtein("napthalene", "naphtalene", 2) == 2
+    assert bounded_levenshtein("plomb", "plomb", 1) == 0
+    assert bounded_levenshtein("cuivre", "chrome", 1) == 2
+
+
+def extract(client, workbook, form, **options):
+    data = {"keywords_json": json.dumps(["naphtalne", "mg/kg", "plomb"]), "extraction_type": "Colonnes",
+            "config_json": form["config_json"], "sheet_name": "Data", **options}
+    return client.post("/extract-geochem", files={"excel": ("geo.xlsx", workbook)}, data=data)
+
+
+@pytest.mark.parametrize("min_score", ["-0.1", "1.5", "nan"])
+def test_min_score_out_of_range_rejected(geochem_client, geochem_workbook, geochem_form, min_score):
+    response = extract(geochem_client, geochem_workbook, geochem_form, fuzzy="true", min_score=min_score)
+    assert response.status_code == 400
+
+
+def test_fuzzy_keeps_ambiguity_and_notices_profile(geochem_client, geochem_workbook, geochem_form, tmp_path,
+                                                  monkeypatch):
+    monkeypatch.setattr(extract_geochem, "layout_profiles", LayoutProfileStore(str(tmp_path / "profiles.json")))
+    body = extract(geochem_client, geochem_workbook, geochem_form, fuzzy="true").json()
+    assert "mg/kg" in body["multiple_matches"] and "naphtalne" not in body["multiple_matches"]
+    assert not any(item.endswith("→ all") for item in body["input_zone_gauche"])
+    assert body["notice"] is None and body["profile_used"] is False
+
+    response = geochem_client.post("/geochem-profiles", data={
+        "session_id": body["session_id"], "sheet_name": "Data", "extraction_type": "Colonnes",
+        "config_json": geochem_form["config_json"], "keywords_json": "[]",
+        "selection_json": geochem_form["selection_json"], "name": "Labo test"})
+    assert response.status_code == 200
+
+    exact = extract(geochem_client, geochem_workbook, geochem_form).json()
+    assert exact["profile_used"] is True and exact["notice"] is None
+    fuzzy = extract(geochem_client, geochem_workbook, geochem_form, fuzzy="true").json()
+    assert fuzzy["profile"] == "Labo test" and fuzzy["profile_used"] is False
+    assert "Labo test" in fuzzy["notice"]
@@ -0,0 +1,43 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from routes import extract_geochem
+from routes.extract_geochem import batch_workers
+
+
+def test_batch_workers_capped(monkeypatch):
+    monkeypatch.setattr(extract_geochem, "GEOCHEM_BATCH_WORKERS", 3)
+    monkeypatch.setattr(extract_geochem.os, "cpu_count", lambda: 2)
+    assert batch_workers(None, 10) == 2
+    assert batch_workers(10000, 10) == 2
+    assert batch_workers(10000, 1) == 1
+    assert batch_workers(0, 10) == 2
+    assert batch_workers(-5, 10) == 1
+    monkeypatch.setattr(extract_geochem.os, "cpu_count", lambda: 64)
+    assert batch_workers(10000, 10) == 3
+
+
+def test_batch_pool_size_is_capped(geochem_client, geochem_workbook, geochem_form, tmp_path, monkeypatch):
+    started = []
+
+    class RecordingPool(ProcessPoolExecutor):
+        def __init__(self, max_workers=None):
+            started.append(max_workers)
+            super().__init__(max_workers=max_workers)
+
+    monkeypatch.setattr(extract_geochem, "BATCH_OUTPUT_DIR", str(tmp_path))
+    monkeypatch.setattr(extract_geochem, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(extract_geochem, "GEOCHEM_BATCH_WORKERS", 2)
+    monkeypatch.setattr(extract_geochem.os, "cpu_count", lambda: 2)
+    form = {key: geochem_form[key] for key in ("extraction_type", "config_json", "selection_json")}
+    files = [("files", (f"lot{i}.xlsx", geochem_workbook)) for i in range(3)]
+    response = geochem_client.post("/batch-geochem", files=files, data={**form, "workers": "10000"})
+    assert response.status_code == 200
+    done = [json.loads(line) for line in response.text.splitlines()][-1]
+    assert started == [2]
+    assert done["type"] == "done" and done["files"] == 3 and done["errors"] == 0
+    merged = pd.read_excel(os.path.join(tmp_path, done["output_file"]))
+    assert sorted(merged["Fichier source"].unique()) == ["lot0.xlsx", "lot1.xlsx", "lot2.xlsx"]
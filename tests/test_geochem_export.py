@@ -0,0 +1,61 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from routes.extract_geochem import PREVIEW_SAMPLES
+from services.extract_utils import replace_lq_values
+from tests.conftest import make_geochem_workbook
+
+ND = {"n.d.", "n.d", "nd", "-", "n.d,", "n.d.."}
+
+
+def replace_lq_cellwise(df, replacement):
+    # Former behaviour : every cell tested
+    return df.map(lambda v: replacement if isinstance(v, str) and (
+        v.strip().lower().startswith("<") or v.strip().lower() in ND) else v)
+
+
+def rewrite(df):
+    # Former export : file read back, replaced, written again with to_excel(index=False)
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return pd.read_excel(io.BytesIO(buffer.getvalue()))
+
+
+def export(client, form, workbook, **extra):
+    response = client.post("/export-geochem", files={"excel": ("r.xlsx", workbook)}, data={**form, **extra})
+    assert response.status_code == 200, response.text
+    return pd.read_excel(io.BytesIO(response.content))
+
+
+def test_replace_lq_values_matches_cellwise():
+    df = pd.DataFrame({
+        "a": ["<LQ (<0,05)", " N.D. ", "12.5", None, np.nan, "-", "<LQ"],
+        "b": [1.5, 2, np.nan, 4, 5, 6, 7],
+        "c": ["n.d,", "texte", "<0.1", "", "nd", "n.d..", "ND"],
+    })
+    for replacement in ("0", "", "-1", "LQ"):
+        pd.testing.assert_frame_equal(replace_lq_values(df, replacement), replace_lq_cellwise(df, replacement))
+
+
+@pytest.mark.parametrize("replacement", ["0", "LQ"])
+def test_export_with_replacement_matches_former_behaviour(geochem_client, geochem_form, geochem_workbook,
+                                                          replacement):
+    plain = export(geochem_client, geochem_form, geochem_workbook)
+    expected = rewrite(replace_lq_cellwise(plain, replacement))
+    assert not expected.equals(plain)
+    result = export(geochem_client, geochem_form, geochem_workbook, replace_lq_with=replacement)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_preview_truncated_to_preview_samples(geochem_client, geochem_form):
+    workbook = make_geochem_workbook(n_samples=40)
+    response = geochem_client.post("/preview-geochem", files={"excel": ("r.xlsx", workbook)}, data=geochem_form)
+    assert response.status_code == 200
+    rows = response.json()["preview_resultats"]
+    assert len(rows) == PREVIEW_SAMPLES
+    full = export(geochem_client, geochem_form, workbook)
+    assert len(full) == 40
+    assert [r["index"] for r in rows] == full["Nom échantillon"].head(PREVIEW_SAMPLES).tolist()
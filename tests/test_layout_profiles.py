@@ -0,0 +1,43 @@
+import os
+import random
+
+from routes import extract_geochem
+from services.layout_profiles import LayoutProfileStore, header_fingerprint, stale_selection_items
+
+LABELS = ["Plomb (Pb) - (mg/kg M.S.)", "Cuivre - (mg/kg M.S.)", "Benzène - (mg/kg M.S.)"]
+
+
+def batch(prefix, lab="Eurofins", seed=0):
+    rng = random.Random(seed)
+    rows = [["Rapport d'analyse", None, lab], ["Code"] + LABELS]
+    for s in range(20):
+        rows.append([f"{prefix}{s}"] + [rng.choice(["<0,05", "n.d.", round(rng.uniform(0, 50), 3)]) for _ in LABELS])
+    return rows
+
+
+def test_fingerprint_ignores_samples_and_values():
+    first = header_fingerprint(batch("S", seed=1))
+    assert header_fingerprint(batch("SC-", seed=2)) == first
+    assert header_fingerprint(batch("S", lab="Agrolab")) != first
+
+
+def test_stale_selection_items():
+    labels = ["Code"] + LABELS
+    selection = {"keywords_valides": ["plomb → (1, Plomb (Pb) - (mg/kg M.S.))", "cuivre → all"],
+                 "groupes_personnalises": {"BTEX": ["benzene → (2, Benzène - (mg/kg M.S.))", "x → (9, absent)"]}}
+    assert stale_selection_items(selection, labels) == ["benzene → (2, Benzène - (mg/kg M.S.))", "x → (9, absent)"]
+
+
+def test_store_saves_and_reloads(tmp_path):
+    path = tmp_path / "data" / "profiles.json"
+    store = LayoutProfileStore(str(path))
+    assert not path.exists()
+    store.save("abc", {"name": "Eurofins", "extraction_type": "Colonnes"})
+    assert LayoutProfileStore(str(path)).get("abc")["name"] == "Eurofins"
+    assert store.match_plan("abc") is store.match_plan("abc")
+    assert store.match_plan("unknown") is None
+
+
+def test_default_profiles_path_is_under_data():
+    assert extract_geochem.GEOCHEM_PROFILES_PATH == os.getenv("GEOCHEM_PROFILES_PATH",
+                                                              os.path.join("data", "geochem_profiles.json"))
@@ -0,0 +1,33 @@
+from routes.extract_geotech import extract_values_near_keyword, get_keyword_x_positions, PRESSIO_TOLERANCES
+from services.pdf_sondage_engine import PressioEngine, list_pdf_files
+from services.pdf_words import open_word_pages
+
+
+def test_list_pdf_files_matches_extension_once(tmp_path):
+    for name in ("b.PDF", "a.pdf", "c.Pdf", "notes.txt", "d.pdf.bak"):
+        (tmp_path / name).write_bytes(b"%PDF-1.4")
+    (tmp_path / "dir.pdf").mkdir()
+    assert [p.rsplit("/", 1)[-1] for p in list_pdf_files(str(tmp_path))] == ["a.pdf", "b.PDF", "c.Pdf"]
+
+
+def test_process_directory_reads_each_pdf_once(tmp_path, pressio_pdf_factory):
+    (tmp_path / "one.pdf").write_bytes(pressio_pdf_factory(n_pages=3))
+    (tmp_path / "two.PDF").write_bytes(pressio_pdf_factory(n_pages=3, seed=2))
+    engine = PressioEngine(keywords=["Pf*", "Pl*", "Module"])
+    depth_ranges = {"default": {"start": 0, "end": 5, "step": 0.5}}
+    results = engine.process_directory(str(tmp_path), depth_ranges, workers=1)
+    assert [p.rsplit("/", 1)[-1] for p in results] == ["one.pdf", "two.PDF"]
+    assert all("SP1" in r for r in results.values())
+
+
+def test_engine_reads_the_same_values_as_the_routes(pressio_pdf, capsys):
+    engine = PressioEngine(keywords=["Pf*", "Pl*", "Module"], tolerances=PRESSIO_TOLERANCES)
+    with open_word_pages(pressio_pdf, "pdfplumber") as pages:
+        for page in pages:
+            words = page.extract_words()
+            assert engine.get_keyword_x_positions(words) == get_keyword_x_positions(words, engine.keywords)
+            for kw in engine.keywords:
+                assert engine.extract_values_near_keyword(words, kw) == \
+                    extract_values_near_keyword(words, kw, PRESSIO_TOLERANCES[kw])
+            engine.process_page(words)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,66 @@
+import fitz
+import pytest
+
+from services.pdf_words import open_word_pages, WORD_BACKENDS
+
+TOLERANCE = 0.5  # pts
+
+LINES = [
+    "SONDAGE SP1",
+    "Profondeur Pf* Pl* Module",
+    "1,00 0,45 0,82 12,5",
+    "2,00 0,51 0,95 14,1",
+    "3,50 <0,3 1,20 20,3",
+]
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes():
+    doc = fitz.open()
+    for page_number in range(2):
+        page = doc.new_page(width=595, height=842)
+        y = 80 + 40 * page_number
+        for line in LINES:
+            for i, word in enumerate(line.split()):
+                page.insert_text((60 + 90 * i, y), word, fontsize=10, fontname="helv")
+            y += 18
+    return doc.tobytes()
+
+
+def words_by_backend(pdf_bytes, boxes=None):
+    out = {}
+    for backend in WORD_BACKENDS:
+        with open_word_pages(pdf_bytes, backend) as pages:
+            out[backend] = [p.extract_words() if boxes is None else p.extract_words_in(boxes) for p in pages]
+    return out
+
+
+def assert_same_words(reference, words):
+    assert [w["text"] for w in words] == [w["text"] for w in reference]
+    for a, b in zip(reference, words):
+        for key in ("x0", "x1", "top", "bottom"):
+            assert abs(a[key] - b[key]) <= TOLERANCE, (a, b)
+
+
+def test_pymupdf_words_match_pdfplumber(pdf_bytes):
+    with open_word_pages(pdf_bytes, "pymupdf") as mupdf_pages:
+        assert [p.page_number for p in mupdf_pages] == [1, 2]
+    pages = words_by_backend(pdf_bytes)
+    for ref_words, words in zip(pages["pdfplumber"], pages["pymupdf"]):
+        assert len(ref_words) == sum(len(line.split()) for line in LINES)
+        assert_same_words(ref_words, words)
+
+
+def test_pymupdf_words_in_boxes_match_pdfplumber(pdf_bytes):
+    # Pf* / Pl* bands over the full height + a header box
+    boxes = [(140, None, 230, None), (230, None, 320, None), (50, 60, 140, 90)]
+    pages = words_by_backend(pdf_bytes, boxes)
+    for ref_words, words in zip(pages["pdfplumber"], pages["pymupdf"]):
+        assert "Pf*" in [w["text"] for w in ref_words]
+        assert "Module" not in [w["text"] for w in ref_words]
+        assert_same_words(ref_words, words)
+
+
+def test_unknown_backend_rejected(pdf_bytes):
+    with pytest.raises(ValueError):
+        open_word_pages(pdf_bytes, "tesseract")
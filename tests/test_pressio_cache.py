@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from routes import extract_geotech
+from routes.extract_geotech import get_pressio_cache
+
+CONFIG = {"mode": "global", "config": {"start": 0, "end": 5, "step": 0.5}, "pressio": ["SP1", "SP2", "SP3"]}
+
+
+def process(client, pdf_bytes, **options):
+    response = client.post("/process-pressio", files={"pdf": ("s.pdf", pdf_bytes)},
+                           data={"config": json.dumps({**CONFIG, **options})})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_cache_key_includes_band_mode_and_tolerances(pressio_pdf, monkeypatch):
+    extract_geotech.pressio_page_cache.clear()
+    full = get_pressio_cache(pressio_pdf, "pdfplumber")
+    assert get_pressio_cache(pressio_pdf, "pdfplumber") is full
+    assert get_pressio_cache(pressio_pdf, "pdfplumber", band_mode="layout") is not full
+    monkeypatch.setitem(extract_geotech.PRESSIO_TOLERANCES, "Module", {"left": 10, "right": 80, "min_dy": 50})
+    assert get_pressio_cache(pressio_pdf, "pdfplumber") is not full
+
+
+def test_resubmit_with_other_band_mode_matches_fresh_run(geotech_client, pressio_pdf):
+    cached = {}
+    for band_mode in (None, "layout", "borehole"):
+        cached[band_mode] = process(geotech_client, pressio_pdf, band_mode=band_mode)
+    assert len(extract_geotech.pressio_page_cache) == 3
+    for band_mode in (None, "layout", "borehole"):
+        extract_geotech.pressio_page_cache.clear()
+        assert process(geotech_client, pressio_pdf, band_mode=band_mode) == cached[band_mode]
+
+
+@pytest.mark.parametrize("band_mode", ["layout", "borehole"])
+def test_band_reads_match_full_page_reads(geotech_client, pressio_pdf_factory, monkeypatch, band_mode):
+    # 16 pages : combined Pf*/Pl* every 4 pages, SP / PR boreholes alternating, columns moved from page 10 on
+    pdf_bytes = pressio_pdf_factory(n_pages=16, drift_from=10)
+    options = {"pressio": ["SP1", "SP2", "SP3", "SP4", "SP5", "SP6", "PR6", "PR13"], "identifiers": ["SP", "PR"]}
+    extract_geotech.pressio_page_cache.clear()
+    full = process(geotech_client, pdf_bytes, **options)
+    assert {"SP1", "SP4", "PR6", "PR13"} <= set(full)
+
+    learnt_pf_x, band_reads = [], []
+    learn, bands = extract_geotech.learn_column_bands, extract_geotech.extract_words_in_bands
+
+    def spy_learn(words, x_positions, pressio_name):
+        learnt_pf_x.append(x_positions.get("Pf*"))
+        return learn(words, x_positions, pressio_name)
+
+    def spy_bands(page, geometry):
+        band_reads.append(page.page_number)
+        return bands(page, geometry)
+
+    monkeypatch.setattr(extract_geotech, "learn_column_bands", spy_learn)
+    monkeypatch.setattr(extract_geotech, "extract_words_in_bands", spy_bands)
+    extract_geotech.pressio_page_cache.clear()
+    assert process(geotech_client, pdf_bytes, band_mode=band_mode, **options) == full
+    assert band_reads
+    # Bands learnt again once the columns moved (Pf* header at x ~ 300 + 60)
+    assert any(x is not None and x < 330 for x in learnt_pf_x)
+    assert any(x is not None and x > 330 for x in learnt_pf_x)
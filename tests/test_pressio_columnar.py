@@ -0,0 +1,83 @@
+import gzip
+import json
+
+import pytest
+
+from services.pressio_columnar import (
+    COLUMNAR_MEDIA_TYPE, encode_pressio_columnar, decode_pressio_columnar, decompress_body,
+    parse_pressio_payload, render_pressio_payload, PayloadTooLarge,
+)
+
+DATA = {
+    "SP1": {
+        "Depth": [0.5, 1.0, 1.5, 2.0],
+        "Pf*": [0.1 + 0.2, None, 123456.789012345, 1e-7],
+        "Pl*": [1.234567891, 2.5, None, 3.0],
+        "Module": [12.5, 14.1, 20.3, None],
+        "RedFlags": {"Pf*": [3, 1, 1], "Pl*": [], "Module": [2]},
+        "Warnings": ["Pf*/Pl* combinés : nombre impair de valeurs, 0.5 (y = 812.0 pts) non appariée"],
+    },
+    "PR6": {
+        "Depth": [1, 2],  # ints (edited in the UI) : sent as a plain list
+        "Pf*": ["0,5", None],
+        "Pl*": [],
+        "Module": [],
+        "RedFlags": {"Pf*": [], "Pl*": [], "Module": []},
+        "Warnings": [],
+    },
+}
+
+
+def test_columnar_round_trip_is_lossless():
+    decoded = decode_pressio_columnar(json.loads(json.dumps(encode_pressio_columnar(DATA))))
+    assert decoded == DATA
+    assert type(decoded["PR6"]["Depth"][0]) is int
+
+
+@pytest.mark.parametrize("accept_encoding", [None, "gzip"])
+def test_render_then_parse(accept_encoding):
+    body, headers = render_pressio_payload(DATA, COLUMNAR_MEDIA_TYPE, accept_encoding)
+    assert headers["Content-Type"] == COLUMNAR_MEDIA_TYPE
+    assert parse_pressio_payload(body, headers["Content-Type"], headers.get("Content-Encoding")) == DATA
+
+
+def test_decompressed_size_is_capped():
+    bomb = gzip.compress(b" " * (4 * 1024 * 1024))
+    assert len(bomb) < 10_000
+    with pytest.raises(PayloadTooLarge):
+        decompress_body(bomb, "gzip", max_bytes=1024 * 1024)
+    assert len(decompress_body(bomb, "gzip", max_bytes=8 * 1024 * 1024)) == 4 * 1024 * 1024
+
+
+@pytest.mark.parametrize("body, content_type, encoding", [
+    (b"{not json", "application/json", None),
+    (b"[1, 2]", "application/json", None),
+    (b'{"SP1": {"Pf*": 3}}', "application/json", None),
+    (gzip.compress(b'{"SP1": {}}')[:-8], "application/json", "gzip"),
+    (b"abc", "application/json", "zstd"),
+    (b'{"format": "pressio-columnar-v2", "boreholes": {"SP1": {"Pf*": {"f8": "%%%"}}}}', COLUMNAR_MEDIA_TYPE, None),
+    (b'{"format": "pressio-columnar-v0", "boreholes": {}}', COLUMNAR_MEDIA_TYPE, None),
+])
+def test_bad_bodies_raise_value_error(body, content_type, encoding):
+    with pytest.raises(ValueError):
+        parse_pressio_payload(body, content_type, encoding)
+
+
+def test_export_rejects_bad_bodies(geotech_client):
+    response = geotech_client.post("/export-pressio", content=b"{not json",
+                                   headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
+    response = geotech_client.post("/export-pressio", content=gzip.compress(b"[]" + b" " * (80 * 1024 * 1024)),
+                                   headers={"Content-Type": "application/json", "Content-Encoding": "gzip"})
+    assert response.status_code == 413
+
+
+def test_process_pressio_columnar_matches_json(geotech_client, pressio_pdf):
+    config = json.dumps({"mode": "global", "config": {"start": 0, "end": 5, "step": 0.5},
+                         "pressio": ["SP1", "SP2", "SP3", "SP4"]})
+    plain = geotech_client.post("/process-pressio", files={"pdf": ("s.pdf", pressio_pdf)},
+                                data={"config": config}).json()
+    response = geotech_client.post("/process-pressio", files={"pdf": ("s.pdf", pressio_pdf)},
+                                   data={"config": config}, headers={"Accept": COLUMNAR_MEDIA_TYPE})
+    assert response.headers["content-type"] == COLUMNAR_MEDIA_TYPE
+    assert plain and decode_pressio_columnar(response.json()) == plain
@@ -0,0 +1,67 @@
+import os
+import time
+
+import pytest
+
+from routes import extract_geotech
+from routes.extract_geotech import pressio_overlay, extract_values_near_keyword, PRESSIO_TOLERANCES
+from services.pdf_words import open_word_pages
+from services.page_raster_cache import PageRasterCache
+
+KEYWORDS = ["Pf*", "Pl*", "Module"]
+
+
+@pytest.fixture
+def raster_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(extract_geotech, "PAGE_CACHE_DIR", str(tmp_path / "page_cache"))
+    monkeypatch.setattr(extract_geotech, "page_raster_cache", None)
+    return tmp_path / "page_cache"
+
+
+def test_overlay_values_match_extraction(pressio_pdf):
+    with open_word_pages(pressio_pdf, "pdfplumber") as pages:
+        for page in pages[:4]:
+            words = page.extract_words()
+            overlay = pressio_overlay(words, KEYWORDS, page.page.height, 2.0)
+            for kw in KEYWORDS:
+                expected = [v for _, v in extract_values_near_keyword(words, kw, PRESSIO_TOLERANCES[kw])]
+                boxes = sorted((b for b in overlay["values"] if b["keyword"] == kw), key=lambda b: b["top"])
+                assert expected and [b["value"] for b in boxes] == expected
+
+
+def test_cache_is_created_on_first_request(geotech_client, pressio_pdf, raster_cache):
+    assert extract_geotech.page_raster_cache is None
+    response = geotech_client.post("/pressio-overlay", files={"pdf": ("s.pdf", pressio_pdf)},
+                                   data={"page": "1", "dpi": "72"})
+    assert response.status_code == 200
+    assert raster_cache.is_dir()
+    image = geotech_client.get(response.json()["image"])
+    assert image.status_code == 200 and image.headers["content-type"] == "image/png"
+
+
+@pytest.mark.parametrize("dpi", ["10", "301", "5000"])
+def test_dpi_out_of_bounds_rejected(geotech_client, pressio_pdf, raster_cache, dpi):
+    response = geotech_client.post("/pressio-overlay", files={"pdf": ("s.pdf", pressio_pdf)},
+                                   data={"page": "1", "dpi": dpi})
+    assert response.status_code == 400
+    response = geotech_client.get(f"/pressio-page-image/{'0' * 64}/1?dpi={dpi}")
+    assert response.status_code == 400
+
+
+def test_evict_skips_tmp_files_and_newest_entry(tmp_path):
+    cache = PageRasterCache(str(tmp_path), max_bytes=100)
+    assert not os.listdir(tmp_path)
+    os.makedirs(cache.png_dir)
+    os.makedirs(cache.pdf_dir)
+    now = time.time()
+    for n, name in enumerate(["old.png", "in_progress.png.1.2.tmp", "newest.png"]):
+        path = os.path.join(cache.png_dir, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * 80)
+        os.utime(path, (now - 100 + n, now - 100 + n))
+    # Newest file alone is above max_bytes : kept, the write in progress too
+    with open(os.path.join(cache.png_dir, "newest.png"), "ab") as f:
+        f.write(b"x" * 200)
+    os.utime(os.path.join(cache.png_dir, "newest.png"), (now, now))
+    cache.evict()
+    assert sorted(os.listdir(cache.png_dir)) == ["in_progress.png.1.2.tmp", "newest.png"]
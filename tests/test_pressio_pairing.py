@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+from services.pressio_pairing import pair_combined_values
+
+
+def make_pages(n_pages=60, values_per_page=40, seed=0):
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(n_pages):
+        count = values_per_page + rng.choice((0, 0, 1, -values_per_page, 1 - values_per_page))
+        # rounded values : a few ties inside pairs
+        pages.append([(100.0 + 12 * i, round(rng.uniform(0.1, 1), 1)) for i in range(count)])
+    return pages
+
+
+def pair_backward(page):
+    # Former backward walk from the last value (even counts), first value of an odd page left out
+    values = page[1:] if len(page) % 2 else page
+    pf_final, pl_final = [], []
+    for idx in range(len(values) - 2, -1, -2):
+        a, b = values[idx], values[idx + 1]
+        if a[1] < b[1]:
+            pf_final.append(a)
+            pl_final.append(b)
+        else:
+            pf_final.append(b)
+            pl_final.append(a)
+    return pf_final[::-1], pl_final[::-1], page[:len(page) % 2]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_single_page_matches_backward_walk(seed):
+    for page in make_pages(seed=seed):
+        assert pair_combined_values(page) == pair_backward(page)
+
+
+def test_tie_gives_pf_the_second_value():
+    pf, pl, unpaired = pair_combined_values([(1, 0.5), (2, 0.5), (3, 0.7), (4, 0.2)])
+    assert pf == [(2, 0.5), (4, 0.2)] and pl == [(1, 0.5), (3, 0.7)] and unpaired == []
+    assert pair_combined_values([(1, 0.9)]) == ([], [], [(1, 0.9)])
@@ -0,0 +1,46 @@
+import json
+
+from routes import extract_geotech
+from routes.extract_geotech import pressio_workers, PRESSIO_MAX_WORKERS
+
+CONFIG = {"mode": "global", "config": {"start": 0, "end": 5, "step": 0.5},
+          "pressio": ["SP1", "SP2", "SP3", "SP4", "SP5", "SP6", "SP7", "PR6", "PR13"]}
+
+
+def process(client, pdf_bytes, **options):
+    extract_geotech.pressio_page_cache.clear()
+    response = client.post("/process-pressio", files={"pdf": ("s.pdf", pdf_bytes)},
+                           data={"config": json.dumps({**CONFIG, **options})})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_workers_clamped():
+    assert pressio_workers(None) == 1
+    assert pressio_workers("abc") == 1
+    assert pressio_workers(-3) == 1
+    assert pressio_workers(500) <= PRESSIO_MAX_WORKERS
+    assert pressio_workers(500, n_chunks=2) <= 2
+
+
+def test_parallel_scan_matches_sequential(geotech_client, pressio_pdf_factory):
+    pdf_bytes = pressio_pdf_factory(n_pages=20)
+    sequential = process(geotech_client, pdf_bytes)
+    assert sequential
+    assert process(geotech_client, pdf_bytes, workers=3) == sequential
+    assert process(geotech_client, pdf_bytes, workers=10000) == sequential
+
+
+def test_shared_pool_path_matches_sequential(geotech_client, pressio_pdf_factory, monkeypatch):
+    # Force the pool path whatever the CPU count of the test machine
+    monkeypatch.setattr(extract_geotech, "PRESSIO_MAX_WORKERS", 2)
+    monkeypatch.setattr(extract_geotech.os, "cpu_count", lambda: 2)
+    extract_geotech.reset_pressio_pool()
+    try:
+        pdf_bytes = pressio_pdf_factory(n_pages=20)
+        sequential = process(geotech_client, pdf_bytes)
+        assert pressio_workers(8, n_chunks=3) == 2
+        assert process(geotech_client, pdf_bytes, workers=8) == sequential
+        assert extract_geotech.pressio_pool is not None
+    finally:
+        extract_geotech.reset_pressio_pool()
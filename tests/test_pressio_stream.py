@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from routes import extract_geotech
+
+# 16 pages : SP1 x3, SP2 x3, PR6, SP3 x2, SP4 x3, SP5, PR13, SP5, SP6 → SP5 shows up again after PR13
+CONFIG = {"mode": "global", "config": {"start": 0, "end": 5, "step": 0.5}, "identifiers": ["SP", "PR"],
+          "pressio": ["SP1", "SP2", "SP3", "SP4", "SP5", "SP6", "PR6", "PR13"]}
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes(pressio_pdf_factory):
+    return pressio_pdf_factory(n_pages=16)
+
+
+def stream(client, pdf_bytes, partial):
+    extract_geotech.pressio_page_cache.clear()
+    response = client.post("/process-pressio-stream", files={"pdf": ("s.pdf", pdf_bytes)},
+                           data={"config": json.dumps(CONFIG), "partial": json.dumps(partial)})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_final_records_match_process_pressio(geotech_client, pdf_bytes):
+    extract_geotech.pressio_page_cache.clear()
+    expected = geotech_client.post("/process-pressio", files={"pdf": ("s.pdf", pdf_bytes)},
+                                   data={"config": json.dumps(CONFIG)}).json()
+    records = stream(geotech_client, pdf_bytes, partial=False)
+    assert all(not r["partial"] for r in records)
+    names = [r["pressio"] for r in records]
+    assert names == ["SP1", "SP2", "PR6", "SP3", "SP4", "SP5", "PR13", "SP5", "SP6"]
+    # One final record per borehole, SP5 sent again (complete) when it reappears : the last one wins
+    assert {n: names.count(n) for n in set(names)} == {**{n: 1 for n in expected}, "SP5": 2}
+    assert {r["pressio"]: r["data"] for r in records} == expected
+    first_sp5, second_sp5 = [r["data"] for r in records if r["pressio"] == "SP5"]
+    assert len(second_sp5["Pf*"]) > len(first_sp5["Pf*"])
+
+
+def test_partial_records_in_page_order(geotech_client, pdf_bytes):
+    records = stream(geotech_client, pdf_bytes, partial=True)
+    pages = [r["page"] for r in records if r["partial"]]
+    assert pages == list(range(1, 17))
+    assert [r["data"] for r in records if not r["partial"]] == \
+        [r["data"] for r in stream(geotech_client, pdf_bytes, partial=False)]
+
+    # Each final record closes the run of partial pages of its borehole, before the next borehole starts
+    current = None
+    for record in records:
+        if record["partial"]:
+            assert current in (None, record["pressio"])
+            current = record["pressio"]
+        else:
+            assert record["pressio"] == current
+            current = None
+    assert current is None
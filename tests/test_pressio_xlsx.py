@@ -0,0 +1,56 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from services.pressio_xlsx import unique_sheet_names
+
+DATA = {
+    "SP1": {"Depth": [0.5, 1.0, 1.5, 2.0], "Pf*": [0.3, None, 1.2, 0.8], "Pl*": [1.1, 2.5, None], "Module": [12.5]},
+    "SP2/bis": {"Depth": [1, 2], "Pf*": [0.4, 0.6], "Pl*": [0.9, 1.4], "Module": [8.0, 9.5]},
+    "SP2_bis": {"Depth": [3.0], "Pf*": [], "Pl*": [2.0], "Module": [14.1]},
+    "Sondage pressiométrique numéro 12 - A": {"Depth": [0.5], "Pf*": [0.2], "Pl*": [0.7], "Module": [5.0]},
+    "Sondage pressiométrique numéro 12 - B": {"Depth": [1.0], "Pf*": [0.3], "Pl*": [0.8], "Module": [6.0]},
+}
+
+
+def export(client, data, **params):
+    response = client.post("/export-pressio", params=params, content=json.dumps(data).encode(),
+                           headers={"Content-Type": "application/json"})
+    assert response.status_code == 200, response.text
+    return pd.read_excel(io.BytesIO(response.content), sheet_name=None)
+
+
+def test_sheet_names_unique_and_short():
+    names = unique_sheet_names(list(DATA) + ["sp1"])
+    assert list(names.values())[0] == "SP1"
+    assert len({n.lower() for n in names.values()}) == len(names)
+    assert all(len(n) <= 31 for n in names.values())
+    assert names["SP2_bis"] == "SP2_bis (2)" and names["sp1"] == "sp1 (2)"
+
+
+def test_xlsxwriter_wide_matches_openpyxl(geotech_client):
+    reference = export(geotech_client, DATA)
+    assert len(reference) == len(DATA)
+    sheets = export(geotech_client, DATA, exporter="xlsxwriter")
+    assert list(sheets) == list(reference)
+    for name, df in reference.items():
+        pd.testing.assert_frame_equal(sheets[name], df)
+
+
+def test_xlsxwriter_long_matches_openpyxl(geotech_client):
+    reference = export(geotech_client, DATA)
+    expected = pd.concat([df.assign(Sondage=pressio) for pressio, df in zip(DATA, reference.values())],
+                         ignore_index=True)
+    expected = expected[["Sondage", "Profondeur", "Pf*", "Pl*", "Module"]]
+    sheets = export(geotech_client, DATA, exporter="xlsxwriter", layout="long")
+    assert list(sheets) == ["Pressio"]
+    pd.testing.assert_frame_equal(sheets["Pressio"], expected)
+
+
+@pytest.mark.parametrize("params", [{"exporter": "xlsx"}, {"layout": "tall"}])
+def test_unknown_exporter_or_layout_rejected(geotech_client, params):
+    response = geotech_client.post("/export-pressio", params=params, content=json.dumps(DATA).encode(),
+                                   headers={"Content-Type": "application/json"})
+    assert response.status_code == 400
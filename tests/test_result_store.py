@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.extract_utils import classify_lq, format_lq_values, sum_lq_arrays, GROUP_LQ_TEXT
+from services.result_store import ResultStore, group_column, MEMBER, KEYWORD
+
+
+def sum_lq_groups(members, n, minus_one=False):
+    # Former group column : sum of the numbers, "<LQ" if only <LQ members, "" if nothing
+    total, has_value, lq_detected = sum_lq_arrays(members, n)
+    out = np.full(n, "", dtype=object)
+    summed = np.flatnonzero(has_value)
+    out[summed] = ["" if np.isnan(v) else str(v).strip().lower() for v in total[summed].tolist()]
+    out[lq_detected & ~has_value] = -1 if minus_one else GROUP_LQ_TEXT
+    return out
+
+
+def dict_results(sample_names, classified, groupes, keywords, minus_one):
+    # Former layout : dict of dicts, one formatted value per cell
+    formatted = {kw: format_lq_values(classified[kw][0], minus_one) for kw in keywords}
+    sommes = {nom_groupe: sum_lq_groups([classified[m] for m in ms], len(sample_names), minus_one)
+              for nom_groupe, ms in groupes.items()}
+    resultats = {}
+    for s, nom in enumerate(sample_names):
+        resultat = {}
+        for nom_groupe, ms in groupes.items():
+            for m in ms:
+                resultat[m] = classified[m][0][s]
+            resultat[nom_groupe] = sommes[nom_groupe][s]
+        for kw in keywords:
+            resultat[kw] = formatted[kw][s]
+        resultats[nom] = resultat
+    return resultats
+
+
+def make_results(seed, n_samples=80, n_items=30):
+    rng = np.random.default_rng(seed)
+    sample_names = [f"S{i}" for i in range(n_samples)]
+    items = [f"param{j} → ({j}, Paramètre {j})" for j in range(n_items)]
+    groupes = {"Groupe 0": items[:4], "Groupe 1": items[10:13]}
+    membres = [m for ms in groupes.values() for m in ms]
+    keywords = [kw for kw in items if kw not in membres]
+    classified = {}
+    for item in membres + keywords:
+        col = rng.uniform(0, 50, n_samples).round(3).astype(object)
+        draw = rng.random(n_samples)
+        col[draw < 0.3] = "<0,05"
+        col[(draw >= 0.3) & (draw < 0.35)] = "n.d."
+        col[(draw >= 0.35) & (draw < 0.4)] = "12,5"
+        col[(draw >= 0.4) & (draw < 0.45)] = None
+        col[(draw >= 0.45) & (draw < 0.5)] = "n.a."
+        classified[item] = classify_lq(col)
+    return sample_names, classified, groupes, keywords
+
+
+def store_results(sample_names, classified, groupes, keywords, minus_one):
+    columns = []
+    for nom_groupe, ms in groupes.items():
+        columns.extend((m, MEMBER, *classified[m][:2], classified[m][4]) for m in ms)
+        columns.append(group_column(nom_groupe, [classified[m] for m in ms], len(sample_names)))
+    columns.extend((kw, KEYWORD, *classified[kw][:2], classified[kw][4]) for kw in keywords)
+    return ResultStore.from_columns(sample_names, columns, minus_one)
+
+
+@pytest.mark.parametrize("minus_one", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_store_matches_dict_of_dicts(seed, minus_one):
+    args = make_results(seed)
+    expected = dict_results(*args, minus_one)
+    store = store_results(*args, minus_one)
+    assert list(store) == list(expected)
+    for nom, resultat in expected.items():
+        assert list(store[nom]) == list(resultat)
+        assert dict(store[nom]) == resultat
+    df_expected = pd.DataFrame.from_dict(expected, orient="index")
+    df_store = store.to_frame()
+    assert list(df_store.columns) == list(df_expected.columns)
+    assert df_store.astype(str).equals(df_expected.astype(str))
+
+
+def test_duplicate_sample_keeps_first_position_and_last_values():
+    sample_names, classified, groupes, keywords = make_results(0, n_samples=4)
+    sample_names = ["S0", "S1", "S0", "S3"]
+    store = store_results(sample_names, classified, groupes, keywords, False)
+    assert list(store) == ["S0", "S1", "S3"]
+    assert dict(store["S0"]) == dict_results(sample_names, classified, groupes, keywords, False)["S0"]
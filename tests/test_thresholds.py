@@ -0,0 +1,111 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.thresholds import (
+    compare_thresholds, threshold_limits, parse_result_value, parse_thresholds, NUMBER, LQ, EMPTY, TEXT,
+    VERDICT_OK, VERDICT_EXCEEDED, VERDICT_UNDETERMINED,
+)
+
+
+def compare_thresholds_loop(df_export, thresholds):
+    # Sample by sample, cell by cell
+    limits = threshold_limits(list(df_export.columns), thresholds)
+    verdicts, counts = [], []
+    for _, row in df_export.iterrows():
+        n_exceed, undetermined, compared = 0, False, False
+        for j, value in enumerate(row.tolist()):
+            if np.isnan(limits[j]):
+                continue
+            state, number, bound = parse_result_value(value)
+            if state == NUMBER:
+                compared = True
+                n_exceed += number > limits[j]
+            elif state == LQ:
+                compared = True
+                undetermined |= not bound <= limits[j]
+        verdicts.append(VERDICT_EXCEEDED if n_exceed else VERDICT_UNDETERMINED if undetermined
+                        else VERDICT_OK if compared else "")
+        counts.append(n_exceed)
+    return verdicts, counts
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("<LQ (<0,05)", (LQ, 0.05)),
+    ("<LQ (<0.05 mg/kg)", (LQ, 0.05)),
+    ("<LQ (<0,05) mg/kg", (LQ, 0.05)),
+    ("< 5e-2", (LQ, 0.05)),
+    ("<LQ (<1.5E+01 µg/l)", (LQ, 15.0)),
+    ("<0,05", (LQ, 0.05)),
+    ("<LQ", (LQ, None)),
+    ("n.d.", (LQ, None)),
+    ("12,5", (NUMBER, None)),
+    ("", (EMPTY, None)),
+    ("voir commentaire", (TEXT, None)),
+])
+def test_parse_result_value(value, expected):
+    state, _, bound = parse_result_value(value)
+    assert state == expected[0]
+    assert np.isnan(bound) if expected[1] is None else bound == expected[1]
+
+
+def test_lq_without_bound_is_undetermined():
+    df = pd.DataFrame({"plomb → all": ["<LQ", "n.d.", "<LQ (<0,05 mg/kg)", "<LQ (<50)", "3", ""]},
+                      index=[f"S{i}" for i in range(6)])
+    summary, _ = compare_thresholds(df, {"plomb": "10"})
+    assert summary["Verdict"].tolist() == [VERDICT_UNDETERMINED, VERDICT_UNDETERMINED, VERDICT_OK,
+                                           VERDICT_UNDETERMINED, VERDICT_OK, ""]
+
+
+@pytest.mark.parametrize("thresholds", [{"plomb": "abc"}, {"plomb": "nan"}, {"plomb": [1]}, {"plomb": True}, [1, 2]])
+def test_invalid_limits_rejected(thresholds):
+    with pytest.raises(ValueError):
+        parse_thresholds(thresholds)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matrices_match_loop(seed):
+    rng = np.random.default_rng(seed)
+    n_samples, n_params = 400, 12
+    columns = [f"param{i} → all" for i in range(n_params)] + ["BTEX"]
+    cells = rng.uniform(0, 20, size=(n_samples, n_params + 1)).round(3).astype(str).astype(object)
+    draw = rng.random(size=cells.shape)
+    cells[draw < 0.2] = "<LQ (<0,05)"
+    cells[(draw >= 0.2) & (draw < 0.22)] = "<LQ (<50 mg/kg)"
+    cells[(draw >= 0.22) & (draw < 0.25)] = "<LQ"
+    cells[(draw >= 0.25) & (draw < 0.3)] = ""
+    cells[(draw >= 0.3) & (draw < 0.31)] = "n.a."
+    df_export = pd.DataFrame(cells, index=[f"S{i}" for i in range(n_samples)], columns=columns)
+    thresholds = {f"param{i}": 19.5 for i in range(0, n_params, 2)}
+    thresholds["BTEX"] = "6"
+    thresholds["param1"] = ""
+
+    summary, ratios = compare_thresholds(df_export, thresholds)
+    verdicts, counts = compare_thresholds_loop(df_export, thresholds)
+    assert summary["Verdict"].tolist() == verdicts
+    assert summary["Nb dépassements"].tolist() == counts
+    assert list(ratios.columns) == [f"param{i} → all" for i in range(0, n_params, 2)] + ["BTEX"]
+
+
+def test_export_thresholds(geochem_client, geochem_workbook, geochem_form):
+    files = {"excel": ("geo.xlsx", geochem_workbook)}
+    response = geochem_client.post("/export-geochem", files=files,
+                                   data={**geochem_form, "thresholds_json": json.dumps({"plomb": "beaucoup"})})
+    assert response.status_code == 400
+    response = geochem_client.post("/export-geochem", files=files,
+                                   data={**geochem_form, "thresholds_json": "{pas du json"})
+    assert response.status_code == 400
+
+    plain = geochem_client.post("/export-geochem", files=files, data=geochem_form)
+    checked = geochem_client.post("/export-geochem", files=files,
+                                  data={**geochem_form, "thresholds_json": json.dumps({"plomb": 25, "BTEX": "40"})})
+    assert plain.status_code == checked.status_code == 200
+    plain_book = pd.read_excel(io.BytesIO(plain.content), sheet_name=None)
+    checked_book = pd.read_excel(io.BytesIO(checked.content), sheet_name=None)
+    main_sheet = list(plain_book)[0]
+    assert list(checked_book) == [main_sheet, "Ratios seuils"]
+    assert {"Verdict", "Nb dépassements"} <= set(checked_book[main_sheet].columns)
+    pd.testing.assert_frame_equal(checked_book[main_sheet][plain_book[main_sheet].columns], plain_book[main_sheet])
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from services.extract_utils import clean_tokens
+from services.token_index import TokenIndex, MatchPlan
+
+VOCAB = ["benzo", "a", "pyrène", "fluoranthène", "naphtalène", "toluène", "xylène", "plomb", "Pb", "cuivre",
+         "HCT", "C10", "C40", "C12", "C16", "fraction", "aliphatique", "aromatique", "PCB", "28", "52",
+         "chrome", "VI", "total", "lixiviation", "sur", "éluat", "mg/kg", "M.S.", "µg/l"]
+UNITS = ["- (mg/kg M.S.)", "- (µg/l)", "(mg/kg MS)", "%", ""]
+
+
+def matching_columns_loop(columns, keywords):
+    # Former BaseExtract.get_matching_columns nested loop (columns x keywords)
+    matched = {kw: [] for kw in keywords}
+    for i, col in enumerate(columns):
+        if "%" in str(col):
+            continue
+        tokens_col = clean_tokens(str(col))
+        for kw in keywords:
+            if all(tok in tokens_col for tok in clean_tokens(kw)) and (i, col) not in matched[kw]:
+                matched[kw].append((i, col))
+    return matched, [kw for kw, matches in matched.items() if len(matches) > 1]
+
+
+def make_case(seed, n_labels=600, n_keywords=80):
+    rng = random.Random(seed)
+    labels = [" ".join(rng.sample(VOCAB, rng.randint(2, 5))) + f" {i} " + rng.choice(UNITS) for i in range(n_labels)]
+    labels[::97] = [None] * len(labels[::97])  # empty header cells
+    keywords = [" ".join(rng.sample(VOCAB, rng.randint(1, 3))) for _ in range(n_keywords)]
+    return labels, keywords + ["", "Plomb (Pb)", keywords[0]]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_token_index_matches_nested_loop(seed):
+    labels, keywords = make_case(seed)
+    expected = matching_columns_loop(labels, keywords)
+    assert TokenIndex(labels).match(keywords) == expected
+
+    plan = MatchPlan()
+    assert plan.get_matching_columns(labels, keywords) == expected
+    assert plan.get_matching_columns(labels, keywords) == expected  # warm
+
+
+def test_match_plan_keeps_label_sets_apart():
+    plan = MatchPlan(max_label_sets=1)
+    first = ["Plomb (Pb) - (mg/kg M.S.)", "Cuivre - (mg/kg M.S.)"]
+    second = ["Cuivre - (mg/kg M.S.)", "Plomb - (µg/l)", "Plomb total %"]
+    assert plan.get_matching_columns(first, ["plomb"])[0] == {"plomb": [(0, first[0])]}
+    assert plan.get_matching_columns(second, ["plomb"])[0] == {"plomb": [(1, second[1])]}
+    assert plan.get_matching_columns(first, ["plomb"])[0] == {"plomb": [(0, first[0])]}
+    assert len(plan.indexes) == 1
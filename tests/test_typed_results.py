@@ -0,0 +1,56 @@
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from services.thresholds import parse_result_column
+from services.typed_results import typed_frame
+
+COLUMN = np.array(["12,5", "<LQ (<0,05)", "n.a.", None, "voir commentaire"], dtype=object)
+NAMES = ["S0", "S1", "S2", "S3", "S4"]
+
+
+def frame(shape):
+    return typed_frame(NAMES, ["Plomb"], {"Plomb": parse_result_column(COLUMN)}, {"Plomb": "mg/kg"}, shape,
+                       {"Plomb": COLUMN})
+
+
+def test_long_keeps_text_cells():
+    df = frame("long")
+    assert df["Nom échantillon"].tolist() == ["S0", "S1", "S2", "S4"]
+    assert df["Texte"].tolist() == ["", "", "n.a.", "voir commentaire"]
+    assert df["LQ"].tolist() == [False, True, False, False]
+    assert df["Valeur"].iloc[0] == 12.5 and df["Valeur"].iloc[2:].isna().all()
+
+
+def test_wide_keeps_text_cells():
+    df = frame("wide")
+    assert df["Plomb | texte"].tolist() == ["", "", "n.a.", "", "voir commentaire"]
+    assert df["Plomb | limite LQ"].iloc[1] == 0.05
+
+
+@pytest.fixture
+def workbook_with_text(geochem_workbook):
+    wb = openpyxl.load_workbook(io.BytesIO(geochem_workbook))
+    wb["Data"]["B3"] = "n.a."
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def test_typed_export_keeps_text(geochem_client, geochem_form, workbook_with_text):
+    response = geochem_client.post("/export-geochem", files={"excel": ("r.xlsx", workbook_with_text)},
+                                   data={**geochem_form, "typed_shape": "long", "output_format": "csv"})
+    assert response.status_code == 200
+    df = pd.read_csv(io.BytesIO(response.content), keep_default_na=False)
+    cell = df[(df["Nom échantillon"] == "S0") & (df["Paramètre"] == "naphtalene → all")]
+    assert cell["Texte"].tolist() == ["n.a."]
+
+
+@pytest.mark.parametrize("extra", [{"thresholds_json": '{"plomb": 100}'}, {"replace_lq_with": "0"}])
+def test_typed_export_rejects_lq_options(geochem_client, geochem_form, geochem_workbook, extra):
+    response = geochem_client.post("/export-geochem", files={"excel": ("r.xlsx", geochem_workbook)},
+                                   data={**geochem_form, "typed_shape": "wide", **extra})
+    assert response.status_code == 400
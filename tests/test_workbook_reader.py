@@ -0,0 +1,73 @@
+import io
+import math
+from datetime import datetime, date
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from services.workbook_reader import workbook_metadata, read_label_row, read_label_column, read_block
+
+
+@pytest.fixture(scope="module")
+def mixed_workbook(geochem_workbook):
+    # conftest workbook + a sheet with dates, integral floats, NA strings, errors, merged cells and blank rows
+    wb = openpyxl.load_workbook(io.BytesIO(geochem_workbook))
+    ws = wb.create_sheet("Mixte")
+    ws.append(["Rapport", None, None, "Date"])
+    ws.merge_cells("A1:C1")
+    ws.append(["Code", "Prélèvement", "Plomb (Pb) - (mg/kg M.S.)", 12, 12.5, "NA", "#N/A"])
+    ws.append([])
+    ws.append(["S1", datetime(2024, 3, 5, 10, 30), 3.0, "<0,05", None, "n.d.", 7])
+    ws.append(["S2", date(2024, 3, 6), 4.25, "", "null", "  ", 1e-7])
+    ws.append([])
+    ws.append([None, None, None, None, None, None, None, "fin"])
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def same(a, b):
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    return a == b
+
+
+def assert_same_cells(values, expected):
+    # Trailing empty cells may differ in count (declared dimension), not the cells themselves
+    width = max(len(values), len(expected))
+    values = list(values) + [math.nan] * (width - len(values))
+    expected = list(expected) + [math.nan] * (width - len(expected))
+    assert all(same(v, e) for v, e in zip(values, expected)), (values, expected)
+
+
+@pytest.mark.parametrize("sheet_name", ["Data", "Mixte"])
+def test_rows_and_columns_match_read_excel(mixed_workbook, sheet_name):
+    df = pd.read_excel(io.BytesIO(mixed_workbook), sheet_name=sheet_name, header=None)
+    for r in range(df.shape[0]):
+        assert_same_cells(read_label_row(mixed_workbook, sheet_name, r), df.iloc[r].tolist())
+    for c in range(df.shape[1]):
+        assert_same_cells(read_label_column(mixed_workbook, sheet_name, c), df.iloc[:, c].tolist())
+        assert_same_cells(read_label_column(mixed_workbook, sheet_name, c, start_row=2), df.iloc[2:, c].tolist())
+    for cells, expected in zip(read_block(mixed_workbook, sheet_name, 4, 5), df.iloc[:4, :5].values.tolist()):
+        assert_same_cells(cells, expected)
+
+
+def test_mixed_sheet_conversions(mixed_workbook):
+    row = read_label_row(mixed_workbook, "Mixte", 3)
+    assert row[1] == datetime(2024, 3, 5, 10, 30)
+    assert row[2] == 3 and type(row[2]) is int
+    assert math.isnan(row[4]) and row[5] == "n.d."
+    assert all(math.isnan(v) for v in read_label_row(mixed_workbook, "Mixte", 2))
+    assert math.isnan(read_label_row(mixed_workbook, "Mixte", 1)[5])  # "NA" string
+    assert math.isnan(read_label_row(mixed_workbook, "Mixte", 1)[6])  # error cell
+
+
+def test_sheets_endpoint_lists_sheets(geochem_client, mixed_workbook):
+    response = geochem_client.post("/sheets-geochem", files={"excel": ("mixte.xlsx", mixed_workbook)})
+    assert response.status_code == 200
+    body = response.json()
+    assert [s["name"] for s in body["sheets"]] == pd.ExcelFile(io.BytesIO(mixed_workbook)).sheet_names
+    assert body["sheets"] == workbook_metadata(mixed_workbook)
+    again = geochem_client.post("/sheets-geochem", data={"session_id": body["session_id"]})
+    assert again.json()["sheets"] == body["sheets"]
@@ -0,0 +1,68 @@
+import io
+import os
+
+import pandas as pd
+
+from routes import extract_geochem
+from services.workbook_session import WorkbookSessionStore
+
+
+def test_work_dir_is_per_session_and_deleted_on_close():
+    store = WorkbookSessionStore(max_sessions=4)
+    session = store.open(b"workbook", "a.xlsx")
+    work_dir = session.get_work_dir()
+    assert session.get_work_dir() == work_dir and os.path.isdir(work_dir)
+    assert store.close(session.session_id)
+    assert not os.path.exists(work_dir)
+    assert not store.close(session.session_id)
+
+
+def test_work_dir_deleted_on_eviction():
+    store = WorkbookSessionStore(max_sessions=1, ttl=1800)
+    first = store.open(b"first")
+    work_dir = first.get_work_dir()
+    store.open(b"second")
+    assert store.get(first.session_id) is None
+    assert not os.path.exists(work_dir)
+
+    store = WorkbookSessionStore(max_sessions=4, ttl=1800)
+    expired = store.open(b"expired")
+    work_dir = expired.get_work_dir()
+    store.ttl = -1
+    assert store.get(expired.session_id) is None
+    assert not os.path.exists(work_dir)
+
+
+def test_exports_share_the_session_directory(geochem_client, geochem_workbook, geochem_form):
+    response = geochem_client.post("/export-geochem", files={"excel": ("geo.xlsx", geochem_workbook)},
+                                   data=geochem_form)
+    assert response.status_code == 200
+    session_id = next(iter(extract_geochem.workbook_sessions.sessions))
+    work_dir = extract_geochem.workbook_sessions.get(session_id).work_dir
+    for _ in range(3):
+        response = geochem_client.post("/export-geochem", data={**geochem_form, "session_id": session_id})
+        assert response.status_code == 200
+        assert extract_geochem.workbook_sessions.get(session_id).work_dir == work_dir
+    assert geochem_client.delete(f"/geochem-session/{session_id}").json() == {"closed": True}
+    assert not os.path.exists(work_dir)
+
+
+def test_session_frame_matches_read_excel(geochem_workbook):
+    store = WorkbookSessionStore()
+    session = store.open(geochem_workbook, "geo.xlsx")
+    reference = pd.read_excel(io.BytesIO(geochem_workbook), sheet_name="Data", header=None)
+    pd.testing.assert_frame_equal(session.get_dataframe("Data"), reference)
+    assert store.get(session.session_id).get_dataframe("Data") is session.get_dataframe("Data")
+    assert session.get_labels("Data", "columns", 1) == list(reference.iloc[1])
+
+
+def test_parsed_sheet_kept_once_and_labels_unchanged(geochem_workbook):
+    session = WorkbookSessionStore().open(geochem_workbook, "geo.xlsx")
+    lazy = (session.get_labels("Data", "columns", 1), session.get_labels("Data", "rows", 0),
+            session.get_fingerprint("Data"))
+    session.fingerprints.clear()
+    df = session.get_dataframe("Data")
+    assert list(session.frames) == ["Data"] and not hasattr(session, "sheets")
+    assert (session.get_labels("Data", "columns", 1), session.get_labels("Data", "rows", 0),
+            session.get_fingerprint("Data")) == lazy
+    assert session.get_labels("Data", "columns", 1) == df.iloc[1].tolist()